@@ -0,0 +1,108 @@
+"""
+Benchmark the time it takes to find a node by its API key, for an increasing
+number of nodes.
+
+Nodes of which the API key was set before key fingerprints were introduced
+are found by checking the bcrypt hash of every node, so the login time grows
+with the number of nodes. Nodes with a fingerprint are found with a single
+indexed query and one bcrypt check. Run with:
+
+    python tools/benchmark-api-key-lookup.py --nodes 10 --nodes 50
+"""
+import logging
+import time
+
+import click
+
+from sqlalchemy import update
+
+from vantage6.server.model import Node
+from vantage6.server.model.base import Database, DatabaseSessionManager
+
+API_KEY = 'benchmark-api-key'
+OTHER_API_KEY = 'another-api-key'
+
+
+def add_nodes(n: int) -> None:
+    """
+    Add nodes to the database, all sharing the (bcrypt) hash of another API
+    key, as hashing a key for every node would take long.
+
+    Parameters
+    ----------
+    n : int
+        Number of nodes to add
+    """
+    session = DatabaseSessionManager.get_session()
+    session.add_all([Node(name=f'node {i}') for i in range(n)])
+    session.commit()
+    session.execute(
+        update(Node.__table__)
+        .where(Node.__table__.c.api_key.is_(None))
+        .values(api_key=Node.hash(OTHER_API_KEY),
+                api_key_fingerprint=Node.fingerprint(OTHER_API_KEY))
+    )
+    session.commit()
+
+
+def time_lookup(with_fingerprints: bool) -> float:
+    """
+    Time the lookup of the node with `API_KEY`.
+
+    Parameters
+    ----------
+    with_fingerprints : bool
+        Whether the nodes have a key fingerprint. If False, all nodes are
+        treated as nodes that were created before fingerprints existed.
+
+    Returns
+    -------
+    float
+        Number of seconds the lookup took
+    """
+    session = DatabaseSessionManager.get_session()
+    session.execute(
+        update(Node.__table__).values(
+            api_key_fingerprint=Node.fingerprint(OTHER_API_KEY)
+            if with_fingerprints else None
+        ).where(Node.__table__.c.name != 'target')
+    )
+    target = session.query(Node).filter_by(name='target').one()
+    target.api_key_fingerprint = \
+        Node.fingerprint(API_KEY) if with_fingerprints else None
+    session.commit()
+
+    start = time.perf_counter()
+    node = Node.get_by_api_key(API_KEY)
+    duration = time.perf_counter() - start
+    assert node.name == 'target'
+    return duration
+
+
+@click.command()
+@click.option('--nodes', 'node_counts', multiple=True, type=int,
+              default=[1, 10, 50, 100], help='Number of nodes to test with')
+def main(node_counts: list[int]) -> None:
+    logging.disable(logging.WARNING)
+    Database().connect('sqlite://', allow_drop_all=True)
+
+    print(f"{'nodes':>6} {'without fingerprint':>20} {'with fingerprint':>17}")
+    n_nodes = 0
+    for count in sorted(node_counts):
+        add_nodes(max(0, count - 1 - n_nodes))
+        n_nodes = max(n_nodes, count - 1)
+
+        # the node to find is the most recently added one, so that it is
+        # checked last when all nodes are checked
+        session = DatabaseSessionManager.get_session()
+        for node in session.query(Node).filter_by(name='target'):
+            session.delete(node)
+        session.commit()
+        Node(name='target', api_key=API_KEY).save()
+
+        print(f"{n_nodes + 1:>6} {time_lookup(False):>19.3f}s "
+              f"{time_lookup(True):>16.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark the number of requests per second that can be sent to a server
+with and without a pooled HTTP session.
+
+A small Flask application is started in a background thread as a stand-in
+for the vantage6 server. Run with:
+
+    python tools/benchmark-http-session.py --requests 500
+"""
+import logging
+import threading
+import time
+
+import click
+import requests
+
+from flask import Flask
+from werkzeug.serving import make_server
+
+from vantage6.common.http_session import create_http_session
+
+
+def start_server(port: int) -> None:
+    """
+    Start a Flask server that responds to every request with a small JSON
+    body, similar to the responses of the vantage6 server.
+
+    Parameters
+    ----------
+    port : int
+        Port at which the server listens
+    """
+    app = Flask(__name__)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+
+    @app.route('/api/result/<int:id>')
+    def result(id: int):
+        return {'id': id, 'result': 'x' * 100}
+
+    server = make_server('127.0.0.1', port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+
+def benchmark(get: callable, url: str, n: int) -> float:
+    """
+    Send a number of GET requests and return the requests per second.
+
+    Parameters
+    ----------
+    get : callable
+        Function that sends a GET request
+    url : str
+        URL to request
+    n : int
+        Number of requests to send
+
+    Returns
+    -------
+    float
+        Number of requests per second
+    """
+    start = time.perf_counter()
+    for i in range(n):
+        get(f"{url}/{i}").raise_for_status()
+    return n / (time.perf_counter() - start)
+
+
+@click.command()
+@click.option('--port', default=7654, help='Port of the stand-in server')
+@click.option('--requests', 'n', default=500, help='Number of requests')
+def main(port: int, n: int) -> None:
+    start_server(port)
+    url = f'http://127.0.0.1:{port}/api/result'
+
+    print(f"Sending {n} requests to {url}")
+    results = {
+        'requests.get (new connection per request)':
+            benchmark(requests.get, url, n),
+        'session without keep-alive':
+            benchmark(create_http_session(keep_alive=False).get, url, n),
+        'pooled session':
+            benchmark(create_http_session().get, url, n),
+    }
+    for name, rate in results.items():
+        print(f"{name:<45} {rate:8.1f} requests/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -42,6 +42,17 @@ setup(
         'qrcode==7.3.1',
         f'vantage6-common=={version_ns["__version__"]}',
     ],
+    extras_require={
+        # required for the 'arrow' and 'parquet' data formats
+        'arrow': [
+            'pyarrow==14.0.2'
+        ],
+        # compression codecs other than zlib
+        'compression': [
+            'lz4==4.4.5',
+            'zstandard==0.25.0'
+        ]
+    },
     tests_require=["pytest"],
     package_data={
         'vantage6.client': [
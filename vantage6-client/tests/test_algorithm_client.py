@@ -0,0 +1,55 @@
+import pickle
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+import jwt
+
+from vantage6.client.algorithm_client import AlgorithmClient
+from vantage6.common import bytes_to_base64s
+
+
+def result(value=None, finished=True, status='completed'):
+    return {
+        'result': bytes_to_base64s(pickle.dumps(value)) if finished else None,
+        'finished_at': '2023-01-01T00:00:00' if finished else None,
+        'status': status,
+    }
+
+
+class TestAlgorithmClientWait(TestCase):
+
+    def setUp(self):
+        token = jwt.encode({'sub': {'image': 'image', 'node_id': 1}}, 'key')
+        self.client = AlgorithmClient(token, 'http://localhost', 80)
+        self.client.request = MagicMock()
+
+    def test_wait_until_finished(self):
+        self.client.request.side_effect = [
+            [result(1), result(finished=False, status='active')],
+            [result(1), result(2)],
+        ]
+        self.assertEqual(self.client.wait(1), [1, 2])
+        self.client.request.assert_called_with('task/1/result/wait',
+                                               params={})
+
+    def test_failed_runs_are_not_waited_for(self):
+        self.client.request.return_value = [
+            result(1), result(finished=False, status='crashed')
+        ]
+        self.assertEqual(self.client.wait(1), [1])
+
+    def test_fallback_to_polling(self):
+        # older nodes forward the request to the server, which does not know
+        # the endpoint
+        self.client.request.side_effect = [
+            {'message': 'Not found'}, [result(1)],
+        ]
+        self.assertEqual(self.client.wait(1, interval=0), [1])
+        self.client.request.assert_called_with('task/1/result')
+
+    def test_timeout(self):
+        self.client.request.return_value = [
+            result(finished=False, status='active')
+        ]
+        with self.assertRaises(TimeoutError):
+            self.client.wait(1, timeout=0)
@@ -1,9 +1,13 @@
 import base64
+import io
+import itertools
 import json
 import pickle
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
+import requests
+
 from vantage6.client import Client
 from vantage6.common.globals import STRING_ENCODING
 
@@ -66,22 +70,44 @@ class TestClient(TestCase):
 
         assert results == [{'result': [1, 2, 3, 4, 5]}]
 
+    def test_get_results_retrieves_missing_payloads(self):
+        # the server only includes the size of payloads in its blob store
+        # when it returns multiple results
+        mock_session = TestClient._create_mock_session([
+            [{'id': 2, 'result': None, 'result_size': 11}],
+        ])
+        response = mock_session.request.return_value
+        response.__enter__.return_value = response
+        response.status_code = 200
+        response.raw = io.BytesIO(b'json.[1, 2]')
+
+        with patch.multiple('vantage6.client', jwt=TestClient._create_mock_jwt(),
+                            create_http_session=MagicMock(return_value=mock_session)):
+            client = TestClient.setup_client()
+            results = client.result.from_task(task_id=FAKE_ID)
+
+        assert results == [{'id': 2, 'result': [1, 2], 'result_size': 11}]
+        # only the missing result is retrieved, as binary data
+        mock_session.request.assert_called_once()
+        assert mock_session.request.call_args.args[1].endswith(
+            '/result/2/result'
+        )
+
     @staticmethod
     def post_task_on_mock_client(input_, serialization: str) -> dict[str, any]:
-        mock_requests = MagicMock()
-        mock_requests.get.return_value.status_code = 200
-        mock_requests.post.return_value.status_code = 200
+        mock_session = TestClient._create_mock_session()
 
         mock_jwt = TestClient._create_mock_jwt()
-        with patch.multiple('vantage6.client', requests=mock_requests, jwt=mock_jwt):
+        with patch.multiple('vantage6.client', jwt=mock_jwt,
+                            create_http_session=MagicMock(return_value=mock_session)):
             client = TestClient.setup_client()
 
             client.post_task(name=TASK_NAME, image=TASK_IMAGE, collaboration_id=COLLABORATION_ID,
                              organization_ids=ORGANIZATION_IDS, input_=input_, data_format=serialization)
 
-            # In a request.post call, json is provided with the keyword argument 'json'
+            # In a session.post call, json is provided with the keyword argument 'json'
             # call_args provides a tuple with positional arguments followed by a dict with positional arguments
-            post_content = mock_requests.post.call_args[1]['json']
+            post_content = mock_session.post.call_args[1]['json']
 
             post_input = post_content['organizations'][0]['input']
 
@@ -93,17 +119,11 @@ class TestClient(TestCase):
         mock_result_response = [{'result': mock_result}]
         mock_jwt = TestClient._create_mock_jwt()
 
-        mock_requests = MagicMock()
-        mock_requests.get.return_value.status_code = 200
-        mock_requests.post.return_value.status_code = 200
-
-        user = {'id': FAKE_ID, 'firstname': 'naam', 'organization': {'id': FAKE_ID}}
-        organization = {'id': FAKE_ID, 'name': FAKE_NAME}
-
         # The client will first send a post request for authentication, then for retrieving results.
-        mock_requests.get.return_value.json.side_effect = [user, organization, mock_result_response]
+        mock_session = TestClient._create_mock_session([mock_result_response])
 
-        with patch.multiple('vantage6.client', requests=mock_requests, jwt=mock_jwt):
+        with patch.multiple('vantage6.client', jwt=mock_jwt,
+                            create_http_session=MagicMock(return_value=mock_session)):
             client = TestClient.setup_client()
 
             results = client.result.from_task(task_id=FAKE_ID)
@@ -117,8 +137,78 @@ class TestClient(TestCase):
         client.setup_encryption(None)
         return client
 
+    @staticmethod
+    def _create_mock_session(get_responses: list = ()) -> MagicMock:
+        # the client sends all requests through a pooled HTTP session. The
+        # user and organization are retrieved when authenticating, after
+        # which the GET requests receive `get_responses`
+        user = {'id': FAKE_ID, 'firstname': 'naam', 'organization': {'id': FAKE_ID}}
+        organization = {'id': FAKE_ID, 'name': FAKE_NAME}
+
+        mock_session = MagicMock()
+        mock_session.get.return_value.status_code = 200
+        mock_session.get.return_value.json.side_effect = itertools.chain(
+            [user, organization], get_responses, itertools.repeat({})
+        )
+        mock_session.post.return_value.status_code = 200
+        mock_session.post.return_value.json.return_value = {
+            'access_token': 'fake-token'
+        }
+        return mock_session
+
     @staticmethod
     def _create_mock_jwt() -> MagicMock:
         mock_jwt = MagicMock()
         mock_jwt.decode.return_value = {'sub': FAKE_ID}
         return mock_jwt
+
+
+class TestBinaryRequest(TestCase):
+
+    def setUp(self):
+        self.session = MagicMock()
+        with patch('vantage6.client.create_http_session',
+                   return_value=self.session):
+            self.client = Client(HOST, PORT)
+        self.client._access_token = 'fake-token'
+        self.client.refresh_token = MagicMock()
+
+    @staticmethod
+    def _response(status_code: int) -> MagicMock:
+        response = MagicMock(status_code=status_code)
+        response.json.return_value = {}
+        return response
+
+    def test_connection_errors_are_retried(self):
+        self.session.request.side_effect = [
+            requests.exceptions.ConnectionError(), self._response(200)
+        ]
+        with patch('vantage6.client.time.sleep'):
+            self.client.upload_payload(1, io.BytesIO(b'payload'), FAKE_ID)
+        self.assertEqual(self.session.request.call_count, 2)
+
+    def test_token_is_refreshed_once(self):
+        responses = iter([self._response(401), self._response(200)])
+        bodies = []
+
+        def send(method, url, data=None, **kwargs):
+            bodies.append(data.read())
+            return next(responses)
+
+        self.session.request.side_effect = send
+        self.client.upload_payload(1, io.BytesIO(b'payload'), FAKE_ID)
+        self.client.refresh_token.assert_called_once()
+        # the body is sent completely on the second attempt as well
+        self.assertEqual(bodies, [b'payload', b'payload'])
+
+    def test_error_response_raises(self):
+        self.session.request.return_value = self._response(500)
+        with self.assertRaises(requests.HTTPError):
+            self.client.upload_payload(1, io.BytesIO(b'payload'), FAKE_ID)
+        with self.assertRaises(requests.HTTPError):
+            self.client.download_payload(1, io.BytesIO())
+
+        self.session.request.return_value = self._response(401)
+        with self.assertRaises(requests.HTTPError):
+            self.client.download_payload(1, io.BytesIO())
+        self.client.refresh_token.assert_called_once()
@@ -0,0 +1,40 @@
+import json
+
+from pytest import importorskip, mark, raises
+
+from vantage6.client import deserialization, serialization
+from vantage6.tools import compression
+from vantage6.tools.wrapper import load_input, write_output
+
+DATA = {'histogram': [0] * 1000}
+
+
+@mark.parametrize("codec,module", [
+    ('zlib', None), ('zstd', 'zstandard'), ('lz4', 'lz4'),
+])
+def test_round_trip(codec, module):
+    if module:
+        importorskip(module)
+    serialized = serialization.serialize(DATA, f'json+{codec}')
+    assert len(serialized) < len(json.dumps(DATA))
+
+    # results are preceded by their data format
+    formatted = f'json+{codec}.'.encode() + serialized
+    assert deserialization.load_data(formatted) == DATA
+
+
+def test_wrapper_round_trip(tmp_path):
+    output_file = tmp_path / 'output'
+    write_output('json+zlib', DATA, str(output_file))
+    assert output_file.read_bytes().startswith(b'json+zlib.')
+    assert load_input(str(output_file)) == DATA
+
+
+def test_split_data_format():
+    assert compression.split_data_format('JSON') == ('json', None)
+    assert compression.split_data_format('arrow+lz4') == ('arrow', 'lz4')
+
+
+def test_unknown_codec():
+    with raises(ValueError):
+        compression.compress(b'data', 'unknown')
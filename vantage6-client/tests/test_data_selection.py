@@ -0,0 +1,107 @@
+import pandas as pd
+from pytest import importorskip, raises
+
+from vantage6.tools import columnar, data_selection, wrapper
+from vantage6.tools.data_selection import DataSelection
+
+DATA = pd.DataFrame({
+    'id': range(10),
+    'age': [15, 25, 35, 45, 55, 65, 75, 85, 95, 105],
+    'sex': list('mfmfmfmfmf'),
+    'unused': [0.5] * 10,
+})
+INPUT = {
+    'method': 'average',
+    'data_selection': {
+        'columns': ['age', 'id'],
+        'filters': [['age', '>=', 30], ['sex', 'in', ['f']]],
+        'dtypes': {'age': 'float64'},
+    },
+}
+EXPECTED = pd.DataFrame({
+    'age': [45.0, 65.0, 85.0, 105.0],
+    'id': [3, 5, 7, 9],
+})
+
+
+def test_selection_from_input():
+    selection = DataSelection.from_input(INPUT)
+    assert selection.columns == ['age', 'id']
+    assert selection.filters == [('age', '>=', 30), ('sex', 'in', ['f'])]
+    assert selection.columns_to_read == ['age', 'id', 'sex']
+    assert DataSelection.from_input({}) == DataSelection()
+    assert DataSelection.from_input({}).columns_to_read is None
+    # the selection is only read from the `data_selection` key, other keys
+    # of the input belong to the algorithm
+    assert DataSelection.from_input(
+        {'columns': 'age', 'filters': 'age'}
+    ) == DataSelection()
+
+
+def test_invalid_selection_raises_value_error():
+    invalid = [
+        ['age'],
+        {'columns': 'age'},
+        {'filters': [['age', '>=']]},
+        {'filters': [['age', 'like', 30]]},
+        {'dtypes': ['float64']},
+    ]
+    for selection in invalid:
+        with raises(ValueError):
+            DataSelection.from_input({'data_selection': selection})
+
+
+def test_csv_wrapper_loads_selection(tmp_path, monkeypatch):
+    path = tmp_path / 'data.csv'
+    DATA.to_csv(path, index=False)
+    # rows are filtered per chunk, also when they span multiple chunks
+    monkeypatch.setattr(data_selection, 'CSV_CHUNK_SIZE', 3)
+
+    data = wrapper.CSVWrapper.load_data(str(path), INPUT)
+    pd.testing.assert_frame_equal(data, EXPECTED)
+
+    data = wrapper.CSVWrapper.load_data(
+        str(path), {'data_selection': {'columns': ['sex']}}
+    )
+    pd.testing.assert_frame_equal(data, DATA[['sex']])
+
+    data = wrapper.CSVWrapper.load_data(
+        str(path), {'data_selection': {'filters': [['age', '>', 200]]}}
+    )
+    assert list(data.columns) == list(DATA.columns)
+    assert data.empty
+
+
+def test_csv_wrapper_without_selection_loads_everything(tmp_path):
+    path = tmp_path / 'data.csv'
+    DATA.to_csv(path, index=False)
+    data = wrapper.CSVWrapper.load_data(str(path), {'method': 'average'})
+    pd.testing.assert_frame_equal(data, DATA)
+
+
+def test_parquet_wrapper_loads_selection(tmp_path):
+    importorskip('pyarrow')
+    path = tmp_path / 'data.parquet'
+    DATA.to_parquet(path, row_group_size=3)
+
+    data = wrapper.ParquetWrapper.load_data(str(path), INPUT)
+    pd.testing.assert_frame_equal(data, EXPECTED)
+
+
+def test_excel_wrapper_loads_selection(tmp_path):
+    importorskip('openpyxl')
+    path = tmp_path / 'data.xlsx'
+    DATA.to_excel(path, index=False)
+
+    data = wrapper.ExcelWrapper.load_data(str(path), INPUT)
+    pd.testing.assert_frame_equal(data, EXPECTED)
+
+
+def test_dataset_cache_loads_selection(tmp_path, monkeypatch):
+    importorskip('pyarrow')
+    cache_file = tmp_path / 'data.arrow'
+    columnar.write_arrow_file(DATA, cache_file)
+    monkeypatch.setenv('DEFAULT_DATABASE_CACHE_URI', str(cache_file))
+
+    data = wrapper.CSVWrapper()._load_cached_data('default', INPUT)
+    pd.testing.assert_frame_equal(data, EXPECTED)
@@ -1,6 +1,11 @@
 import pickle
 from pathlib import Path
-from vantage6.tools import deserialization
+
+import pandas as pd
+from pytest import importorskip, mark
+
+from vantage6.client import deserialization as client_deserialization
+from vantage6.tools import deserialization, serialization
 from vantage6.tools.data_format import DataFormat
 
 SIMPLE_TARGET_DATA = {'key': 'value'}
@@ -28,3 +33,23 @@ def test_deserialize_pickle(tmp_path: Path):
     with pickle_path.open('rb') as f:
         result = deserialization.deserialize(f, DataFormat.PICKLE)
         assert SIMPLE_TARGET_DATA == result
+
+
+@mark.parametrize("data_format", [DataFormat.ARROW, DataFormat.PARQUET])
+def test_deserialize_columnar(tmp_path: Path, data_format):
+    importorskip('pyarrow')
+    data = pd.DataFrame({'bin': [0, 1, 2], 'count': [10.0, 4.0, 7.5]})
+    serialized = serialization.serialize(data, data_format)
+
+    # the data is preceded by the data format, as in the input file
+    path = tmp_path / 'columnar'
+    path.write_bytes(data_format.value.encode() + b'.' + serialized)
+
+    with path.open('rb') as f:
+        f.seek(len(data_format.value) + 1)
+        result = deserialization.deserialize(f, data_format)
+    pd.testing.assert_frame_equal(data, result)
+
+    # the client reads the same format from bytes
+    result = client_deserialization.load_data(path.read_bytes())
+    pd.testing.assert_frame_equal(data, result)
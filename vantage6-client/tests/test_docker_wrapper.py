@@ -4,9 +4,9 @@ from pathlib import Path
 from unittest.mock import patch, MagicMock
 
 import pandas as pd
-from pytest import raises
+from pytest import importorskip, raises
 
-from vantage6.tools import wrapper
+from vantage6.tools import columnar, wrapper
 from vantage6.tools.exceptions import DeserializationException
 
 MODULE_NAME = 'algorithm_module'
@@ -184,3 +184,25 @@ def test_sparql_docker_wrapper_passes_dataframe(
 
     target_df = pd.DataFrame([[1, 2]], columns=['column1', 'column2'])
     pd.testing.assert_frame_equal(target_df, dispatch_rpc.call_args[0][0])
+
+
+def test_csv_wrapper_reads_dataset_cache(tmp_path: Path, monkeypatch):
+    importorskip('pyarrow')
+    cache_file = tmp_path / 'data.arrow'
+    columnar.write_arrow_file(SAMPLE_DB, cache_file)
+    monkeypatch.setenv('DEFAULT_DATABASE_CACHE_URI', str(cache_file))
+
+    data = wrapper.CSVWrapper()._load_cached_data('default', {})
+    pd.testing.assert_frame_equal(data, SAMPLE_DB)
+
+    # wrappers that do not read the complete database ignore the cache
+    assert wrapper.SQLWrapper()._load_cached_data('default', {}) is None
+
+
+def test_dataset_cache_falls_back_to_database(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv('DEFAULT_DATABASE_CACHE_URI',
+                       str(tmp_path / 'missing.arrow'))
+    assert wrapper.CSVWrapper()._load_cached_data('default', {}) is None
+
+    monkeypatch.delenv('DEFAULT_DATABASE_CACHE_URI')
+    assert wrapper.CSVWrapper()._load_cached_data('default', {}) is None
@@ -1,6 +1,6 @@
 import pickle
 
-from pytest import mark
+from pytest import importorskip, mark
 
 from vantage6.tools import serialization
 import pandas as pd
@@ -42,3 +42,16 @@ def test_pickle_serialization_pandas():
     pickled = serialization.serialize(data, DataFormat.PICKLE)
 
     pd.testing.assert_frame_equal(data, pickle.loads(pickled))
+
+
+@mark.parametrize("data_format", [DataFormat.ARROW, DataFormat.PARQUET])
+def test_columnar_serialization(data_format):
+    pa = importorskip('pyarrow')
+    data = pd.DataFrame({'bin': [0, 1, 2], 'count': [10.0, 4.0, 7.5]})
+    serialized = serialization.serialize(data, data_format)
+
+    if data_format == DataFormat.ARROW:
+        table = pa.ipc.open_file(pa.py_buffer(serialized)).read_all()
+    else:
+        table = pa.parquet.read_table(pa.BufferReader(serialized))
+    pd.testing.assert_frame_equal(data, table.to_pandas())
@@ -4,8 +4,10 @@ vantage6 clients
 This module is contains a base client. From this base client the container
 client (client used by master algorithms) and the user client are derived.
 """
+import io
 import logging
 import pickle
+import tempfile
 import time
 import typing
 import jwt
@@ -16,12 +18,18 @@ import itertools
 import sys
 import traceback
 
+from http import HTTPStatus
 from pathlib import Path
 
 from vantage6.common.exceptions import AuthenticationException
 from vantage6.common import bytes_to_base64s, base64s_to_bytes
-from vantage6.common.globals import APPNAME
+from vantage6.common.globals import (
+    APPNAME, DEFAULT_HTTP_POOL_SIZE, DEFAULT_HTTP_MAX_RETRIES,
+    DEFAULT_HTTP_BACKOFF_FACTOR
+)
 from vantage6.common.encryption import RSACryptor, DummyCryptor
+from vantage6.common.public_key_cache import PublicKeyCache
+from vantage6.common.http_session import create_http_session
 from vantage6.common import WhoAmI
 from vantage6.client import serialization, deserialization
 from vantage6.client.filter import post_filtering
@@ -59,7 +67,11 @@ class ClientBase(object):
     generic requests, create tasks and retrieve results.
     """
 
-    def __init__(self, host: str, port: int, path: str = '/api') -> None:
+    def __init__(self, host: str, port: int, path: str = '/api',
+                 pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+                 max_retries: int = DEFAULT_HTTP_MAX_RETRIES,
+                 backoff_factor: float = DEFAULT_HTTP_BACKOFF_FACTOR,
+                 keep_alive: bool = True) -> None:
         """Basic setup for the client
 
         Parameters
@@ -70,6 +82,17 @@ class ClientBase(object):
             port numer to which the server listens
         path : str, optional
             path of the api, by default '/api'
+        pool_size : int, optional
+            Maximum number of connections to the server that are kept open,
+            by default 10
+        max_retries : int, optional
+            Number of times a request is retried when the connection fails
+            or the server is unavailable, by default 3
+        backoff_factor : float, optional
+            Factor (in seconds) of the exponential backoff between retries,
+            by default 0.5
+        keep_alive : bool, optional
+            Whether connections to the server are reused, by default True
         """
 
         self.log = logging.getLogger(module_name)
@@ -87,6 +110,15 @@ class ClientBase(object):
         self.cryptor = None
         self.whoami = None
 
+        # connections to the server are reused for subsequent requests
+        self.session = create_http_session(pool_size, max_retries,
+                                           backoff_factor, keep_alive)
+
+        # public keys of organizations, used to encrypt input and results
+        self.public_keys = PublicKeyCache(
+            self._fetch_public_key, self._fetch_collaboration_public_keys
+        )
+
     @property
     def name(self) -> str:
         """
@@ -226,12 +258,12 @@ class ClientBase(object):
 
         # get appropiate method
         rest_method = {
-            'get': requests.get,
-            'post': requests.post,
-            'put': requests.put,
-            'patch': requests.patch,
-            'delete': requests.delete
-        }.get(method.lower(), requests.get)
+            'get': self.session.get,
+            'post': self.session.post,
+            'put': self.session.put,
+            'patch': self.session.patch,
+            'delete': self.session.delete
+        }.get(method.lower(), self.session.get)
 
         # send request to server
         url = self.generate_path_to(endpoint)
@@ -331,9 +363,52 @@ class ClientBase(object):
                 json={"public_key": cryptor.public_key_str}
             )
             self.log.info("The public key on the server is updated!")
+            self.public_keys.invalidate(self.whoami.organization_id)
 
         self.cryptor = cryptor
 
+    def _fetch_public_key(self, organization_id: int) -> str | None:
+        """
+        Retrieve the public key of an organization from the server.
+
+        Parameters
+        ----------
+        organization_id : int
+            Id of the organization
+
+        Returns
+        -------
+        str | None
+            Base64 encoded public key, or None if it is not available
+        """
+        return self.request(f"organization/{organization_id}")\
+            .get("public_key")
+
+    def _fetch_collaboration_public_keys(
+            self, collaboration_id: int) -> dict[int, str | None]:
+        """
+        Retrieve the public keys of all organizations in a collaboration from
+        the server.
+
+        Parameters
+        ----------
+        collaboration_id : int
+            Id of the collaboration
+
+        Returns
+        -------
+        dict[int, str | None]
+            Base64 encoded public keys, keyed by organization id
+        """
+        organizations = self.request(
+            "organization", params={"collaboration_id": collaboration_id}
+        )
+        if not isinstance(organizations, list):
+            self.log.error("Could not retrieve public keys of collaboration "
+                           f"{collaboration_id}")
+            return {}
+        return {org["id"]: org.get("public_key") for org in organizations}
+
     def authenticate(self, credentials: dict,
                      path: str = "token/user") -> bool:
         """Authenticate to the vantage6-server
@@ -369,7 +444,7 @@ class ClientBase(object):
 
         # authenticate to the central server
         url = self.generate_path_to(path)
-        response = requests.post(url, json=credentials)
+        response = self.session.post(url, json=credentials)
         data = response.json()
 
         # handle negative responses
@@ -423,7 +498,7 @@ class ClientBase(object):
             url = f"{self.__host}{self.__refresh_url}"
 
         # send request to server
-        response = requests.post(url, headers={
+        response = self.session.post(url, headers={
             'Authorization': 'Bearer ' + self.__refresh_token
         })
 
@@ -443,7 +518,9 @@ class ClientBase(object):
                   data_format=LEGACY, database: str = 'default') -> dict:
         """Post a new task at the server
 
-        It will also encrypt `input_` for each receiving organization.
+        It will also encrypt `input_` for the receiving organizations. The
+        input is encrypted once, and only the key to decrypt it is encrypted
+        for each receiving organization.
 
         Parameters
         ----------
@@ -462,10 +539,10 @@ class ClientBase(object):
             Ids of organizations (within the collaboration) that need to
             execute this task, by default None
         data_format : str, optional
-            Type of data format to use to send and receive
-            data. possible values: 'json', 'pickle', 'legacy'. 'legacy'
-            will use pickle serialization. Default is 'legacy'., by default
-            LEGACY
+            Type of data format to use to send and receive data. Possible
+            values: 'json', 'pickle', 'arrow', 'parquet' and 'legacy'.
+            'legacy' will use pickle serialization. 'arrow' and 'parquet'
+            require pyarrow and tabular input. By default 'legacy'.
         database : str, optional
             Database label to use for the task, by default 'default'
 
@@ -479,6 +556,23 @@ class ClientBase(object):
         AssertionError
             Encryption has not yet been setup.
         """
+        return self.request('task', method='post', json=self._task_json(
+            name, image, collaboration_id, input_, description,
+            organization_ids, data_format, database
+        ))
+
+    def _task_json(self, name: str, image: str, collaboration_id: int,
+                   input_='', description='', organization_ids: list = None,
+                   data_format=LEGACY, database: str = 'default') -> dict:
+        """
+        Create the request body to create a task, see `post_task`.
+
+        Returns
+        -------
+        dict
+            Request body, containing the encrypted input for each of the
+            receiving organizations
+        """
         assert self.cryptor, "Encryption has not yet been setup!"
 
         if organization_ids is None:
@@ -492,26 +586,28 @@ class ClientBase(object):
             serialized_input = data_format.encode() + b'.' \
                 + serialization.serialize(input_, data_format)
 
+        # The input is encrypted only once, and the shared key is wrapped for
+        # each of the receiving organizations
+        pub_keys = self.public_keys.get_many(organization_ids)
+        encrypted_input = self.cryptor.encrypt_bytes_to_str_multi(
+            serialized_input, pub_keys
+        ) if organization_ids else ''
+
         organization_json_list = []
         for org_id in organization_ids:
-            pub_key = self.request(f"organization/{org_id}").get("public_key")
-            # pub_key = base64s_to_bytes(pub_key)
-            # self.log.debug(pub_key)
-
             organization_json_list.append({
                 "id": org_id,
-                "input": self.cryptor.encrypt_bytes_to_str(serialized_input,
-                                                           pub_key)
+                "input": encrypted_input
             })
 
-        return self.request('task', method='post', json={
+        return {
             "name": name,
             "image": image,
             "collaboration_id": collaboration_id,
             "description": description,
             "organizations": organization_json_list,
             'database': database
-        })
+        }
 
     # TODO BvB 23-01-23 remove this method in v4+ (or make it private?). It is
     # only here for backwards compatibility.
@@ -583,6 +679,7 @@ class ClientBase(object):
             # Multiple results
             for result in results:
                 self._decrypt_result(result)
+                self._load_missing_payloads(result)
 
         if 'wrapper' in locals():
             wrapper['data'] = results
@@ -590,6 +687,34 @@ class ClientBase(object):
 
         return results
 
+    def _load_missing_payloads(self, result: dict) -> None:
+        """
+        Download and decrypt the input and result of a result that were not
+        included in a list of results.
+
+        The server does not include payloads that are stored in its blob
+        store when it returns multiple results, but only their size. Only
+        these payloads are retrieved, from the binary payload endpoint. The
+        result dict is changed *in-place*.
+
+        Parameters
+        ----------
+        result : dict
+            The (decrypted) result dict, as part of a list of results
+
+        Raises
+        ------
+        requests.HTTPError
+            If the server responds with an error
+        """
+        if 'id' not in result:
+            return
+        for field in ('input', 'result'):
+            if result.get(field) is None and result.get(f'{field}_size'):
+                payload = io.BytesIO()
+                self.download_payload(result['id'], payload, field)
+                result[field] = payload.getvalue()
+
     def _decrypt_result(self, result: dict) -> None:
         """
         Helper to decrypt the keys 'input' and 'result' in dict.
@@ -620,16 +745,155 @@ class ClientBase(object):
             self.log.debug(e)
 
         try:
-            if result["result"]:
+            if result.get("result"):
                 self.log.info('Decrypting result')
-                result["result"] = \
-                    cryptor.decrypt_str_to_bytes(result["result"])
+                result["result"] = cryptor.decrypt_str_to_bytes(
+                    result["result"]
+                )
 
         except ValueError as e:
             self.log.error("Could not decrypt/decode input or result.")
             self.log.error(e)
             # raise
 
+    def download_payload(self, result_id: int, out_fp: typing.BinaryIO,
+                         field: str = 'result') -> None:
+        """
+        Download and decrypt the input or result of a result as binary data.
+
+        The payload is streamed from the server and decrypted in chunks, so
+        that large payloads are never kept in memory completely.
+
+        Parameters
+        ----------
+        result_id : int
+            Id of the result
+        out_fp : typing.BinaryIO
+            File-like object to which the decrypted payload is written
+        field : str, optional
+            Either 'input' or 'result', by default 'result'
+
+        Raises
+        ------
+        requests.HTTPError
+            If the server responds with an error
+        """
+        cryptor = self.cryptor or DummyCryptor()
+        with self._binary_request(f"result/{result_id}/{field}",
+                                  stream=True) as response:
+            response.raw.decode_content = True
+            cryptor.decrypt_stream(response.raw, out_fp, binary=True)
+
+    def upload_payload(self, result_id: int, in_fp: typing.BinaryIO,
+                       organization_id: int, field: str = 'result') -> dict:
+        """
+        Encrypt and upload the input or result of a result as binary data.
+
+        The payload is encrypted in chunks to a temporary file, which is
+        then streamed to the server.
+
+        Parameters
+        ----------
+        result_id : int
+            Id of the result
+        in_fp : typing.BinaryIO
+            File-like object containing the payload to upload
+        organization_id : int
+            Id of the organization for which the payload is encrypted
+        field : str, optional
+            Either 'input' or 'result', by default 'result'
+
+        Returns
+        -------
+        dict
+            Response of the server
+
+        Raises
+        ------
+        requests.HTTPError
+            If the server responds with an error
+        """
+        cryptor = self.cryptor or DummyCryptor()
+        public_key = self.public_keys.get(organization_id) \
+            if isinstance(cryptor, RSACryptor) else None
+
+        with tempfile.TemporaryFile() as encrypted:
+            cryptor.encrypt_stream(in_fp, encrypted, public_key, binary=True)
+            response = self._binary_request(
+                f"result/{result_id}/{field}", method='put', data=encrypted,
+                headers={'Content-Type': 'application/octet-stream'}
+            )
+        return response.json()
+
+    def _binary_request(self, endpoint: str, method: str = 'get',
+                        data: typing.BinaryIO | None = None,
+                        headers: dict | None = None, stream: bool = False,
+                        first_try: bool = True) -> requests.Response:
+        """
+        Send a request with a binary body or response to the server.
+
+        Like `request`, connection errors are retried and the token is
+        refreshed once when it has expired. Unlike `request`, an error
+        response raises an exception, as binary payloads have no JSON
+        message that callers can check.
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint of the server
+        method : str, optional
+            Http verb, by default 'get'
+        data : typing.BinaryIO | None, optional
+            Seekable file-like object with the request body. It is sent from
+            the start on every attempt.
+        headers : dict | None, optional
+            Headers in addition to the authorization header
+        stream : bool, optional
+            Whether to stream the response body, by default False
+
+        Returns
+        -------
+        requests.Response
+            Response of the server
+
+        Raises
+        ------
+        requests.HTTPError
+            If the server responds with an error
+        """
+        url = self.generate_path_to(endpoint)
+        self.log.debug(f'Making binary request: {method.upper()} | {url}')
+        while True:
+            if data is not None:
+                data.seek(0)
+            try:
+                response = self.session.request(
+                    method, url, data=data, stream=stream,
+                    headers={**self.headers, **(headers or {})}
+                )
+                break
+            except requests.exceptions.ConnectionError as e:
+                # the request is sent completely again, so it is safe to
+                # retry
+                self.log.error('Connection error... Retrying')
+                self.log.debug(e)
+                time.sleep(1)
+
+        if 200 <= response.status_code < 300:
+            return response
+
+        response.close()
+        self.log.error(
+            f'Server responded with error code: {response.status_code}')
+        if response.status_code == HTTPStatus.UNAUTHORIZED and first_try:
+            self.refresh_token()
+            return self._binary_request(endpoint, method, data, headers,
+                                        stream, first_try=False)
+        raise requests.HTTPError(
+            f"{method.upper()} {url} failed with status code "
+            f"{response.status_code}", response=response
+        )
+
     class SubClient:
         """
         Create sub groups of commands using this SubClient
@@ -1790,7 +2054,8 @@ class UserClient(ClientBase):
                  name: str = None, include_results: bool = False,
                  description: str = None, database: str = None,
                  result: int = None, status: str = None, page: int = 1,
-                 per_page: int = 20, include_metadata: bool = True) -> dict:
+                 per_page: int = 20, include_metadata: bool = True,
+                 fields: list[str] = None) -> dict:
             """List tasks
 
             Parameters
@@ -1831,6 +2096,10 @@ class UserClient(ClientBase):
                 Whenever to include the pagination metadata. If this is
                 set to False the output is no longer wrapped in a
                 dictonairy, by default True
+            fields: list[str], optional
+                Only return these fields of the tasks, e.g. ['id',
+                'status']. Fields of the included results can be selected
+                with 'results.<field>'. By default all fields are returned.
 
             Returns
             -------
@@ -1858,6 +2127,7 @@ class UserClient(ClientBase):
                 'name': name, 'page': page, 'per_page': per_page,
                 'description': description, 'database': database,
                 'result_id': result, 'status': status,
+                'fields': ','.join(fields) if fields else None,
             }
             includes = []
             if include_results:
@@ -1904,6 +2174,38 @@ class UserClient(ClientBase):
                                          description, organizations,
                                          data_format, database)
 
+        def create_batch(self, tasks: typing.List[dict]) \
+                -> typing.List[dict]:
+            """Create multiple tasks in a single request
+
+            The tasks are only created if all of them are valid. This is
+            useful to e.g. run a parameter sweep.
+
+            Parameters
+            ----------
+            tasks : list[dict]
+                Tasks to create. Each task is a dictionary with the keys
+                `collaboration`, `organizations`, `name`, `image`,
+                `description`, `input` and optionally `data_format` and
+                `database`, see `create`.
+
+            Returns
+            -------
+            list[dict]
+                The created tasks
+            """
+            return self.parent.request('task/batch', method='post', json={
+                'tasks': [
+                    self.parent._task_json(
+                        task['name'], task['image'], task['collaboration'],
+                        task['input'], task['description'],
+                        task['organizations'],
+                        task.get('data_format', LEGACY),
+                        task.get('database', 'default')
+                    ) for task in tasks
+                ]
+            })
+
         def delete(self, id_: int) -> dict:
             """Delete a task
 
@@ -1983,7 +2285,8 @@ class UserClient(ClientBase):
                  assigned: tuple[str, str] = None,
                  finished: tuple[str, str] = None, port: int = None,
                  page: int = None, per_page: int = None,
-                 include_metadata: bool = True) -> dict | list[dict]:
+                 include_metadata: bool = True,
+                 fields: list[str] = None) -> dict | list[dict]:
             """List results
 
             Parameters
@@ -2013,6 +2316,10 @@ class UserClient(ClientBase):
             include_metedata: bool, optional
                 Whenevet to include pagination metadata, defaults to
                 True
+            fields: list[str], optional
+                Only return these fields of the results, e.g. ['id',
+                'finished_at']. The input and result are only retrieved from
+                the server when requested. By default all fields are returned.
 
             Returns
             -------
@@ -2041,7 +2348,7 @@ class UserClient(ClientBase):
                 'started_from': s_from, 'started_till': s_till,
                 'assigned_from': a_from, 'assigned_till': a_till,
                 'finished_from': f_from, 'finished_till': f_till,
-                'port': port
+                'port': port, 'fields': ','.join(fields) if fields else None
             }
 
             results = self.parent.get_results(params=params)
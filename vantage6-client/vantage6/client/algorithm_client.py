@@ -1,6 +1,8 @@
 import jwt
 import pickle
+import time
 
+from vantage6.common.task_status import has_task_failed
 from vantage6.client import ClientBase
 from vantage6.client import base64s_to_bytes, bytes_to_base64s
 
@@ -81,6 +83,78 @@ class AlgorithmClient(ClientBase):
         """
         return super().request(*args, **kwargs, retry=False)
 
+    def wait(self, task_id: int, timeout: float = None,
+             interval: float = 1) -> list:
+        """
+        Wait until all results of a task are finished and return them.
+
+        The proxy server keeps the request open until the results are
+        finished, so the algorithm is notified as soon as they are available
+        without polling the central server. If the node does not support
+        this, the results are polled every `interval` seconds instead.
+
+        Parameters
+        ----------
+        task_id: int
+            ID of the task from which you want to obtain the results
+        timeout: float, optional
+            Maximum number of seconds to wait. If the results are not finished
+            by then, a TimeoutError is raised. By default, wait indefinitely.
+        interval: float, optional
+            Number of seconds between polls if the node does not support
+            waiting for results, by default 1
+
+        Returns
+        -------
+        list
+            List of results. The type of the results depends on the
+            algorithm.
+
+        Raises
+        ------
+        TimeoutError
+            If the results are not finished within `timeout` seconds
+        """
+        deadline = time.monotonic() + timeout if timeout is not None \
+            else None
+        wait_endpoint_available = True
+        while True:
+            params = {}
+            if deadline is not None:
+                params['timeout'] = max(0, deadline - time.monotonic())
+
+            results = None
+            if wait_endpoint_available:
+                results = self.request(f"task/{task_id}/result/wait",
+                                       params=params)
+                # older nodes do not have this endpoint and respond with an
+                # error message instead of a list of results
+                if not isinstance(results, list):
+                    self.log.debug("Waiting for results is not supported by "
+                                   "the node, polling instead")
+                    wait_endpoint_available = False
+            if not wait_endpoint_available:
+                results = self.request(f"task/{task_id}/result")
+                if not isinstance(results, list):
+                    raise RuntimeError(
+                        f"Could not retrieve results of task {task_id}: "
+                        f"{results}"
+                    )
+
+            # runs that crashed or were killed are not finished, but will not
+            # produce a result either
+            if all(r.get('finished_at') or
+                   (r.get('status') and has_task_failed(r['status']))
+                   for r in results):
+                return self.result.decode(results)
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(
+                    f"Results of task {task_id} not finished within "
+                    f"{timeout} seconds"
+                )
+            if not wait_endpoint_available:
+                time.sleep(interval)
+
     class Result(ClientBase.SubClient):
         """
         Result client for the algorithm container.
@@ -114,7 +188,23 @@ class AlgorithmClient(ClientBase):
             results = self.parent.request(
                 f"task/{task_id}/result"
             )
+            return self.decode(results)
 
+        def decode(self, results: list[dict]) -> list:
+            """
+            Decode the results of a task as they are returned by the server.
+
+            Parameters
+            ----------
+            results: list[dict]
+                Results as returned by the server
+
+            Returns
+            -------
+            list
+                List of results. The type of the results depends on the
+                algorithm.
+            """
             decoded_results = []
             # Encryption is not done at the client level for the container. The
             # algorithm developer is responsible for decrypting the results.
@@ -8,9 +8,11 @@ import json
 import logging
 import pickle
 from .exceptions import DeserializationException
+from vantage6.tools import columnar, compression
 
 _DATA_FORMAT_SEPARATOR = '.'
-_MAX_FORMAT_STRING_LENGTH = 10
+# long enough for a data format followed by a compression codec
+_MAX_FORMAT_STRING_LENGTH = 20
 
 logger = logging.getLogger(__name__)
 
@@ -21,13 +23,16 @@ def deserialize(file, data_format):
     """
     Lookup data_format in deserializer mapping and return the associated
     :param file:
-    :param data_format:
+    :param data_format: data format, optionally followed by the compression codec of `file`,
+        e.g. 'json+zstd'
     :return:
     """
+    data_format, codec = compression.split_data_format(data_format)
     try:
-        return _deserializers[data_format.lower()](file)
+        deserialize_ = _deserializers[data_format]
     except KeyError:
         raise Exception(f'Deserialization of {data_format} has not been implemented.')
+    return deserialize_(compression.decompress(file, codec))
 
 
 def deserializer(data_format):
@@ -58,6 +63,20 @@ def deserialize_pickle(file):
     return pickle.loads(file)
 
 
+@deserializer('arrow')
+def deserialize_arrow(file):
+    return columnar.read_arrow(file)
+
+
+@deserializer('parquet')
+def deserialize_parquet(file):
+    return columnar.read_parquet(file)
+
+
+# uncompressed formats of which the deserializer accepts a memoryview
+_zero_copy_formats = {('arrow', None), ('parquet', None)}
+
+
 def unpack_legacy_results(result):
     return pickle.loads(result.get("result"))
 
@@ -83,7 +102,11 @@ def load_data(input_bytes: bytes):
 
 def _read_formatted(input_bytes):
     data_format = str.join('', list(_read_data_format(input_bytes)))
-    return deserialize(input_bytes[len(data_format) + 1:], data_format)
+    offset = len(data_format) + 1
+    if compression.split_data_format(data_format) in _zero_copy_formats:
+        # refer to the input instead of copying it
+        return deserialize(memoryview(input_bytes)[offset:], data_format)
+    return deserialize(input_bytes[offset:], data_format)
 
 
 def _read_data_format(input_bytes):
@@ -1,6 +1,8 @@
 import json
 import pickle
 
+from vantage6.tools import columnar, compression
+
 _serializers = {}
 
 
@@ -8,13 +10,17 @@ def serialize(data, data_format) -> bytes:
     """
     Serialize data using the specified format
     :param data: the data to be serialized
-    :param data_format: the desired data format. Valid options are 'json', 'pickle'.
+    :param data_format: the desired data format. Valid options are 'json', 'pickle', 'arrow',
+        'parquet', optionally followed by a compression codec, e.g. 'json+zstd'. Available codecs
+        are 'zstd', 'lz4' and 'zlib'.
     :return: a bytes-like object in the specified serialization format
     """
+    data_format, codec = compression.split_data_format(data_format)
     try:
-        return _serializers[data_format.lower()](data)
+        serialize_ = _serializers[data_format]
     except KeyError:
         raise Exception(f'Serialization of {data_format} has not been implemented.')
+    return compression.compress(serialize_(data), codec)
 
 
 def serializer(data_format):
@@ -43,3 +49,13 @@ def serialize_json(file) -> bytes:
 @serializer('pickle')
 def serialize_pickle(file) -> bytes:
     return pickle.dumps(file)
+
+
+@serializer('arrow')
+def serialize_arrow(file) -> bytes:
+    return columnar.write_arrow(file)
+
+
+@serializer('parquet')
+def serialize_parquet(file) -> bytes:
+    return columnar.write_parquet(file)
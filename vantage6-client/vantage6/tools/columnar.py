@@ -0,0 +1,219 @@
+"""
+Columnar (Apache Arrow) serialization of tabular algorithm input and output.
+
+Tabular data, e.g. pandas DataFrames with partial results such as histograms
+or covariance blocks, is serialized to the Arrow IPC file format or to
+Parquet. Compared to JSON, the columns are kept in their binary
+representation, and deserialized data can reference the received buffer
+instead of copying it.
+
+The `pyarrow` package is an optional dependency, that is only required when
+one of these formats is used.
+"""
+from __future__ import annotations
+
+import io
+
+from typing import Any, BinaryIO
+
+import pandas as pd
+
+
+def import_pyarrow():
+    """
+    Import pyarrow, which is only required for the columnar formats.
+
+    Returns
+    -------
+    module
+        The pyarrow module
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.ipc  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "The 'arrow' and 'parquet' data formats require pyarrow. Install "
+            "it with 'pip install pyarrow'."
+        ) from e
+    return pyarrow
+
+
+def to_arrow_table(data: Any):
+    """
+    Convert data to an Arrow table.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame | pandas.Series | pyarrow.Table | dict
+        Data to convert. Dictionaries should map column names to columns of
+        equal length.
+
+    Returns
+    -------
+    pyarrow.Table
+        The data as Arrow table
+
+    Raises
+    ------
+    TypeError
+        If the data cannot be represented as a table
+    """
+    pa = import_pyarrow()
+    if isinstance(data, pa.Table):
+        return data
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    if isinstance(data, pd.DataFrame):
+        return pa.Table.from_pandas(data)
+    if isinstance(data, dict):
+        return pa.table(data)
+    raise TypeError(
+        f"Data of type {type(data)} cannot be serialized to a columnar "
+        "format. Use a pandas DataFrame, pyarrow Table or dictionary of "
+        "columns."
+    )
+
+
+def write_arrow(data: Any) -> bytes:
+    """
+    Serialize data to the Arrow IPC file format.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame | pandas.Series | pyarrow.Table | dict
+        Data to serialize
+
+    Returns
+    -------
+    bytes
+        The serialized data
+    """
+    pa = import_pyarrow()
+    table = to_arrow_table(data)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def write_arrow_file(data: Any, path: str) -> None:
+    """
+    Write data to a file in the Arrow IPC file format.
+
+    Unlike `write_arrow`, the serialized data is not kept in memory.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame | pandas.Series | pyarrow.Table | dict
+        Data to write
+    path : str
+        Path of the file
+    """
+    pa = import_pyarrow()
+    table = to_arrow_table(data)
+    with pa.OSFile(str(path), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def write_parquet(data: Any) -> bytes:
+    """
+    Serialize data to Parquet.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame | pandas.Series | pyarrow.Table | dict
+        Data to serialize
+
+    Returns
+    -------
+    bytes
+        The serialized data
+    """
+    pa = import_pyarrow()
+    sink = pa.BufferOutputStream()
+    pa.parquet.write_table(to_arrow_table(data), sink)
+    return sink.getvalue().to_pybytes()
+
+
+def read_arrow(buffer: bytes | memoryview | Any,
+               columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Deserialize data in the Arrow IPC file format to a DataFrame.
+
+    The Arrow table references `buffer` instead of copying it, and columns
+    are converted to pandas without consolidating them into a single block,
+    so that numerical columns without missing values are not copied.
+
+    Parameters
+    ----------
+    buffer : bytes | memoryview | pyarrow.Buffer
+        Serialized data
+    columns : list[str] | None
+        Columns to convert to pandas, by default all columns. The other
+        columns are not converted at all.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The deserialized data
+    """
+    pa = import_pyarrow()
+    table = pa.ipc.open_file(pa.py_buffer(buffer)).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
+
+
+def read_parquet(buffer: bytes | memoryview | Any) -> pd.DataFrame:
+    """
+    Deserialize Parquet data to a DataFrame.
+
+    Parameters
+    ----------
+    buffer : bytes | memoryview | pyarrow.Buffer
+        Serialized data
+
+    Returns
+    -------
+    pandas.DataFrame
+        The deserialized data
+    """
+    pa = import_pyarrow()
+    table = pa.parquet.read_table(pa.BufferReader(pa.py_buffer(buffer)))
+    return table.to_pandas(split_blocks=True)
+
+
+def map_file(file: BinaryIO):
+    """
+    Memory map the rest of an opened file, starting at its current position.
+
+    Files that cannot be memory mapped (e.g. in-memory streams) are read
+    instead.
+
+    Parameters
+    ----------
+    file : BinaryIO
+        Opened file
+
+    Returns
+    -------
+    pyarrow.Buffer | bytes
+        The contents of the file from the current position
+    """
+    pa = import_pyarrow()
+    try:
+        file.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return file.read()
+    offset = file.tell()
+    source = pa.memory_map(file.name)
+    source.seek(offset)
+    return source.read_buffer()
@@ -0,0 +1,129 @@
+"""
+Compression of serialized algorithm input and output.
+
+The data format that precedes serialized data may specify a compression
+codec, separated by a '+', e.g. `json+zstd.` or `arrow+lz4.`. The data is
+compressed after serialization and decompressed before deserialization.
+Since payloads are encrypted after they are serialized, compression has to
+be done at this stage: encrypted data cannot be compressed.
+
+The `zlib` codec is always available. The `zstd` and `lz4` codecs require
+the optional `zstandard` and `lz4` packages.
+"""
+from __future__ import annotations
+
+import zlib
+
+from typing import Callable
+
+CODEC_SEPARATOR = '+'
+
+
+def _zstd() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    import zstandard
+    return (
+        zstandard.ZstdCompressor().compress,
+        # the decompressed size is not always stored in the frame, so stream
+        # the decompression instead of using `decompress`
+        lambda data: zstandard.ZstdDecompressor().decompressobj()
+        .decompress(data),
+    )
+
+
+def _lz4() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    import lz4.frame
+    return lz4.frame.compress, lz4.frame.decompress
+
+
+def _zlib() -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    return zlib.compress, zlib.decompress
+
+
+# codec -> function that returns the compress and decompress functions. The
+# optional dependencies are only imported when the codec is used.
+_codecs = {
+    'zstd': _zstd,
+    'lz4': _lz4,
+    'zlib': _zlib,
+}
+
+
+def split_data_format(data_format: str) -> tuple[str, str | None]:
+    """
+    Split a data format in the serialization format and compression codec.
+
+    Parameters
+    ----------
+    data_format : str
+        Data format, optionally followed by '+' and a compression codec,
+        e.g. 'json' or 'json+zstd'
+
+    Returns
+    -------
+    tuple[str, str | None]
+        Serialization format and compression codec, or None if the data is
+        not compressed
+    """
+    data_format, _, codec = data_format.lower().partition(CODEC_SEPARATOR)
+    return data_format, codec or None
+
+
+def _get_codec(
+    codec: str
+) -> tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]:
+    try:
+        get_functions = _codecs[codec]
+    except KeyError:
+        raise ValueError(
+            f"Unknown compression codec '{codec}'. Available codecs: "
+            f"{', '.join(_codecs)}"
+        )
+    try:
+        return get_functions()
+    except ImportError as e:
+        raise ImportError(
+            f"Compression codec '{codec}' requires a package that is not "
+            f"installed: {e.name}"
+        ) from e
+
+
+def compress(data: bytes, codec: str | None) -> bytes:
+    """
+    Compress serialized data.
+
+    Parameters
+    ----------
+    data : bytes
+        Serialized data
+    codec : str | None
+        Compression codec. If None, the data is returned as is.
+
+    Returns
+    -------
+    bytes
+        Compressed data
+    """
+    if not codec:
+        return data
+    return _get_codec(codec)[0](data)
+
+
+def decompress(data: bytes, codec: str | None) -> bytes:
+    """
+    Decompress serialized data.
+
+    Parameters
+    ----------
+    data : bytes
+        Compressed data
+    codec : str | None
+        Compression codec. If None, the data is returned as is.
+
+    Returns
+    -------
+    bytes
+        Decompressed data
+    """
+    if not codec:
+        return data
+    return _get_codec(codec)[1](data)
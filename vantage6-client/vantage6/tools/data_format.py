@@ -14,3 +14,5 @@ from enum import Enum
 class DataFormat(Enum):
     JSON = 'json'
     PICKLE = 'pickle'
+    ARROW = 'arrow'
+    PARQUET = 'parquet'
@@ -1,6 +1,7 @@
 import json
 import pickle
 
+from vantage6.tools import columnar
 from vantage6.tools.data_format import DataFormat
 
 _deserializers = {}
@@ -54,3 +55,15 @@ def deserialize_json(file):
 @deserializer(DataFormat.PICKLE)
 def deserialize_pickle(file):
     return pickle.load(file)
+
+
+@deserializer(DataFormat.ARROW)
+def deserialize_arrow(file):
+    # the file is memory mapped, so that only the columns that are used are
+    # read from disk
+    return columnar.read_arrow(columnar.map_file(file))
+
+
+@deserializer(DataFormat.PARQUET)
+def deserialize_parquet(file):
+    return columnar.read_parquet(columnar.map_file(file))
@@ -2,6 +2,7 @@ import json
 import pickle
 
 import pandas as pd
+from vantage6.tools import columnar
 from vantage6.tools.data_format import DataFormat
 from vantage6.tools.util import info
 
@@ -71,3 +72,15 @@ def _serialize_pandas(data):
 def serialize_to_pickle(data):
     info('Serializing to pickle')
     return pickle.dumps(data)
+
+
+@serializer(DataFormat.ARROW)
+def serialize_to_arrow(data):
+    info('Serializing to arrow')
+    return columnar.write_arrow(data)
+
+
+@serializer(DataFormat.PARQUET)
+def serialize_to_parquet(data):
+    info('Serializing to parquet')
+    return columnar.write_parquet(data)
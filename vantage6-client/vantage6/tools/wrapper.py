@@ -35,14 +35,18 @@ from typing import BinaryIO, Any, Generator
 from abc import ABC, abstractmethod
 from SPARQLWrapper import SPARQLWrapper, CSV
 
-from vantage6.tools import deserialization, serialization
+from vantage6.tools import (
+    columnar, compression, deserialization, serialization
+)
 from vantage6.tools.dispatch_rpc import dispatch_rpc
-from vantage6.tools.util import info, error
+from vantage6.tools.util import info, warn, error
 from vantage6.tools.data_format import DataFormat
+from vantage6.tools.data_selection import DataSelection
 from vantage6.tools.exceptions import DeserializationException
 
 _DATA_FORMAT_SEPARATOR = '.'
-_MAX_FORMAT_STRING_LENGTH = 10
+# long enough for a data format followed by a compression codec
+_MAX_FORMAT_STRING_LENGTH = 20
 
 _SPARQL_RETURN_FORMAT = CSV
 
@@ -217,6 +221,11 @@ def multidb_wrapper(module: str, use_new_client: bool = False,
 
 class WrapperBase(ABC):
 
+    # whether the database may be read from the node's dataset cache, which
+    # contains a converted copy of the database that is read faster. Only
+    # wrappers whose `load_data` reads the complete database can use it.
+    use_dataset_cache = False
+
     def wrap_algorithm(self, module: str, load_data: bool = True,
                        use_new_client: bool = False,
                        log_traceback: bool = False) -> None:
@@ -242,7 +251,9 @@ class WrapperBase(ABC):
         It is also possible to specify the desired output format. This is done
         by including the parameter 'output_format' in the input parameters.
         Again, the list of possible output formats can be found in
-        `vantage6.tools.data_format.DataFormat`.
+        `vantage6.tools.data_format.DataFormat`. Both the input and output
+        format may be followed by a compression codec, e.g. 'json+zstd'. The
+        available codecs can be found in `vantage6.tools.compression`.
 
         It is still possible that output serialization will fail even if the
         specified format is listed in the DataFormat enum. Algorithms can in
@@ -256,6 +267,16 @@ class WrapperBase(ABC):
         - built-in collections (list, dict, tuple, etc.)
         - pandas DataFrames
 
+        The input parameters may also select the 'columns' and rows
+        ('filters') of the database that the algorithm uses, and their
+        'dtypes', under the 'data_selection' key. The csv, excel and parquet
+        wrappers then only load the selected data, see
+        `vantage6.tools.data_selection`.
+
+        The columnar formats 'arrow' and 'parquet' only support tabular output
+        (pandas DataFrames and Series, pyarrow Tables and dictionaries of
+        columns), and require pyarrow to be installed in the algorithm image.
+
         Parameters
         ----------
         module : str
@@ -295,7 +316,9 @@ class WrapperBase(ABC):
         info(f"Using '{database_uri}' as database")
 
         if load_data:
-            data = self.load_data(database_uri, input_data)
+            data = self._load_cached_data(label, input_data)
+            if data is None:
+                data = self.load_data(database_uri, input_data)
         else:
             data = None
 
@@ -312,6 +335,42 @@ class WrapperBase(ABC):
         output_format = input_data.get('output_format', None)
         write_output(output_format, output, output_file)
 
+    def _load_cached_data(self, label: str, input_data: dict
+                          ) -> pandas.DataFrame | None:
+        """
+        Load the data from the converted copy of the database in the node's
+        dataset cache, if it is available.
+
+        The copy is memory mapped instead of read, so that it is only loaded
+        into memory when the algorithm uses the data.
+
+        Parameters
+        ----------
+        label : str
+            Label of the database
+        input_data : dict
+            User defined input, which may select columns and rows of the data
+
+        Returns
+        -------
+        pandas.DataFrame | None
+            The data, or None if it is not available in the dataset cache
+        """
+        cache_uri = os.environ.get(f"{label.upper()}_DATABASE_CACHE_URI")
+        if not self.use_dataset_cache or not cache_uri:
+            return None
+        selection = DataSelection.from_input(input_data)
+        try:
+            with open(cache_uri, 'rb') as fp:
+                data = columnar.read_arrow(columnar.map_file(fp),
+                                           selection.columns_to_read)
+        except Exception as e:
+            warn(f"Could not read '{cache_uri}' from the dataset cache, "
+                 f"reading the database instead: {e}")
+            return None
+        info(f"Using '{cache_uri}' from the dataset cache")
+        return selection.apply(data)
+
     @staticmethod
     @abstractmethod
     def load_data(database_uri: str, input_data: dict):
@@ -329,6 +388,8 @@ class WrapperBase(ABC):
 
 
 class CSVWrapper(WrapperBase):
+    use_dataset_cache = True
+
     @staticmethod
     def load_data(database_uri: str, input_data: dict) -> pandas.DataFrame:
         """
@@ -339,14 +400,15 @@ class CSVWrapper(WrapperBase):
         database_uri : str
             URI of the csv file, supplied by te node
         input_data : dict
-            Unused, as csv files do not require a query
+            May contain a 'data_selection' to select the data to load, see
+            `vantage6.tools.data_selection`
 
         Returns
         -------
         pandas.DataFrame
             The data from the csv file
         """
-        return pandas.read_csv(database_uri)
+        return DataSelection.from_input(input_data).read_csv(database_uri)
 
 
 # for backwards compatibility
@@ -366,7 +428,9 @@ class ExcelWrapper(WrapperBase):
         database_uri : str
             URI of the excel file, supplied by te node
         input_data : dict
-            May contain a 'sheet_name', which is passed to pandas.read_excel
+            May contain a 'sheet_name', which is passed to pandas.read_excel,
+            and a 'data_selection' to select the data to load, see
+            `vantage6.tools.data_selection`
 
         Returns
         -------
@@ -377,7 +441,9 @@ class ExcelWrapper(WrapperBase):
         sheet_name = input_data.get('sheet_name', 0)
         if sheet_name:
             info(f"Reading sheet '{sheet_name}' from excel file")
-        return pandas.read_excel(database_uri, sheet_name=sheet_name)
+        return DataSelection.from_input(input_data).read_excel(
+            database_uri, sheet_name=sheet_name
+        )
 
 
 class SparqlDockerWrapper(WrapperBase):
@@ -440,14 +506,15 @@ class ParquetWrapper(WrapperBase):
         database_uri : str
             URI of the parquet file, supplied by te node
         input_data : dict
-            Unused, as no additional settings are required
+            May contain a 'data_selection' to select the data to load, see
+            `vantage6.tools.data_selection`
 
         Returns
         -------
         pandas.DataFrame
             The data from the parquet file
         """
-        return pandas.read_parquet(database_uri)
+        return DataSelection.from_input(input_data).read_parquet(database_uri)
 
 
 class SQLWrapper(WrapperBase):
@@ -531,10 +598,14 @@ def write_output(output_format: str, output: Any, output_file: str) -> None:
     If output_format == None, write output as pickle without indicating format
     (legacy method)
 
+    The output format may include a compression codec, e.g. 'json+zstd', in
+    which case the serialized output is compressed.
+
     Parameters
     ----------
     output_format : str
-        Data type of the output e.g. 'pickle', 'json', 'csv', 'parquet'
+        Data type of the output e.g. 'pickle', 'json', 'arrow', 'parquet',
+        optionally followed by a compression codec, e.g. 'arrow+lz4'
     output : Any
         Output of the algorithm, could by any type
     output_file : str
@@ -546,9 +617,10 @@ def write_output(output_format: str, output: Any, output_file: str) -> None:
             fp.write(output_format.encode() + b'.')
 
             # Write actual data
-            output_format = DataFormat(output_format.lower())
-            serialized = serialization.serialize(output, output_format)
-            fp.write(serialized)
+            data_format, codec = compression.split_data_format(output_format)
+            serialized = serialization.serialize(output,
+                                                 DataFormat(data_format))
+            fp.write(compression.compress(serialized, codec))
         else:
             # No output format specified, use legacy method
             fp.write(pickle.dumps(output))
@@ -603,8 +675,10 @@ def _read_formatted(file: BinaryIO) -> Any:
         Deserialized input data
     """
     data_format = str.join('', list(_read_data_format(file)))
-    data_format = DataFormat(data_format.lower())
-    return deserialization.deserialize(file, data_format)
+    data_format, codec = compression.split_data_format(data_format)
+    if codec:
+        file = io.BytesIO(compression.decompress(file.read(), codec))
+    return deserialization.deserialize(file, DataFormat(data_format))
 
 
 def _read_data_format(file: BinaryIO) -> Generator:
@@ -102,7 +102,7 @@ def bytes_to_base64s(bytes_: bytes) -> str:
     return base64.b64encode(bytes_).decode(STRING_ENCODING)
 
 
-def base64s_to_bytes(bytes_string: str) -> bytes:
+def base64s_to_bytes(bytes_string: str, validate: bool = False) -> bytes:
     """
     Convert base64 encoded string to bytes.
 
@@ -110,13 +110,18 @@ def base64s_to_bytes(bytes_string: str) -> bytes:
     ----------
     bytes_string: str
         The base64 encoded string.
+    validate: bool
+        If True, raise a `binascii.Error` (a `ValueError`) when the string
+        contains characters that are not in the base64 alphabet. By default
+        these characters are discarded.
 
     Returns
     -------
     bytes
         The encoded string converted to bytes.
     """
-    return base64.b64decode(bytes_string.encode(STRING_ENCODING))
+    return base64.b64decode(bytes_string.encode(STRING_ENCODING),
+                            validate=validate)
 
 
 #
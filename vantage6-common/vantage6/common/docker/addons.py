@@ -7,6 +7,7 @@ import base64
 import json
 import signal
 import pathlib
+import time
 
 from dateutil.parser import parse
 from docker.client import DockerClient
@@ -15,12 +16,18 @@ from docker.models.networks import Network
 
 from vantage6.common import logger_name
 from vantage6.common import ClickLogger
-from vantage6.common.globals import APPNAME
+from vantage6.common.globals import APPNAME, REGISTRY_CACHE_TTL_SECONDS
 
 log = logging.getLogger(logger_name(__name__))
 
 docker_client = docker.from_env()
 
+# API version of the (Harbor) registries and the metadata of remote images,
+# so that the registry does not have to be queried each time an image is used.
+# Both map to a tuple of which the last element is the time it was cached.
+_registry_api_versions: dict[str, tuple[str, float]] = {}
+_remote_images: dict[str, tuple[datetime, str, float]] = {}
+
 
 class ContainerKillListener:
     """Listen for signals that the docker container should be shut down """
@@ -113,9 +120,52 @@ def registry_basic_auth_header(
     return {'authorization': f'Basic {b64_basic_auth}'}
 
 
+def clear_registry_cache() -> None:
+    """
+    Forget the cached API versions of registries and metadata of remote
+    images.
+    """
+    _registry_api_versions.clear()
+    _remote_images.clear()
+
+
+def _registry_api_version(
+    reg: str, cache_ttl: float = REGISTRY_CACHE_TTL_SECONDS
+) -> str | None:
+    """
+    Determine the API version of a Harbor registry.
+
+    Parameters
+    ----------
+    reg: str
+        Registry name (e.g. harbor2.vantage6.ai)
+    cache_ttl: float, optional
+        Number of seconds a previously determined version is reused
+
+    Returns
+    -------
+    str | None
+        'v1' or 'v2', or None if the version could not be determined
+    """
+    cached = _registry_api_versions.get(reg)
+    if cached and time.monotonic() - cached[1] < cache_ttl:
+        return cached[0]
+
+    version = None
+    if requests.get(f"https://{reg}/api/health").status_code == 200:
+        version = 'v1'
+    elif requests.get(f"https://{reg}/api/v2.0/health").status_code == 200:
+        version = 'v2'
+
+    if version:
+        _registry_api_versions[reg] = (version, time.monotonic())
+    return version
+
+
 def inspect_remote_image_timestamp(
     docker_client: DockerClient, image: str,
-    log: logging.Logger | ClickLogger = ClickLogger
+    log: logging.Logger | ClickLogger = ClickLogger,
+    cache_ttl: float = REGISTRY_CACHE_TTL_SECONDS
 ) -> tuple[datetime, str] | None:
     """
     Obtain creation timestamp object from remote image.
@@ -128,6 +178,9 @@ def inspect_remote_image_timestamp(
         Image name
     log: logging.Logger | ClickLogger
         Logger
+    cache_ttl: float, optional
+        Number of seconds the metadata of the image is reused before it is
+        retrieved from the registry again
 
     Returns
     -------
@@ -135,8 +188,11 @@ def inspect_remote_image_timestamp(
         Timestamp containing the creation date of the image and its digest, or
         None if the remote image could not be found.
     """
-    # check if a tag has been profided
+    cached = _remote_images.get(image)
+    if cached and time.monotonic() - cached[2] < cache_ttl:
+        return cached[0], cached[1]
 
+    # check if a tag has been profided
     image_tag = re.split(":", image)
     img = image_tag[0]
     tag = image_tag[1] if len(image_tag) == 2 else "latest"
@@ -152,38 +208,33 @@ def inspect_remote_image_timestamp(
         return None, None
 
     # figure out API of the docker repo
-    v1_check = requests.get(f"https://{reg}/api/health")
-    v1 = v1_check.status_code == 200
-    v2 = False
-    if not v1:
-        v2_check = requests.get(f"https://{reg}/api/v2.0/health")
-        v2 = v2_check.status_code == 200
-
-    if not v1 and not v2:
+    version = _registry_api_version(reg, cache_ttl)
+    if not version:
         log.error(f"Could not determine version of the registry! {reg}")
         log.error("Is this a Harbor registry?")
         log.error("Or is the harbor server offline?")
         return None, None
 
+    v1 = version == 'v1'
     if v1:
-        image = f"https://{reg}/api/repositories/{rep}/{img_}/tags/{tag}"
+        url = f"https://{reg}/api/repositories/{rep}/{img_}/tags/{tag}"
     else:
-        image = f"https://{reg}/api/v2.0/projects/{rep}/repositories/" \
-                f"{img_}/artifacts/{tag}"
+        url = f"https://{reg}/api/v2.0/projects/{rep}/repositories/" \
+              f"{img_}/artifacts/{tag}"
 
     # retrieve info from the Harbor server
     result = requests.get(
-        image, headers=registry_basic_auth_header(docker_client, reg)
+        url, headers=registry_basic_auth_header(docker_client, reg)
     )
 
     # verify that we got an result
     if result.status_code == 404:
-        log.warn(f"Remote image not found! {image}")
+        log.warn(f"Remote image not found! {url}")
         return None, None
 
     if result.status_code != 200:
         log.warn(f"Remote info could not be fetched! ({result.status_code}) "
-                 f"{image}")
+                 f"{url}")
         return None, None
 
     if v1:
@@ -192,6 +243,7 @@ def inspect_remote_image_timestamp(
     else:
         timestamp = parse(result.json().get("push_time"))
         digest = result.json().get("digest")
+    _remote_images[image] = (timestamp, digest, time.monotonic())
     return timestamp, digest
 
 
@@ -237,11 +289,16 @@ def inspect_local_image_timestamp(
 
 def pull_if_newer(
     docker_client: DockerClient, image: str,
-    log: logging.Logger | ClickLogger = ClickLogger
+    log: logging.Logger | ClickLogger = ClickLogger,
+    cache_ttl: float = REGISTRY_CACHE_TTL_SECONDS
 ) -> None:
     """
     Docker pull only if the remote image is newer.
 
+    If the digests of both the local and the remote image are known, the
+    image is pulled only if they differ. Otherwise, the creation times of the
+    images are compared.
+
     Parameters
     ----------
     docker_client: DockerClient
@@ -250,6 +307,9 @@ def pull_if_newer(
         Image to be pulled
     log: logger.Logger or ClickLogger
         Logger class
+    cache_ttl: float, optional
+        Number of seconds the metadata of the remote image is reused before it
+        is retrieved from the registry again
 
     Raises
     ------
@@ -260,12 +320,14 @@ def pull_if_newer(
         docker_client, image, log=log
     )
     remote_time, remote_digest = inspect_remote_image_timestamp(
-        docker_client, image, log=log
+        docker_client, image, log=log, cache_ttl=cache_ttl
     )
     pull = False
     if local_time and remote_time:
-        if remote_digest == local_digest:
-            log.debug(f"Local image is up-to-date: {image}")
+        if local_digest and remote_digest:
+            pull = local_digest != remote_digest
+            log.debug(f"Remote image has a different digest: {image}" if pull
+                      else f"Local image is up-to-date: {image}")
         elif remote_time > local_time:
             log.debug(f"Remote image is newer: {image}")
             pull = True
@@ -14,15 +14,21 @@ these public keys is outside the scope of this module).
 """
 # TODO handle no public key from other organization (should that happen here?)
 import os
+import base64
+import hashlib
 import logging
 
 from pathlib import Path
+from typing import IO, Callable, Iterator
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes
+from cryptography.hazmat.primitives.asymmetric.types import (
+    PrivateKeyTypes,
+    PublicKeyTypes
+)
 from cryptography.hazmat.primitives.serialization import (
     load_pem_private_key,
     load_pem_public_key
@@ -34,9 +40,271 @@ from vantage6.common import (
     bytes_to_base64s,
     base64s_to_bytes
 )
+from vantage6.common.globals import STRING_ENCODING
 
 SEPARATOR = '$'
 
+# Multi-recipient envelopes start with this marker. The payload is encrypted
+# once and only the shared key is wrapped for each recipient. The format is:
+# `ENVELOPE_MARKER$iv$fingerprint:key,fingerprint:key,...$msg`
+ENVELOPE_MARKER = 'v6env1'
+RECIPIENT_SEPARATOR = ','
+FINGERPRINT_SEPARATOR = ':'
+
+# Number of bytes that are processed at once when encrypting or decrypting
+# file-like objects
+STREAM_CHUNK_SIZE = 4 * 1024 * 1024
+
+# Number of bytes that are read at once while reading the header fields of an
+# encrypted message from a file-like object
+HEADER_CHUNK_SIZE = 4 * 1024
+
+
+def load_public_key(pubkey_base64s: str) -> PublicKeyTypes:
+    """
+    Load a (base64 encoded) PEM public key.
+
+    Parameters
+    ----------
+    pubkey_base64s: str
+        The public key as base64 encoded string.
+
+    Returns
+    -------
+    PublicKeyTypes
+        The loaded public key.
+    """
+    return load_pem_public_key(
+        base64s_to_bytes(pubkey_base64s),
+        backend=default_backend()
+    )
+
+
+def _encode_stream(in_fp: IO, out_fp: IO, transform: Callable = None,
+                   chunk_size: int = None) -> None:
+    """
+    Read `in_fp` in chunks, optionally transform them, and write them base64
+    encoded to `out_fp`.
+
+    Bytes that do not fit in a complete base64 quantum are carried over to
+    the next chunk, so the output is identical to encoding all data at once.
+
+    Parameters
+    ----------
+    in_fp: IO
+        Binary file-like object to read from
+    out_fp: IO
+        Binary file-like object to write to
+    transform: Callable, optional
+        Function that is applied to each chunk before encoding, e.g. the
+        `update` method of an encryptor
+    chunk_size: int, optional
+        Number of bytes that are read at once, by default `STREAM_CHUNK_SIZE`
+    """
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    remainder = b''
+    while chunk := in_fp.read(chunk_size):
+        data = remainder + (transform(chunk) if transform else chunk)
+        cut = len(data) - len(data) % 3
+        out_fp.write(base64.b64encode(data[:cut]))
+        remainder = data[cut:]
+    out_fp.write(base64.b64encode(remainder))
+
+
+def _decode_stream(in_fp: IO, out_fp: IO, transform: Callable = None,
+                   chunk_size: int = None, head: bytes | str = b'') -> None:
+    """
+    Read base64 encoded data from `in_fp` in chunks, decode them, optionally
+    transform them and write them to `out_fp`.
+
+    Parameters
+    ----------
+    in_fp: IO
+        File-like object to read from. May be opened in text or binary mode.
+    out_fp: IO
+        Binary file-like object to write to
+    transform: Callable, optional
+        Function that is applied to each decoded chunk, e.g. the `update`
+        method of a decryptor
+    chunk_size: int, optional
+        Number of characters that are read at once, by default
+        `STREAM_CHUNK_SIZE`
+    head: bytes | str, optional
+        Data that has already been read from `in_fp`, e.g. while reading the
+        header fields of an encrypted message
+    """
+    remainder = b''
+    for chunk in _read_chunks(in_fp, chunk_size, head):
+        if isinstance(chunk, str):
+            chunk = chunk.encode(STRING_ENCODING)
+        data = remainder + chunk
+        cut = len(data) - len(data) % 4
+        decoded = base64.b64decode(data[:cut])
+        out_fp.write(transform(decoded) if transform else decoded)
+        remainder = data[cut:]
+    if remainder:
+        raise ValueError("Incomplete base64 encoded data")
+
+
+def _read_chunks(fp: IO, chunk_size: int = None,
+                 head: bytes | str = b'') -> Iterator[bytes | str]:
+    """
+    Read a file-like object in chunks.
+
+    Parameters
+    ----------
+    fp: IO
+        File-like object to read from
+    chunk_size: int, optional
+        Number of bytes (or characters) that are read at once, by default
+        `STREAM_CHUNK_SIZE`
+    head: bytes | str, optional
+        Data that has already been read from `fp`, which is yielded first
+
+    Yields
+    ------
+    bytes | str
+        The chunks of `fp`
+    """
+    if head:
+        yield head
+    chunk_size = chunk_size or STREAM_CHUNK_SIZE
+    while chunk := fp.read(chunk_size):
+        yield chunk
+
+
+def _read_until_separator(fp: IO, buffer: bytes | str = b''
+                          ) -> tuple[str, bytes | str]:
+    """
+    Read a single field of an encrypted message from a file-like object.
+
+    The file is read in chunks of `HEADER_CHUNK_SIZE`, so more than the
+    field may be read. The data after the separator is returned as well, and
+    should be passed as `buffer` when reading the next field.
+
+    Parameters
+    ----------
+    fp: IO
+        File-like object to read from
+    buffer: bytes | str, optional
+        Data that has already been read from `fp`, which starts with the
+        field
+
+    Returns
+    -------
+    tuple[str, bytes | str]
+        The field, without the trailing separator, and the data that has
+        been read after the separator
+
+    Raises
+    ------
+    ValueError
+        If the end of the file is reached before a separator is found
+    """
+    while True:
+        separator = SEPARATOR if isinstance(buffer, str) \
+            else SEPARATOR.encode()
+        field, found, rest = buffer.partition(separator)
+        if found:
+            break
+        if not (chunk := fp.read(HEADER_CHUNK_SIZE)):
+            raise ValueError("Unexpected end of encrypted data")
+        buffer = chunk if not buffer else buffer + chunk
+    if isinstance(field, bytes):
+        field = field.decode(STRING_ENCODING)
+    return field, rest
+
+
+def _copy_stream(in_fp: IO, out_fp: IO, transform: Callable = None,
+                 chunk_size: int = None, head: bytes = b'') -> None:
+    """
+    Copy `in_fp` to `out_fp` in chunks, optionally transforming them.
+
+    Parameters
+    ----------
+    in_fp: IO
+        Binary file-like object to read from
+    out_fp: IO
+        Binary file-like object to write to
+    transform: Callable, optional
+        Function that is applied to each chunk, e.g. the `update` method of
+        an encryptor or decryptor
+    chunk_size: int, optional
+        Number of bytes that are read at once, by default `STREAM_CHUNK_SIZE`
+    head: bytes, optional
+        Data that has already been read from `in_fp`, e.g. while reading the
+        header fields of an encrypted message
+    """
+    for chunk in _read_chunks(in_fp, chunk_size, head):
+        out_fp.write(transform(chunk) if transform else chunk)
+
+
+def payload_to_binary(payload: str | None) -> bytes:
+    """
+    Convert a payload from its string format to its binary format.
+
+    In the string format, the (encrypted) message is base64 encoded. In the
+    binary format the message is kept as raw bytes, while the header fields
+    of encrypted messages (wrapped key(s) and iv) remain as they are. This
+    is the format that is used by the binary (`application/octet-stream`)
+    endpoints.
+
+    Parameters
+    ----------
+    payload: str | None
+        Payload in string format, as stored at the server
+
+    Returns
+    -------
+    bytes
+        Payload in binary format
+
+    Raises
+    ------
+    ValueError
+        If the message of the payload is not base64 encoded
+    """
+    if not payload:
+        return b''
+    header, _, msg = payload.rpartition(SEPARATOR)
+    if not header:
+        # unencrypted payloads contain only the base64 encoded message
+        return base64s_to_bytes(msg, validate=True)
+    return (header + SEPARATOR).encode(STRING_ENCODING) + \
+        base64s_to_bytes(msg, validate=True)
+
+
+def payload_from_binary(payload: bytes, encrypted: bool) -> str:
+    """
+    Convert a payload from its binary format to its string format.
+
+    Parameters
+    ----------
+    payload: bytes
+        Payload in binary format
+    encrypted: bool
+        Whether the payload is encrypted, in which case it contains header
+        fields
+
+    Returns
+    -------
+    str
+        Payload in string format
+    """
+    if not encrypted:
+        return bytes_to_base64s(payload)
+    if not payload:
+        return ''
+
+    separator = SEPARATOR.encode(STRING_ENCODING)
+    n_header_fields = 3 if payload.startswith(
+        ENVELOPE_MARKER.encode(STRING_ENCODING) + separator) else 2
+    *header, msg = payload.split(separator, n_header_fields)
+    return SEPARATOR.join(
+        [field.decode(STRING_ENCODING) for field in header] +
+        [bytes_to_base64s(msg)]
+    )
+
 
 # ------------------------------------------------------------------------------
 # CryptorBase
@@ -103,6 +371,29 @@ class CryptorBase(metaclass=Singleton):
         """
         return self.bytes_to_str(data)
 
+    def encrypt_bytes_to_str_multi(self, data: bytes,
+                                   pubkeys_base64: list[str]) -> str:
+        """
+        Encrypt bytes in `data` once for multiple recipients.
+
+        Note that the public keys are ignored in this base class. If you want
+        to encode your data with public keys, use the `RSACryptor` class.
+
+        Parameters
+        ----------
+        data: bytes
+            The data to encrypt.
+        pubkeys_base64: list[str]
+            The public keys of the recipients. These are ignored in this base
+            class.
+
+        Returns
+        -------
+        str
+            The encrypted data encoded as base64 string.
+        """
+        return self.bytes_to_str(data)
+
     def decrypt_str_to_bytes(self, data: str) -> bytes:
         """
         Decrypt base64 encoded *string* data.
@@ -119,6 +410,57 @@ class CryptorBase(metaclass=Singleton):
         """
         return self.str_to_bytes(data)
 
+    def encrypt_stream(self, in_fp: IO, out_fp: IO,
+                       pubkey_base64: str = None,
+                       binary: bool = False) -> None:
+        """
+        Encrypt the contents of file-like object `in_fp` in chunks and
+        write the result to `out_fp`.
+
+        The output is the same as `encrypt_bytes_to_str` would give for the
+        entire content, but only a single chunk is kept in memory. Note that
+        the public key is ignored in this base class.
+
+        Parameters
+        ----------
+        in_fp: IO
+            Binary file-like object containing the data to encrypt.
+        out_fp: IO
+            Binary file-like object to write the encrypted data to.
+        pubkey_base64: str, optional
+            The public key to use for encryption. This is ignored in this
+            base class.
+        binary: bool, optional
+            Write the output in binary format (see `payload_to_binary`)
+            instead of the string format, by default False
+        """
+        if binary:
+            _copy_stream(in_fp, out_fp)
+        else:
+            _encode_stream(in_fp, out_fp)
+
+    def decrypt_stream(self, in_fp: IO, out_fp: IO,
+                       binary: bool = False) -> None:
+        """
+        Decrypt the contents of file-like object `in_fp` in chunks and
+        write the result to `out_fp`.
+
+        Parameters
+        ----------
+        in_fp: IO
+            File-like object containing the encrypted data.
+        out_fp: IO
+            Binary file-like object to write the decrypted data to.
+        binary: bool, optional
+            Whether `in_fp` contains the binary format (see
+            `payload_to_binary`) instead of the string format, by default
+            False
+        """
+        if binary:
+            _copy_stream(in_fp, out_fp)
+        else:
+            _decode_stream(in_fp, out_fp)
+
 
 # ------------------------------------------------------------------------------
 # DummyCryptor
@@ -271,57 +613,204 @@ class RSACryptor(CryptorBase):
         """
         return bytes_to_base64s(self.public_key_bytes)
 
-    def encrypt_bytes_to_str(self, data: bytes, pubkey_base64s: str) -> str:
+    @staticmethod
+    def create_public_key_fingerprint(
+            pubkey: str | PublicKeyTypes) -> str:
         """
-        Encrypt bytes in `data` using a (base64 encoded) public key.
+        Create a short fingerprint of a public key.
+
+        The fingerprint is used in multi-recipient envelopes to identify
+        which wrapped key belongs to which recipient.
 
         Parameters
         ----------
-        data: bytes
-            The data to encrypt.
-        pubkey_base64s: str
-            The public key to use for encryption.
+        pubkey: str | PublicKeyTypes
+            The public key as base64 encoded string or as loaded public key.
 
         Returns
         -------
         str
-            The encrypted data encoded as base64 string.
+            Hexadecimal fingerprint of the public key.
         """
+        if isinstance(pubkey, str):
+            pubkey_bytes = base64s_to_bytes(pubkey)
+        else:
+            pubkey_bytes = pubkey.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        return hashlib.sha256(pubkey_bytes).hexdigest()[:16]
 
-        # Use the shared key for symmetric encryption/decryption of the payload
-        shared_key = os.urandom(32)
-        iv_bytes = os.urandom(16)
+    @property
+    def public_key_fingerprint(self) -> str:
+        """
+        Returns the fingerprint of the public key of this organization.
+
+        Returns
+        -------
+        str
+            Hexadecimal fingerprint of the public key.
+        """
+        return self.create_public_key_fingerprint(self.public_key_str)
+
+    @staticmethod
+    def _create_cipher(shared_key: bytes, iv_bytes: bytes) -> Cipher:
+        """
+        Create the symmetric cipher that is used for the payload.
+
+        Parameters
+        ----------
+        shared_key: bytes
+            The shared (AES) key.
+        iv_bytes: bytes
+            The initialization vector.
 
-        cipher = Cipher(
+        Returns
+        -------
+        Cipher
+            AES cipher in CTR mode
+        """
+        return Cipher(
             algorithms.AES(shared_key),
             modes.CTR(iv_bytes),
             backend=default_backend()
         )
 
+    @staticmethod
+    def _encrypt_payload(data: bytes) -> tuple[bytes, bytes, bytes]:
+        """
+        Encrypt the payload with a newly generated shared (AES) key.
+
+        Parameters
+        ----------
+        data: bytes
+            The data to encrypt.
+
+        Returns
+        -------
+        tuple[bytes, bytes, bytes]
+            The shared key, the initialization vector and the encrypted data
+        """
+        # Use the shared key for symmetric encryption/decryption of the payload
+        shared_key = os.urandom(32)
+        iv_bytes = os.urandom(16)
+
+        cipher = RSACryptor._create_cipher(shared_key, iv_bytes)
+
         encryptor = cipher.encryptor()
         encrypted_msg_bytes = encryptor.update(data) + encryptor.finalize()
+        return shared_key, iv_bytes, encrypted_msg_bytes
 
-        # Create a public key instance.
-        pubkey = load_pem_public_key(
-            base64s_to_bytes(pubkey_base64s),
-            backend=default_backend()
-        )
+    @staticmethod
+    def _wrap_shared_key(shared_key: bytes,
+                         pubkey: str | PublicKeyTypes) -> bytes:
+        """
+        Encrypt the shared key with the public key of a recipient.
 
-        encrypted_key_bytes = pubkey.encrypt(
+        Parameters
+        ----------
+        shared_key: bytes
+            The shared key that was used to encrypt the payload.
+        pubkey: str | PublicKeyTypes
+            The public key of the recipient, either base64 encoded or already
+            loaded (e.g. from the `PublicKeyCache`).
+
+        Returns
+        -------
+        bytes
+            The encrypted shared key.
+        """
+        if isinstance(pubkey, str):
+            pubkey = load_public_key(pubkey)
+
+        return pubkey.encrypt(
             shared_key,
             padding.PKCS1v15()
         )
 
+    def encrypt_bytes_to_str(self, data: bytes,
+                             pubkey_base64s: str | PublicKeyTypes) -> str:
+        """
+        Encrypt bytes in `data` using a (base64 encoded) public key.
+
+        Parameters
+        ----------
+        data: bytes
+            The data to encrypt.
+        pubkey_base64s: str | PublicKeyTypes
+            The public key to use for encryption. This may also be a loaded
+            public key.
+
+        Returns
+        -------
+        str
+            The encrypted data encoded as base64 string.
+        """
+        shared_key, iv_bytes, encrypted_msg_bytes = self._encrypt_payload(data)
+        encrypted_key_bytes = self._wrap_shared_key(shared_key, pubkey_base64s)
+
         encrypted_key = self.bytes_to_str(encrypted_key_bytes)
         iv = self.bytes_to_str(iv_bytes)
         encrypted_msg = self.bytes_to_str(encrypted_msg_bytes)
 
         return SEPARATOR.join([encrypted_key, iv, encrypted_msg])
 
+    def encrypt_bytes_to_str_multi(
+            self, data: bytes,
+            pubkeys_base64s: list[str | PublicKeyTypes]) -> str:
+        """
+        Encrypt bytes in `data` once for multiple recipients.
+
+        The payload is encrypted a single time with a shared key. Only the
+        shared key is encrypted with the public key of each recipient. The
+        resulting envelope can be decrypted by any of the recipients.
+
+        When there is only a single recipient, the legacy format is used so
+        that older nodes are still able to decrypt it.
+
+        Parameters
+        ----------
+        data: bytes
+            The data to encrypt.
+        pubkeys_base64s: list[str | PublicKeyTypes]
+            The public keys of the recipients, base64 encoded or loaded.
+
+        Returns
+        -------
+        str
+            The encrypted data encoded as base64 string.
+        """
+        # remove duplicate keys while preserving the order
+        pubkeys = {
+            self.create_public_key_fingerprint(key): key
+            for key in pubkeys_base64s
+        }
+        if len(pubkeys) == 1:
+            return self.encrypt_bytes_to_str(data, *pubkeys.values())
+
+        shared_key, iv_bytes, encrypted_msg_bytes = self._encrypt_payload(data)
+
+        recipients = []
+        for fingerprint, pubkey in pubkeys.items():
+            encrypted_key = self._wrap_shared_key(shared_key, pubkey)
+            recipients.append(FINGERPRINT_SEPARATOR.join([
+                fingerprint, self.bytes_to_str(encrypted_key)
+            ]))
+
+        return SEPARATOR.join([
+            ENVELOPE_MARKER,
+            self.bytes_to_str(iv_bytes),
+            RECIPIENT_SEPARATOR.join(recipients),
+            self.bytes_to_str(encrypted_msg_bytes)
+        ])
+
     def decrypt_str_to_bytes(self, data: str) -> bytes:
         """
         Decrypt base64 encoded *string* data.
 
+        Both the legacy `key$iv$msg` format and the multi-recipient envelope
+        format are supported.
+
         Parameters
         ----------
         data: str
@@ -331,9 +820,18 @@ class RSACryptor(CryptorBase):
         -------
         bytes
             The decrypted data.
-        """
 
-        (encrypted_key, iv, encrypted_msg) = data.split(SEPARATOR)
+        Raises
+        ------
+        ValueError
+            If the data is an envelope that is not addressed to this
+            organization.
+        """
+        if data.startswith(ENVELOPE_MARKER + SEPARATOR):
+            (_, iv, recipients, encrypted_msg) = data.split(SEPARATOR)
+            encrypted_key = self._find_wrapped_key(recipients)
+        else:
+            (encrypted_key, iv, encrypted_msg) = data.split(SEPARATOR)
 
         # Yes, this can be done more efficiently.
         encrypted_key_bytes = self.str_to_bytes(encrypted_key)
@@ -349,17 +847,130 @@ class RSACryptor(CryptorBase):
         self.log.info(f'Decrypted shared key: {shared_key}')
 
         # Use the shared key for symmetric encryption/decryption of the payload
-        cipher = Cipher(
-            algorithms.AES(shared_key),
-            modes.CTR(iv_bytes),
-            backend=default_backend()
-        )
+        cipher = self._create_cipher(shared_key, iv_bytes)
 
         decryptor = cipher.decryptor()
         result = decryptor.update(encrypted_msg_bytes) + decryptor.finalize()
 
         return result
 
+    def encrypt_stream(self, in_fp: IO, out_fp: IO,
+                       pubkey_base64s: str | PublicKeyTypes = None,
+                       binary: bool = False) -> None:
+        """
+        Encrypt the contents of file-like object `in_fp` in chunks and
+        write the result to `out_fp`.
+
+        The output is in the same format as `encrypt_bytes_to_str`, but only
+        a single chunk is kept in memory, so that large results can be
+        encrypted with bounded memory.
+
+        Parameters
+        ----------
+        in_fp: IO
+            Binary file-like object containing the data to encrypt.
+        out_fp: IO
+            Binary file-like object to write the encrypted data to.
+        pubkey_base64s: str | PublicKeyTypes
+            The public key to use for encryption.
+        binary: bool, optional
+            Write the encrypted message as raw bytes (see
+            `payload_to_binary`) instead of base64 encoded, by default False
+        """
+        shared_key = os.urandom(32)
+        iv_bytes = os.urandom(16)
+        encrypted_key_bytes = self._wrap_shared_key(shared_key, pubkey_base64s)
+
+        out_fp.write(SEPARATOR.join([
+            self.bytes_to_str(encrypted_key_bytes),
+            self.bytes_to_str(iv_bytes),
+            ''
+        ]).encode(STRING_ENCODING))
+
+        encryptor = self._create_cipher(shared_key, iv_bytes).encryptor()
+        if binary:
+            _copy_stream(in_fp, out_fp, encryptor.update)
+            out_fp.write(encryptor.finalize())
+        else:
+            _encode_stream(in_fp, out_fp, encryptor.update)
+            out_fp.write(base64.b64encode(encryptor.finalize()))
+
+    def decrypt_stream(self, in_fp: IO, out_fp: IO,
+                       binary: bool = False) -> None:
+        """
+        Decrypt the contents of file-like object `in_fp` in chunks and
+        write the result to `out_fp`.
+
+        Both the legacy `key$iv$msg` format and the multi-recipient envelope
+        format are supported.
+
+        Parameters
+        ----------
+        in_fp: IO
+            File-like object containing the encrypted data.
+        out_fp: IO
+            Binary file-like object to write the decrypted data to.
+        binary: bool, optional
+            Whether the encrypted message in `in_fp` consists of raw bytes
+            (see `payload_to_binary`) instead of base64, by default False
+
+        Raises
+        ------
+        ValueError
+            If the data is incomplete or is an envelope that is not addressed
+            to this organization.
+        """
+        header, head = _read_until_separator(in_fp)
+        if header == ENVELOPE_MARKER:
+            iv, head = _read_until_separator(in_fp, head)
+            recipients, head = _read_until_separator(in_fp, head)
+            encrypted_key = self._find_wrapped_key(recipients)
+        else:
+            encrypted_key = header
+            iv, head = _read_until_separator(in_fp, head)
+
+        shared_key = self.private_key.decrypt(
+            self.str_to_bytes(encrypted_key),
+            padding.PKCS1v15()
+        )
+
+        decryptor = self._create_cipher(
+            shared_key, self.str_to_bytes(iv)).decryptor()
+        if binary:
+            _copy_stream(in_fp, out_fp, decryptor.update, head=head)
+        else:
+            _decode_stream(in_fp, out_fp, decryptor.update, head=head)
+        out_fp.write(decryptor.finalize())
+
+    def _find_wrapped_key(self, recipients: str) -> str:
+        """
+        Find the shared key that is wrapped for this organization.
+
+        Parameters
+        ----------
+        recipients: str
+            The recipients part of a multi-recipient envelope.
+
+        Returns
+        -------
+        str
+            The encrypted shared key as base64 encoded string.
+
+        Raises
+        ------
+        ValueError
+            If none of the recipients matches the public key of this
+            organization.
+        """
+        fingerprint = self.public_key_fingerprint
+        for recipient in recipients.split(RECIPIENT_SEPARATOR):
+            recipient_fp, encrypted_key = \
+                recipient.split(FINGERPRINT_SEPARATOR)
+            if recipient_fp == fingerprint:
+                return encrypted_key
+        raise ValueError(
+            "Encrypted data is not addressed to this organization")
+
     def verify_public_key(self, pubkey_base64: str) -> bool:
         """
         Verifies the public key.
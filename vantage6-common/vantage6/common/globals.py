@@ -29,3 +29,18 @@ VPN_CONFIG_FILE = 'vpn-config.ovpn.conf'
 DATABASE_TYPES = ["csv", "parquet", "sql", "sparql", "omop", "excel", "other"]
 
 PING_INTERVAL_SECONDS = 60
+
+# Number of seconds organization public keys are cached before they are
+# retrieved from the server again
+PUBLIC_KEY_CACHE_TTL_SECONDS = 300
+
+# Number of seconds the metadata of remote docker images (and the API version
+# of their registry) is cached before the registry is queried again
+REGISTRY_CACHE_TTL_SECONDS = 300
+
+# Default settings of the connection pools used to communicate with the
+# server: the number of connections kept open, the number of times a failed
+# request is retried and the backoff factor (in seconds) between the retries
+DEFAULT_HTTP_POOL_SIZE = 10
+DEFAULT_HTTP_MAX_RETRIES = 3
+DEFAULT_HTTP_BACKOFF_FACTOR = 0.5
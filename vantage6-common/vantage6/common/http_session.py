@@ -0,0 +1,71 @@
+"""
+Pooled HTTP sessions to communicate with the server.
+
+Sending each request with `requests.get`, `requests.post`, etc. opens a new
+connection (including a TLS handshake) for each request. A session keeps the
+connections to the server open, so that they can be reused by subsequent
+requests.
+"""
+import requests
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from vantage6.common.globals import (
+    DEFAULT_HTTP_POOL_SIZE, DEFAULT_HTTP_MAX_RETRIES,
+    DEFAULT_HTTP_BACKOFF_FACTOR
+)
+
+# Requests that are retried when the server is (temporarily) unavailable.
+# Other requests are only retried if the connection could not be made, as
+# they may not be idempotent or may have a body that can only be sent once.
+RETRY_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'DELETE'])
+RETRY_STATUS_CODES = frozenset([502, 503, 504])
+
+
+def create_http_session(
+    pool_size: int = DEFAULT_HTTP_POOL_SIZE,
+    max_retries: int = DEFAULT_HTTP_MAX_RETRIES,
+    backoff_factor: float = DEFAULT_HTTP_BACKOFF_FACTOR,
+    keep_alive: bool = True
+) -> requests.Session:
+    """
+    Create a session with a connection pool and retries.
+
+    Parameters
+    ----------
+    pool_size: int, optional
+        Maximum number of connections per host that are kept open. This
+        should be at least the number of threads that use the session
+        concurrently.
+    max_retries: int, optional
+        Number of times a request is retried when the connection fails or
+        the server is unavailable
+    backoff_factor: float, optional
+        Factor (in seconds) of the exponential backoff between retries
+    keep_alive: bool, optional
+        Whether connections are kept open after a request. If False, a new
+        connection is made for each request.
+
+    Returns
+    -------
+    requests.Session
+        The session
+    """
+    retry = Retry(
+        total=max_retries,
+        read=False,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    if not keep_alive:
+        session.headers['Connection'] = 'close'
+    return session
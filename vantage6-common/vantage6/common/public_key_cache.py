@@ -0,0 +1,189 @@
+"""
+Cache for the public keys of organizations.
+
+Public keys are required to encrypt the input of tasks and the results of
+algorithms. Instead of retrieving (and parsing) the public key of an
+organization from the server each time it is needed, the loaded keys are
+kept in this cache for a limited amount of time.
+
+How the keys are retrieved from the server is up to the owner of the cache,
+which supplies the functions to retrieve a single key and (optionally) all
+keys in a collaboration.
+"""
+import logging
+import threading
+import time
+
+from typing import Callable
+
+from cryptography.hazmat.primitives.asymmetric.types import PublicKeyTypes
+
+from vantage6.common import logger_name
+from vantage6.common.encryption import load_public_key
+from vantage6.common.globals import PUBLIC_KEY_CACHE_TTL_SECONDS
+
+log = logging.getLogger(logger_name(__name__))
+
+
+class PublicKeyCache:
+    """
+    Thread safe cache of loaded organization public keys.
+
+    Parameters
+    ----------
+    fetch_key: Callable[[int], str | None]
+        Function that retrieves the base64 encoded public key of a single
+        organization from the server.
+    fetch_collaboration_keys: Callable[[int], dict[int, str | None]], optional
+        Function that retrieves the base64 encoded public keys of all
+        organizations in a collaboration, keyed by organization id. Required
+        for `prefetch`.
+    ttl: float, optional
+        Number of seconds a key is kept in the cache, by default
+        `PUBLIC_KEY_CACHE_TTL_SECONDS`
+    """
+
+    def __init__(
+        self, fetch_key: Callable[[int], str | None],
+        fetch_collaboration_keys: Callable[[int], dict[int, str | None]]
+        = None, ttl: float = PUBLIC_KEY_CACHE_TTL_SECONDS
+    ) -> None:
+        self.fetch_key = fetch_key
+        self.fetch_collaboration_keys = fetch_collaboration_keys
+        self.ttl = ttl
+
+        # organization_id -> (expiry timestamp, loaded public key)
+        self._keys: dict[int, tuple[float, PublicKeyTypes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, organization_id: int) -> PublicKeyTypes | None:
+        """
+        Get the public key of an organization.
+
+        The key is retrieved from the server if it is not in the cache or if
+        it has expired.
+
+        Parameters
+        ----------
+        organization_id: int
+            Id of the organization
+
+        Returns
+        -------
+        PublicKeyTypes | None
+            The loaded public key, or None if the organization has no
+            public key
+        """
+        with self._lock:
+            entry = self._keys.get(organization_id)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        log.debug(f"Retrieving public key of organization={organization_id}")
+        return self._store(organization_id, self.fetch_key(organization_id))
+
+    def get_many(self, organization_ids: list[int]) -> list[PublicKeyTypes]:
+        """
+        Get the public keys of multiple organizations.
+
+        Parameters
+        ----------
+        organization_ids: list[int]
+            Ids of the organizations
+
+        Returns
+        -------
+        list[PublicKeyTypes]
+            The loaded public keys, in the same order as `organization_ids`
+        """
+        return [self.get(id_) for id_ in organization_ids]
+
+    def uncached(self, organization_ids: list[int]) -> list[int]:
+        """
+        Get the organizations of which the public key is not in the cache
+        (anymore), and would be retrieved from the server by `get`.
+
+        Parameters
+        ----------
+        organization_ids: list[int]
+            Ids of the organizations
+
+        Returns
+        -------
+        list[int]
+            Ids of the organizations of which the key is not cached
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                id_ for id_ in organization_ids
+                if id_ not in self._keys or self._keys[id_][0] <= now
+            ]
+
+    def prefetch(self, collaboration_id: int) -> None:
+        """
+        Retrieve the public keys of all organizations in a collaboration
+        using a single request.
+
+        If no function to retrieve the keys of a collaboration is set,
+        nothing is retrieved and the keys are retrieved per organization by
+        `get` instead.
+
+        Parameters
+        ----------
+        collaboration_id: int
+            Id of the collaboration
+        """
+        if not self.fetch_collaboration_keys:
+            log.debug("Not prefetching public keys, no function to retrieve "
+                      "the keys of a collaboration is set")
+            return
+        log.debug("Retrieving public keys of organizations in "
+                  f"collaboration={collaboration_id}")
+        keys = self.fetch_collaboration_keys(collaboration_id)
+        for organization_id, key in keys.items():
+            self._store(organization_id, key)
+
+    def invalidate(self, organization_id: int = None) -> None:
+        """
+        Remove the public key of an organization from the cache.
+
+        Parameters
+        ----------
+        organization_id: int, optional
+            Id of the organization. If not provided, all keys are removed.
+        """
+        with self._lock:
+            if organization_id is None:
+                self._keys.clear()
+            else:
+                self._keys.pop(organization_id, None)
+
+    def _store(self, organization_id: int,
+               pubkey_base64s: str | None) -> PublicKeyTypes | None:
+        """
+        Load a public key and store it in the cache.
+
+        Organizations without a public key are not cached, as they may
+        upload one at any time.
+
+        Parameters
+        ----------
+        organization_id: int
+            Id of the organization
+        pubkey_base64s: str | None
+            Base64 encoded public key of the organization
+
+        Returns
+        -------
+        PublicKeyTypes | None
+            The loaded public key
+        """
+        if not pubkey_base64s:
+            self.invalidate(organization_id)
+            return None
+
+        key = load_public_key(pubkey_base64s)
+        with self._lock:
+            self._keys[organization_id] = (time.monotonic() + self.ttl, key)
+        return key
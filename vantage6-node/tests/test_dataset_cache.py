@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+from vantage6.tools import columnar
+
+with patch('docker.from_env'):
+    from vantage6.node.dataset_cache import DatasetCache
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+@unittest.skipUnless(HAS_PYARROW, "pyarrow is not installed")
+class TestDatasetCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.tmp_dir = Path(tmp_dir.name)
+        self.cache = DatasetCache(self.tmp_dir / 'cache', max_size=10 ** 6)
+
+    def add_database(self, name: str, rows: int = 10) -> dict:
+        path = self.tmp_dir / f'{name}.csv'
+        pd.DataFrame({
+            'age': range(rows), 'name': [f'p{i}' for i in range(rows)],
+            'date': ['2023-01-01'] * rows,
+        }).to_csv(path, index=False)
+        return {'uri': path, 'is_file': True, 'type': 'csv'}
+
+    def get(self, label: str, database: dict) -> Path | None:
+        """ Get a database from the cache, after converting it """
+        self.cache.get(label, database)
+        self.cache.join()
+        return self.cache.get(label, database)
+
+    def test_database_is_converted_in_the_background(self):
+        database = self.add_database('data')
+        converting = threading.Event()
+        convert = self.cache._convert
+
+        def slow_convert(*args):
+            converting.wait()
+            convert(*args)
+
+        with patch.object(self.cache, '_convert',
+                          side_effect=slow_convert) as convert_mock:
+            # the source file is used until the database is converted
+            self.assertIsNone(self.cache.get('default', database))
+            self.assertIsNone(self.cache.get('default', database))
+            converting.set()
+            self.cache.join()
+            cache_file = self.cache.get('default', database)
+            self.assertEqual(self.cache.get('default', database), cache_file)
+            convert_mock.assert_called_once()
+
+        with open(cache_file, 'rb') as fp:
+            data = columnar.read_arrow(columnar.map_file(fp))
+        pd.testing.assert_frame_equal(data, pd.read_csv(database['uri']))
+        # algorithms should not be able to modify the cached data
+        self.assertFalse(os.stat(cache_file).st_mode & 0o222)
+
+    @patch('vantage6.node.dataset_cache.CSV_BLOCK_SIZE', 64)
+    def test_database_is_converted_in_batches(self):
+        database = self.add_database('data', rows=100)
+        cache_file = self.get('default', database)
+        with open(cache_file, 'rb') as fp:
+            reader = pyarrow.ipc.open_file(columnar.map_file(fp))
+            self.assertGreater(reader.num_record_batches, 1)
+            data = reader.read_pandas()
+        pd.testing.assert_frame_equal(data, pd.read_csv(database['uri']))
+
+    def test_changed_database_is_converted_again(self):
+        database = self.add_database('data')
+        cache_file = self.get('default', database)
+
+        self.add_database('data', rows=20)
+        new_cache_file = self.get('default', database)
+        self.assertNotEqual(new_cache_file, cache_file)
+        self.assertFalse(cache_file.exists())
+        with open(new_cache_file, 'rb') as fp:
+            self.assertEqual(len(columnar.read_arrow(columnar.map_file(fp))),
+                             20)
+
+    def test_unsupported_databases_are_not_cached(self):
+        self.assertIsNone(self.get(
+            'default', {'uri': 'postgresql://db', 'is_file': False,
+                        'type': 'sql'}
+        ))
+        self.assertIsNone(self.get(
+            'default', {'uri': self.tmp_dir / 'missing.csv', 'is_file': True,
+                        'type': 'csv'}
+        ))
+
+    def test_least_recently_used_databases_are_evicted(self):
+        first = self.get('first', self.add_database('first'))
+        second = self.get('second', self.add_database('second'))
+        os.utime(first, (1, 1))
+        os.utime(second, (2, 2))
+
+        # the cache fits two of the three databases
+        self.cache.max_size = first.stat().st_size * 2 + 1
+        first = self.get('first', self.add_database('first'))
+        third = self.get('third', self.add_database('third'))
+        self.assertTrue(first.exists())
+        self.assertFalse(second.exists())
+        self.assertTrue(third.exists())
+
+    def test_databases_exceeding_the_label_size_are_not_cached(self):
+        self.cache.max_size_per_label = {'large': 100}
+        self.assertIsNone(self.get('large', self.add_database('large')))
+        self.assertEqual(
+            list((self.tmp_dir / 'cache' / 'large').iterdir()), []
+        )
+        self.assertIsNotNone(self.get('small', self.add_database('small')))
@@ -0,0 +1,72 @@
+import queue
+import threading
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+from vantage6.common.task_status import TaskStatus
+
+# the docker client is created when the docker modules are imported
+with patch('docker.from_env'):
+    from vantage6.node.docker.docker_manager import DockerManager
+
+
+class TestDockerManagerCompletion(unittest.TestCase):
+
+    def setUp(self):
+        # bypass __init__, which requires a node context and docker daemon
+        self.manager = DockerManager.__new__(DockerManager)
+        self.manager.node_name = 'node'
+        self.manager.active_tasks = []
+        self.manager._active_tasks_lock = threading.Lock()
+        self.manager.completed_tasks = queue.Queue()
+        self.manager.client = MagicMock()
+
+    @staticmethod
+    def task(result_id, container_id, finished=False):
+        task = MagicMock(result_id=result_id, status=TaskStatus.ACTIVE)
+        task.container.id = container_id
+        task.is_finished.return_value = finished
+        return task
+
+    def test_exit_events_complete_tasks(self):
+        running = self.task(1, 'running')
+        exiting = self.task(2, 'exiting')
+        self.manager.active_tasks = [running, exiting]
+
+        # the events stream yields a single event and then blocks
+        blocked = threading.Event()
+
+        def events(**kwargs):
+            yield {'id': 'exiting'}
+            blocked.wait()
+
+        self.manager.docker = MagicMock()
+        self.manager.docker.events.side_effect = events
+        threading.Thread(target=self.manager._watch_container_events,
+                         daemon=True).start()
+
+        result = self.manager.get_result()
+        self.assertEqual(result.result_id, 2)
+        self.assertEqual(self.manager.active_tasks, [running])
+        exiting.report_status.assert_called_once()
+        exiting.cleanup.assert_called_once()
+        # containers are not polled when events are received
+        running.is_finished.assert_not_called()
+        blocked.set()
+
+    def test_tasks_are_completed_once(self):
+        task = self.task(1, 'container')
+        self.manager.active_tasks = [task]
+        self.manager._mark_completed(task)
+        self.manager._mark_completed(task)
+        self.assertEqual(self.manager.completed_tasks.qsize(), 1)
+
+    def test_missed_events_are_detected(self):
+        task = self.task(1, 'container', finished=True)
+        self.manager.active_tasks = [task]
+        with patch('vantage6.node.docker.docker_manager.'
+                   'CHECK_ACTIVE_TASKS_INTERVAL', 0.01):
+            result = self.manager.get_result()
+        self.assertEqual(result.result_id, 1)
+        self.assertEqual(self.manager.active_tasks, [])
@@ -0,0 +1,211 @@
+import io
+import os
+import tempfile
+import unittest
+
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from vantage6.common import bytes_to_base64s
+from vantage6.common.encryption import (
+    RSACryptor, DummyCryptor, ENVELOPE_MARKER, payload_to_binary,
+    payload_from_binary
+)
+from vantage6.common.public_key_cache import PublicKeyCache
+
+
+class TestRSACryptor(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        tmp = Path(cls.tmp_dir.name)
+        cls.key_a = RSACryptor.create_new_rsa_key(tmp / 'a.pem')
+        cls.key_b = RSACryptor.create_new_rsa_key(tmp / 'b.pem')
+        cls.key_c = RSACryptor.create_new_rsa_key(tmp / 'c.pem')
+        cls.cryptor = RSACryptor(tmp / 'a.pem')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        self.cryptor.private_key = self.key_a
+
+    @staticmethod
+    def public_key_str(private_key):
+        return bytes_to_base64s(
+            RSACryptor.create_public_key_bytes(private_key)
+        )
+
+    def test_legacy_format(self):
+        encrypted = self.cryptor.encrypt_bytes_to_str(
+            b'legacy', self.public_key_str(self.key_a)
+        )
+        self.assertEqual(len(encrypted.split('$')), 3)
+        self.assertEqual(self.cryptor.decrypt_str_to_bytes(encrypted),
+                         b'legacy')
+
+    def test_multi_recipient_envelope(self):
+        encrypted = self.cryptor.encrypt_bytes_to_str_multi(
+            b'payload',
+            [self.public_key_str(self.key_a), self.public_key_str(self.key_b)]
+        )
+        self.assertTrue(encrypted.startswith(ENVELOPE_MARKER))
+
+        for key in (self.key_a, self.key_b):
+            self.cryptor.private_key = key
+            self.assertEqual(self.cryptor.decrypt_str_to_bytes(encrypted),
+                             b'payload')
+
+        # organizations that are not a recipient cannot decrypt the envelope
+        self.cryptor.private_key = self.key_c
+        with self.assertRaises(ValueError):
+            self.cryptor.decrypt_str_to_bytes(encrypted)
+
+    def test_single_recipient_uses_legacy_format(self):
+        encrypted = self.cryptor.encrypt_bytes_to_str_multi(
+            b'payload', [self.public_key_str(self.key_a)]
+        )
+        self.assertFalse(encrypted.startswith(ENVELOPE_MARKER))
+        self.assertEqual(self.cryptor.decrypt_str_to_bytes(encrypted),
+                         b'payload')
+
+    def test_stream_roundtrip(self):
+        data = os.urandom(1000)
+        encrypted = io.BytesIO()
+        self.cryptor.encrypt_stream(
+            io.BytesIO(data), encrypted, self.public_key_str(self.key_a)
+        )
+
+        # streamed output can be read by the in-memory implementation and
+        # vice versa
+        self.assertEqual(
+            self.cryptor.decrypt_str_to_bytes(encrypted.getvalue().decode()),
+            data
+        )
+        decrypted = io.BytesIO()
+        self.cryptor.decrypt_stream(io.BytesIO(encrypted.getvalue()),
+                                    decrypted)
+        self.assertEqual(decrypted.getvalue(), data)
+
+    def test_stream_small_chunks(self):
+        data = os.urandom(1000)
+        encrypted = self.cryptor.encrypt_bytes_to_str_multi(
+            data,
+            [self.public_key_str(self.key_a), self.public_key_str(self.key_b)]
+        )
+        decrypted = io.BytesIO()
+        with patch(
+            'vantage6.common.encryption.STREAM_CHUNK_SIZE', 7
+        ), patch('vantage6.common.encryption.HEADER_CHUNK_SIZE', 5):
+            self.cryptor.decrypt_stream(io.StringIO(encrypted), decrypted)
+        self.assertEqual(decrypted.getvalue(), data)
+
+    def test_stream_header_is_read_in_chunks(self):
+        data = os.urandom(1000)
+        binary = payload_to_binary(self.cryptor.encrypt_bytes_to_str_multi(
+            data, [self.public_key_str(self.key_a)]
+        ))
+        in_fp = io.BytesIO(binary)
+        read = MagicMock(side_effect=in_fp.read)
+        decrypted = io.BytesIO()
+        self.cryptor.decrypt_stream(MagicMock(read=read), decrypted,
+                                    binary=True)
+        self.assertEqual(decrypted.getvalue(), data)
+        self.assertLess(read.call_count, 5)
+
+    def test_binary_payload(self):
+        data = os.urandom(1000)
+        for pubkeys in ([self.key_a], [self.key_a, self.key_b]):
+            encrypted = self.cryptor.encrypt_bytes_to_str_multi(
+                data, [self.public_key_str(key) for key in pubkeys]
+            )
+            binary = payload_to_binary(encrypted)
+            self.assertEqual(payload_from_binary(binary, True), encrypted)
+
+            decrypted = io.BytesIO()
+            self.cryptor.decrypt_stream(io.BytesIO(binary), decrypted,
+                                        binary=True)
+            self.assertEqual(decrypted.getvalue(), data)
+
+        binary = io.BytesIO()
+        self.cryptor.encrypt_stream(io.BytesIO(data), binary,
+                                    self.public_key_str(self.key_a),
+                                    binary=True)
+        self.assertEqual(self.cryptor.decrypt_str_to_bytes(
+            payload_from_binary(binary.getvalue(), True)), data)
+
+    def test_dummy_stream(self):
+        encrypted = io.BytesIO()
+        DummyCryptor().encrypt_stream(io.BytesIO(b'data'), encrypted)
+        self.assertEqual(DummyCryptor().decrypt_str_to_bytes(
+            encrypted.getvalue().decode()), b'data')
+
+
+class TestPublicKeyCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        with tempfile.TemporaryDirectory() as tmp:
+            key = RSACryptor.create_new_rsa_key(Path(tmp) / 'key.pem')
+        cls.public_key = bytes_to_base64s(
+            RSACryptor.create_public_key_bytes(key)
+        )
+
+    def test_key_is_fetched_once(self):
+        fetch = MagicMock(return_value=self.public_key)
+        cache = PublicKeyCache(fetch)
+
+        key = cache.get(1)
+        self.assertIs(cache.get(1), key)
+        fetch.assert_called_once_with(1)
+
+    def test_expired_and_invalidated_keys_are_fetched_again(self):
+        fetch = MagicMock(return_value=self.public_key)
+        cache = PublicKeyCache(fetch, ttl=0)
+        cache.get(1)
+        cache.get(1)
+        self.assertEqual(fetch.call_count, 2)
+
+        cache.ttl = 300
+        cache.get(1)
+        cache.invalidate(1)
+        cache.get(1)
+        self.assertEqual(fetch.call_count, 4)
+
+    def test_missing_keys_are_not_cached(self):
+        fetch = MagicMock(return_value=None)
+        cache = PublicKeyCache(fetch)
+        self.assertIsNone(cache.get(1))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_prefetch(self):
+        fetch = MagicMock(return_value=self.public_key)
+        fetch_collaboration = MagicMock(
+            return_value={1: self.public_key, 2: self.public_key}
+        )
+        cache = PublicKeyCache(fetch, fetch_collaboration)
+        cache.prefetch(1)
+
+        self.assertEqual(len(cache.get_many([1, 2])), 2)
+        fetch.assert_not_called()
+
+        # without a function to retrieve the keys of a collaboration, the
+        # keys are retrieved per organization
+        cache = PublicKeyCache(fetch)
+        cache.prefetch(1)
+        self.assertEqual(cache.uncached([1]), [1])
+        self.assertIsNotNone(cache.get(1))
+        fetch.assert_called_once_with(1)
+
+    def test_uncached(self):
+        fetch = MagicMock(return_value=self.public_key)
+        cache = PublicKeyCache(fetch)
+        cache.get(1)
+        self.assertEqual(cache.uncached([1, 2]), [2])
+
+        cache.ttl = 0
+        cache.get(2)
+        self.assertEqual(cache.uncached([1, 2]), [2])
@@ -0,0 +1,21 @@
+import unittest
+
+from vantage6.common.http_session import create_http_session
+
+
+class TestHttpSession(unittest.TestCase):
+
+    def test_pool_and_retries(self):
+        session = create_http_session(pool_size=4, max_retries=2,
+                                      backoff_factor=0.1)
+        adapter = session.get_adapter('https://server.test')
+        self.assertEqual(adapter._pool_maxsize, 4)
+        self.assertEqual(adapter.max_retries.total, 2)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        # requests that may not be idempotent are not retried on errors
+        self.assertNotIn('POST', adapter.max_retries.allowed_methods)
+        self.assertEqual(session.headers['Connection'], 'keep-alive')
+
+    def test_without_keep_alive(self):
+        session = create_http_session(keep_alive=False)
+        self.assertEqual(session.headers['Connection'], 'close')
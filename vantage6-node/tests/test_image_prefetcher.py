@@ -0,0 +1,49 @@
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+# the docker client is created when the docker modules are imported
+with patch('docker.from_env'):
+    from vantage6.node.docker.docker_manager import DockerManager
+    from vantage6.node.docker.image_prefetcher import ImagePrefetcher
+
+
+class TestImagePrefetcher(unittest.TestCase):
+
+    def test_allowed_images_are_pulled_once(self):
+        release = threading.Event()
+        pulled = []
+
+        def pull(docker_client, image, log, cache_ttl):
+            pulled.append(image)
+            release.wait(5)
+
+        prefetcher = ImagePrefetcher(
+            MagicMock(), is_allowed=lambda image: image != 'forbidden'
+        )
+        with patch('vantage6.node.docker.image_prefetcher.pull_if_newer',
+                   side_effect=pull):
+            prefetcher.prefetch('image')
+            prefetcher.prefetch('image')
+            prefetcher.prefetch('forbidden')
+            release.set()
+            # wait for the pull to finish
+            for _ in range(50):
+                if not prefetcher._pending:
+                    break
+                time.sleep(0.1)
+
+        self.assertEqual(pulled, ['image'])
+        self.assertEqual(prefetcher._pending, set())
+
+    def test_image_policies(self):
+        manager = DockerManager.__new__(DockerManager)
+        manager._policies = {'allowed_algorithms': ['^harbor.test/']}
+        manager._allowed_images = None
+        self.assertTrue(manager.is_image_allowed('harbor.test/algorithm'))
+        self.assertFalse(manager.is_image_allowed('other.test/algorithm'))
+
+        manager._policies = {}
+        self.assertTrue(manager.is_image_allowed('other.test/algorithm'))
@@ -0,0 +1,34 @@
+import tempfile
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from vantage6.node.node_client import NodeClient
+
+
+class TestNodeClient(unittest.TestCase):
+
+    def setUp(self):
+        with patch('vantage6.client.create_http_session'):
+            self.client = NodeClient('http://server.test', 5000)
+        self.client.request = MagicMock()
+        self.client.upload_payload = MagicMock()
+
+    def test_result_file_is_uploaded_before_finishing(self):
+        with tempfile.NamedTemporaryFile() as result_file:
+            self.client.patch_results(1, {'finished_at': 'now'}, 2,
+                                      result_file=result_file.name)
+        self.client.upload_payload.assert_called_once()
+        self.client.request.assert_called_once_with(
+            'result/1', json={'finished_at': 'now'}, method='patch'
+        )
+
+    def test_run_is_not_finished_when_upload_fails(self):
+        self.client.upload_payload.side_effect = requests.HTTPError()
+        with tempfile.NamedTemporaryFile() as result_file:
+            with self.assertRaises(requests.HTTPError):
+                self.client.patch_results(1, {'finished_at': 'now'}, 2,
+                                          result_file=result_file.name)
+        self.client.request.assert_not_called()
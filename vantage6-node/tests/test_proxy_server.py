@@ -0,0 +1,196 @@
+import io
+import threading
+import time
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+# the docker client is created when the docker modules are imported
+with patch('docker.from_env'):
+    from vantage6.node import proxy_server
+    from vantage6.node.task_status_notifier import TaskStatusNotifier
+
+
+class TestProxyTask(unittest.TestCase):
+
+    def setUp(self):
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        self.client = MagicMock()
+        self.client.is_encrypted_collaboration.return_value = True
+        self.client.public_keys.get.side_effect = self.fetch_key
+        self.client.cryptor.encrypt_bytes_to_str_multi.side_effect = \
+            lambda input_, keys: f'{input_.decode()}:{sorted(keys)}'
+        proxy_server.app.config['SERVER_IO'] = self.client
+        proxy_server.app.config['TASK_STATUS_NOTIFIER'] = \
+            TaskStatusNotifier()
+        proxy_server.result_cache.clear()
+
+    def fetch_key(self, organization_id):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(0.05)
+        with self.lock:
+            self.active -= 1
+        return f'key{organization_id}'
+
+    @patch.object(proxy_server, 'make_request')
+    def test_keys_are_fetched_concurrently(self, make_request):
+        make_request.return_value.json.return_value = {'id': 1}
+        organizations = [
+            {'id': 1, 'input': 'YQ=='},
+            {'id': 2, 'input': 'YQ=='},
+            {'id': 3, 'input': 'Yg=='},
+        ]
+        response = proxy_server.app.test_client().post(
+            '/task', json={'organizations': organizations},
+            headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.max_active, 1)
+
+        # organizations with the same input share the encrypted input
+        sent = make_request.call_args.args[2]['organizations']
+        self.assertEqual([o['input'] for o in sent], [
+            "a:['key1', 'key2']", "a:['key1', 'key2']", "b:['key3']"
+        ])
+
+    @patch.object(proxy_server, 'make_request')
+    def test_keys_are_prefetched_when_missing(self, make_request):
+        make_request.return_value.json.return_value = {'id': 1}
+        organizations = [
+            {'id': 1, 'input': 'YQ=='}, {'id': 2, 'input': 'YQ=='}
+        ]
+        self.client.collaboration_id = 5
+
+        # all keys are cached
+        self.client.public_keys.uncached.return_value = []
+        proxy_server.app.test_client().post(
+            '/task', json={'organizations': organizations},
+            headers={'Authorization': 'Bearer token'}
+        )
+        self.client.public_keys.prefetch.assert_not_called()
+
+        # the keys of the collaboration are retrieved at once, and the keys
+        # are then retrieved per organization if that fails
+        self.client.public_keys.uncached.return_value = [2]
+        self.client.public_keys.prefetch.side_effect = Exception()
+        response = proxy_server.app.test_client().post(
+            '/task', json={'organizations': organizations},
+            headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.client.public_keys.prefetch.assert_called_once_with(5)
+        self.assertEqual(self.client.public_keys.get.call_count, 4)
+
+    @patch.object(proxy_server, 'make_request')
+    def test_decrypted_results_are_cached(self, make_request):
+        self.client.cryptor.decrypt_str_to_bytes.side_effect = \
+            lambda encrypted: encrypted.upper().encode()
+        make_request.return_value.json.side_effect = lambda: [
+            {'id': 1, 'result': 'a'}, {'id': 2, 'result': 'b'},
+            {'id': 3, 'result': None},
+        ]
+        for _ in range(3):
+            response = proxy_server.app.test_client().get(
+                '/task/1/result', headers={'Authorization': 'Bearer token'}
+            )
+            self.assertEqual([r['result'] for r in response.json],
+                             ['QQ==', 'Qg==', None])
+        self.assertEqual(
+            self.client.cryptor.decrypt_str_to_bytes.call_count, 2
+        )
+
+    @patch.object(proxy_server, 'session')
+    @patch.object(proxy_server, 'make_request')
+    def test_results_in_blob_store_are_downloaded(self, make_request,
+                                                  session):
+        self.client.cryptor.decrypt_stream.side_effect = \
+            lambda in_fp, out_fp, binary: out_fp.write(in_fp.read().upper())
+        make_request.return_value.json.side_effect = lambda: [
+            {'id': 1, 'result': None, 'result_size': 1},
+        ]
+        response = session.get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.raw = io.BytesIO(b'a')
+
+        response = proxy_server.app.test_client().get(
+            '/task/1/result', headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual([r['result'] for r in response.json], ['QQ=='])
+        self.assertTrue(session.get.call_args.args[0].endswith(
+            '/result/1/result'
+        ))
+
+        # errors of the server are not passed on as results
+        session.get.return_value.__enter__.return_value.status_code = 404
+        response = proxy_server.app.test_client().get(
+            '/task/1/result', headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(response.status_code, 500)
+
+    @patch.object(proxy_server, 'session')
+    @patch.object(proxy_server, 'make_request')
+    def test_cached_results_are_not_downloaded(self, make_request, session):
+        self.client.cryptor.decrypt_stream.side_effect = \
+            lambda in_fp, out_fp, binary: out_fp.write(in_fp.read().upper())
+        make_request.return_value.json.side_effect = lambda: [
+            {'id': 1, 'result': None, 'result_size': 1,
+             'result_digest': 'digest'},
+        ]
+        response = session.get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.raw = io.BytesIO(b'a')
+
+        for _ in range(2):
+            response = proxy_server.app.test_client().get(
+                '/task/1/result', headers={'Authorization': 'Bearer token'}
+            )
+            self.assertEqual([r['result'] for r in response.json], ['QQ=='])
+        self.assertEqual(session.get.call_count, 1)
+
+    @patch.object(proxy_server, 'make_request')
+    def test_wait_returns_when_results_are_finished(self, make_request):
+        self.client.cryptor.decrypt_str_to_bytes.side_effect = \
+            lambda encrypted: encrypted.encode()
+        finished = threading.Event()
+        make_request.return_value.json.side_effect = lambda: [
+            {'id': 1, 'result': 'a', 'finished_at': '2023-01-01'},
+            {'id': 2, 'result': 'b' if finished.is_set() else None,
+             'finished_at': '2023-01-01' if finished.is_set() else None},
+        ]
+
+        # the node is notified of the finished result while waiting
+        notifier = proxy_server.app.config['TASK_STATUS_NOTIFIER']
+
+        def finish():
+            finished.set()
+            notifier.notify(1)
+        threading.Timer(0.3, finish).start()
+
+        start = time.monotonic()
+        response = proxy_server.app.test_client().get(
+            '/task/1/result/wait', headers={'Authorization': 'Bearer token'}
+        )
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual([r['result'] for r in response.json],
+                         ['YQ==', 'Yg=='])
+        self.assertEqual(make_request.call_count, 2)
+
+    @patch.object(proxy_server, 'make_request')
+    def test_wait_timeout(self, make_request):
+        make_request.return_value.json.side_effect = lambda: [
+            {'id': 1, 'result': None, 'finished_at': None,
+             'status': 'active'},
+            {'id': 2, 'result': None, 'finished_at': None,
+             'status': 'crashed'},
+        ]
+        response = proxy_server.app.test_client().get(
+            '/task/1/result/wait?timeout=0.2',
+            headers={'Authorization': 'Bearer token'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json[0]['finished_at'], None)
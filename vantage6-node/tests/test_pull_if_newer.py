@@ -0,0 +1,57 @@
+import unittest
+
+from unittest.mock import MagicMock, patch
+
+# the docker client is created when the docker modules are imported
+with patch('docker.from_env'):
+    from vantage6.common.docker import addons
+
+
+def response(status_code, json=None):
+    return MagicMock(status_code=status_code, json=MagicMock(return_value=json))
+
+
+class TestPullIfNewer(unittest.TestCase):
+
+    IMAGE = 'harbor.test/project/algorithm'
+
+    def setUp(self):
+        addons.clear_registry_cache()
+        self.docker = MagicMock()
+        self.docker.images.get.return_value.attrs = {
+            'Created': '2023-01-01T00:00:00Z',
+            'RepoDigests': [f'{self.IMAGE}@sha256:local'],
+        }
+
+    def registry(self, digest):
+        def get(url, headers=None):
+            if url.endswith('/api/health'):
+                return response(404)
+            if url.endswith('/api/v2.0/health'):
+                return response(200)
+            return response(200, {'push_time': '2022-01-01T00:00:00Z',
+                                  'digest': digest})
+        return MagicMock(side_effect=get)
+
+    @patch.object(addons, 'registry_basic_auth_header')
+    def test_registry_is_queried_once(self, _):
+        get = self.registry('sha256:local')
+        with patch.object(addons.requests, 'get', get):
+            addons.pull_if_newer(self.docker, self.IMAGE)
+            addons.pull_if_newer(self.docker, self.IMAGE)
+        # two health checks and one artifact request
+        self.assertEqual(get.call_count, 3)
+        self.docker.images.pull.assert_not_called()
+
+        # the cached metadata expires
+        with patch.object(addons.requests, 'get', get):
+            addons.pull_if_newer(self.docker, self.IMAGE, cache_ttl=0)
+        self.assertEqual(get.call_count, 6)
+
+    @patch.object(addons, 'registry_basic_auth_header')
+    def test_digest_decides_pull(self, _):
+        # the remote image is older, but has a different digest
+        with patch.object(addons.requests, 'get',
+                          self.registry('sha256:remote')):
+            addons.pull_if_newer(self.docker, self.IMAGE)
+        self.docker.images.pull.assert_called_once_with(self.IMAGE)
@@ -0,0 +1,29 @@
+import unittest
+
+from vantage6.node.result_cache import DecryptedResultCache
+
+
+class TestDecryptedResultCache(unittest.TestCase):
+
+    def test_get_and_put(self):
+        cache = DecryptedResultCache()
+        cache.put(1, 'encrypted', 'decrypted')
+        self.assertEqual(cache.get(1, 'encrypted'), 'decrypted')
+        # a result that changed on the server is not served from the cache
+        self.assertIsNone(cache.get(1, 'updated'))
+        self.assertIsNone(cache.get(2, 'encrypted'))
+
+    def test_least_recently_used_are_evicted(self):
+        cache = DecryptedResultCache(max_size=10)
+        cache.put(1, 'a', 'xxxx')
+        cache.put(2, 'b', 'xxxx')
+        cache.get(1, 'a')
+        cache.put(3, 'c', 'xxxx')
+        self.assertEqual(cache.get(1, 'a'), 'xxxx')
+        self.assertIsNone(cache.get(2, 'b'))
+        self.assertEqual(cache.size, 8)
+
+        # results that do not fit at all are not stored
+        cache.put(4, 'd', 'x' * 11)
+        self.assertIsNone(cache.get(4, 'd'))
+        self.assertEqual(cache.size, 8)
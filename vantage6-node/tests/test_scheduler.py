@@ -0,0 +1,100 @@
+import threading
+import unittest
+
+from vantage6.common.task_status import TaskStatus
+from vantage6.node.scheduler import TaskScheduler
+
+
+def task_result(result_id, image='image', database='default', parent=None):
+    return {
+        'id': result_id,
+        'task': {
+            'id': result_id,
+            'image': image,
+            'database': database,
+            'parent': {'id': parent} if parent else None,
+        },
+    }
+
+
+class TestTaskScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.started = []
+        self.start_event = threading.Semaphore(0)
+        self.status = TaskStatus.ACTIVE
+
+    def start_task(self, task_result):
+        self.started.append(task_result['id'])
+        self.start_event.release()
+        return self.status
+
+    def wait_for_starts(self, n):
+        for _ in range(n):
+            self.assertTrue(self.start_event.acquire(timeout=5))
+
+    def test_image_limit(self):
+        scheduler = TaskScheduler(self.start_task, 2, image_limits={'a': 1})
+        scheduler.submit(task_result(1, image='a'))
+        scheduler.submit(task_result(2, image='a'))
+        scheduler.submit(task_result(3, image='b'))
+        self.wait_for_starts(2)
+        self.assertCountEqual(self.started, [1, 3])
+        self.assertEqual(scheduler.status()['queued'], 1)
+
+        scheduler.release(1)
+        self.wait_for_starts(1)
+        self.assertEqual(self.started[-1], 2)
+
+    def test_running_task_limit(self):
+        scheduler = TaskScheduler(self.start_task, 4, max_running_tasks=2)
+        for result_id in (1, 2, 3):
+            scheduler.submit(task_result(result_id))
+        self.wait_for_starts(2)
+        self.assertFalse(self.start_event.acquire(timeout=0.2))
+        self.assertEqual(scheduler.status()['running'], 2)
+
+        # subtasks are not limited, and finished tasks free their slot
+        scheduler.submit(task_result(4, parent=1))
+        self.wait_for_starts(1)
+        self.assertEqual(self.started[-1], 4)
+        scheduler.release(self.started[0])
+        self.wait_for_starts(1)
+        self.assertCountEqual(self.started, [1, 2, 3, 4])
+
+    def test_database_limit_and_subtask_priority(self):
+        scheduler = TaskScheduler(self.start_task, 1,
+                                  database_limits={'default': 1})
+        scheduler.submit(task_result(1))
+        self.wait_for_starts(1)
+
+        # the queued task is held back by the database limit, the subtask is
+        # not
+        scheduler.submit(task_result(2))
+        scheduler.submit(task_result(3, parent=1))
+        self.wait_for_starts(1)
+        self.assertEqual(self.started, [1, 3])
+
+        scheduler.release(1)
+        self.wait_for_starts(1)
+        self.assertEqual(self.started, [1, 3, 2])
+        self.assertEqual(scheduler.status()['running'], 2)
+
+    def test_failed_starts(self):
+        self.status = TaskStatus.NOT_ALLOWED
+        scheduler = TaskScheduler(self.start_task, 1, image_limits={'a': 1})
+        scheduler.submit(task_result(1, image='a'))
+        scheduler.submit(task_result(2, image='a'))
+        # the slot of a task that failed to start is freed immediately
+        self.wait_for_starts(2)
+        self.assertEqual(self.started, [1, 2])
+
+    def test_duplicates_and_discard(self):
+        scheduler = TaskScheduler(self.start_task, 1, image_limits={'a': 0})
+        scheduler.submit(task_result(1, image='a'))
+        scheduler.submit(task_result(1, image='a'))
+        scheduler.submit(task_result(2, image='a'))
+        self.assertEqual(scheduler.status()['queued'], 2)
+        self.assertEqual(scheduler.discard([2]), [2])
+        self.assertEqual(scheduler.discard(), [1])
+        self.assertEqual(scheduler.status()['queued'], 0)
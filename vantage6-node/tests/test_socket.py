@@ -0,0 +1,47 @@
+import unittest
+
+from unittest.mock import MagicMock
+
+from vantage6.node.socket import NodeTaskNamespace
+
+
+class TestNodeTaskNamespace(unittest.TestCase):
+
+    def setUp(self):
+        self.namespace = NodeTaskNamespace('/tasks')
+        self.namespace.node_worker_ref = MagicMock()
+
+    def test_legacy_new_task_event(self):
+        self.namespace.on_new_task(1)
+        self.namespace.node_worker_ref.get_task_and_add_to_queue\
+            .assert_called_once_with(1)
+
+    def test_new_task_run_event(self):
+        result = {'id': 2, 'input': 'input'}
+        self.namespace.on_new_task_run(
+            {'task_id': 1, 'result_id': 2, 'result': result}
+        )
+        self.namespace.node_worker_ref.add_result_to_queue\
+            .assert_called_once_with(2, result)
+
+    def test_new_task_event_is_ignored_if_server_sends_task_runs(self):
+        self.namespace.on_server_features({'new_task_run': True})
+        self.namespace.on_new_task(1)
+        self.namespace.node_worker_ref.get_task_and_add_to_queue\
+            .assert_not_called()
+
+        # the server tells its features again after reconnecting
+        self.namespace.on_disconnect()
+        self.namespace.on_new_task(1)
+        self.namespace.node_worker_ref.get_task_and_add_to_queue\
+            .assert_called_once_with(1)
+
+    def test_status_events_before_node_is_set_up(self):
+        self.namespace.node_worker_ref = None
+        self.namespace.on_algorithm_status_change(
+            {'task_id': 1, 'run_id': 1, 'status': 'completed'}
+        )
+        self.namespace.on_status_update({'task_id': 1, 'result_id': 2})
+
+        self.namespace.node_worker_ref = MagicMock(task_notifier=None)
+        self.namespace.on_status_update({'task_id': 1, 'result_id': 2})
@@ -3,16 +3,22 @@ A node in its simplest would retrieve a task from the central server by
 an API call, run this task and finally return the results to the central
 server again.
 
-The node application runs four threads:
+The node application runs the following threads:
 
 *Main thread*
-    Checks the task queue and run the next task if there is one available.
+    Waits until the node is shut down.
+*Scheduler threads*
+    Start the tasks in the task queue, respecting the concurrency limits in
+    the `task_scheduler` section of the configuration file.
 *Listening thread*
     Listens for incoming websocket messages. Among other functionality, it adds
     new tasks to the task queue.
-*Speaking thread*
-    Waits for tasks to finish. When they do, return the results to the central
+*Speaking threads*
+    Wait for tasks to finish. When they do, return the results to the central
     server.
+*Prefetch threads*
+    Pull algorithm images in the background, before tasks that use them are
+    started.
 *Proxy server thread*
     Algorithm containers are isolated from the internet for security reasons.
     The local proxy server provides an interface to the central server for
@@ -28,13 +34,13 @@ import random
 import time
 import datetime
 import logging
-import queue
 import json
 import shutil
 import requests.exceptions
 
 from pathlib import Path
 from threading import Thread
+from typing import NamedTuple
 from socketio import Client as SocketIO
 from gevent.pywsgi import WSGIServer
 from enum import Enum
@@ -44,6 +50,7 @@ from vantage6.common.docker.addons import (
     ContainerKillListener, check_docker_running, running_in_docker
 )
 from vantage6.common.globals import VPN_CONFIG_FILE, PING_INTERVAL_SECONDS
+from vantage6.common.http_session import create_http_session
 from vantage6.common.exceptions import AuthenticationException
 from vantage6.common.docker.network_manager import NetworkManager
 from vantage6.common.task_status import TaskStatus
@@ -52,12 +59,17 @@ from vantage6.cli.context import NodeContext
 from vantage6.node.context import DockerNodeContext
 from vantage6.node.globals import (
     NODE_PROXY_SERVER_HOSTNAME, SLEEP_BTWN_NODE_LOGIN_TRIES,
-    TIME_LIMIT_RETRY_CONNECT_NODE, TIME_LIMIT_INITIAL_CONNECTION_WEBSOCKET
+    TIME_LIMIT_RETRY_CONNECT_NODE, TIME_LIMIT_INITIAL_CONNECTION_WEBSOCKET,
+    NUMBER_OF_SPEAKING_WORKERS, DEFAULT_MAX_CONCURRENT_TASK_STARTS,
+    DEFAULT_MAX_CONCURRENT_PULLS, IMAGE_WATCH_INTERVAL_SECONDS
 )
 from vantage6.node.node_client import NodeClient
+from vantage6.node.scheduler import TaskScheduler
 from vantage6.node import proxy_server
 from vantage6.node.util import get_parent_id
 from vantage6.node.docker.docker_manager import DockerManager
+from vantage6.node.docker.image_prefetcher import ImagePrefetcher
+from vantage6.node.task_status_notifier import TaskStatusNotifier
 from vantage6.node.docker.vpn_manager import VPNManager
 from vantage6.node.socket import NodeTaskNamespace
 from vantage6.node.docker.ssh_tunnel import SSHTunnel
@@ -70,6 +82,26 @@ class VPNConnectMode(Enum):
     REFRESH_COMPLETE = 3
 
 
+class RunContext(NamedTuple):
+    """
+    Information about a running algorithm that is needed to report its
+    results to the server.
+
+    Attributes
+    ----------
+    task_id: int
+        ID of the task
+    initiator_id: int
+        ID of the organization that created the task, for which the results
+        are encrypted
+    parent_id: int | None
+        ID of the parent task, if any
+    """
+    task_id: int
+    initiator_id: int
+    parent_id: int | None
+
+
 # ------------------------------------------------------------------------------
 class Node:
     """
@@ -104,14 +136,34 @@ class Node:
 
         self.config = self.ctx.config
         self.debug: dict = self.config.get('debug', {})
-        self.queue = queue.Queue()
+        scheduler_config = self.config.get('task_scheduler') or {}
+        self.scheduler = TaskScheduler(
+            start_task=self.__start_task,
+            max_concurrent_starts=scheduler_config.get(
+                'max_concurrent_starts', DEFAULT_MAX_CONCURRENT_TASK_STARTS
+            ),
+            max_running_tasks=scheduler_config.get('max_running_tasks'),
+            image_limits=scheduler_config.get('image_limits'),
+            database_limits=scheduler_config.get('database_limits'),
+        )
         self._using_encryption = None
+        # result id -> context of the runs that have been started
+        self.runs: dict[int, RunContext] = {}
+        # status changes of tasks, for algorithms that wait for results
+        self.task_notifier = TaskStatusNotifier()
 
         # initialize Node connection to the server
+        self.http_config = {
+            key: value
+            for key, value in (self.config.get('http') or {}).items()
+            if key in ('pool_size', 'max_retries', 'backoff_factor',
+                       'keep_alive')
+        }
         self.client = NodeClient(
             host=self.config.get('server_url'),
             port=self.config.get('port'),
-            path=self.config.get('api_path')
+            path=self.config.get('api_path'),
+            **self.http_config
         )
 
         self.log.info(f"Connecting server: {self.client.base_path}")
@@ -164,6 +216,25 @@ class Node:
             proxy=self.squid
         )
 
+        # pull algorithm images in the background before they are needed. This
+        # is opt-in, as without an allow-list each image that is used in the
+        # collaboration would be pulled
+        prefetch_config = self.config.get('image_prefetch') or {}
+        self.image_prefetcher = None
+        if prefetch_config.get('enabled', False):
+            self.image_prefetcher = ImagePrefetcher(
+                docker_client=self.__docker.docker,
+                is_allowed=self.__docker.is_image_allowed,
+                max_concurrent_pulls=prefetch_config.get(
+                    'max_concurrent_pulls', DEFAULT_MAX_CONCURRENT_PULLS
+                ),
+                watch_list=prefetch_config.get('watch_list'),
+                watch_interval=prefetch_config.get(
+                    'watch_interval', IMAGE_WATCH_INTERVAL_SECONDS
+                ),
+                registry_cache_ttl=self.__docker.registry_cache_ttl,
+            )
+
         # Create a long-lasting websocket connection.
         self.log.debug("Creating websocket connection with the server")
         self.connect_to_socket()
@@ -180,10 +251,13 @@ class Node:
         # the node container
         self.link_docker_services()
 
-        # Thread for sending results to the server when they come available.
-        self.log.debug("Start thread for sending messages (results)")
-        t = Thread(target=self.__speaking_worker, daemon=True)
-        t.start()
+        # Threads for sending results to the server when they come available.
+        # Multiple threads are used so that results that are finished at the
+        # same time are sent concurrently.
+        self.log.debug("Start threads for sending messages (results)")
+        for _ in range(NUMBER_OF_SPEAKING_WORKERS):
+            t = Thread(target=self.__speaking_worker, daemon=True)
+            t.start()
 
         # listen forever for incoming messages, tasks are stored in
         # the queue.
@@ -223,7 +297,12 @@ class Node:
             self.log.debug("Debug mode enabled for proxy server")
             proxy_server.app.debug = True
         proxy_server.app.config["SERVER_IO"] = self.client
+        proxy_server.app.config["TASK_STATUS_NOTIFIER"] = self.task_notifier
         proxy_server.server_url = self.client.base_path
+        # the proxy server retries failed requests itself
+        proxy_server.session = create_http_session(
+            **{**self.http_config, 'max_retries': 0}
+        )
 
         # set up proxy server logging
         log_level = getattr(logging, self.config["logging"]["level"].upper())
@@ -268,7 +347,11 @@ class Node:
 
         # add the tasks to the queue
         self.__add_tasks_to_queue(task_results)
-        self.log.info(f"Received {self.queue._qsize()} tasks")
+        status = self.scheduler.status()
+        self.log.info(
+            f"Received {len(task_results)} tasks, {status['queued']} task(s) "
+            f"waiting to be started and {status['running']} running"
+        )
 
     def get_task_and_add_to_queue(self, task_id: int) -> None:
         """
@@ -290,6 +373,31 @@ class Node:
         # add the tasks to the queue
         self.__add_tasks_to_queue(task_results)
 
+    def add_result_to_queue(self, result_id: int,
+                            task_result: dict = None) -> None:
+        """
+        Add the result of a new task to the queue. The `result_id` and
+        optionally the result itself are delivered by the
+        websocket-connection.
+
+        Parameters
+        ----------
+        result_id : int
+            Result identifier
+        task_result : dict, optional
+            The (encrypted) result including the task. If not provided, it is
+            retrieved from the server.
+        """
+        if task_result:
+            self.client.decrypt_result(task_result)
+        else:
+            task_result = self.client.get_results(
+                id_=result_id, include_task=True
+            )
+            if not task_result or task_result.get('finished_at'):
+                return
+        self.__add_tasks_to_queue([task_result])
+
     def __add_tasks_to_queue(self, task_results: list[dict]) -> None:
         """
         Add a task to the queue.
@@ -303,7 +411,7 @@ class Node:
         for task_result in task_results:
             try:
                 if not self.__docker.is_running(task_result['id']):
-                    self.queue.put(task_result)
+                    self.scheduler.submit(task_result)
                 else:
                     self.log.info(
                         f"Not starting task {task_result['task']['id']} - "
@@ -313,7 +421,7 @@ class Node:
             except Exception:
                 self.log.exception("Error while syncing task queue")
 
-    def __start_task(self, taskresult: dict) -> None:
+    def __start_task(self, taskresult: dict) -> TaskStatus:
         """
         Start the docker image and notify the server that the task has been
         started.
@@ -322,6 +430,11 @@ class Node:
         ----------
         taskresult : dict
             A dictionary with information required to run the algorithm
+
+        Returns
+        -------
+        TaskStatus
+            Status of the task after starting it
         """
         task = taskresult['task']
         self.log.info("Starting task {id} - {name}".format(**task))
@@ -346,6 +459,14 @@ class Node:
         if type(taskresult['input']) == dict:
             taskresult['input'] = json.dumps(taskresult['input'])
 
+        # keep the information that is required to report the results, so
+        # that it does not have to be retrieved from the server again
+        self.runs[taskresult['id']] = RunContext(
+            task_id=task['id'],
+            initiator_id=task['initiator'],
+            parent_id=get_parent_id(task),
+        )
+
         # Run the container. This adds the created container/task to the list
         # __docker.active_tasks
         task_status, vpn_ports = self.__docker.run(
@@ -365,6 +486,7 @@ class Node:
             # (as the task is not started at all, unlike other crashes, it will
             # never finish and hence not be set to finished)
             update['finished_at'] = datetime.datetime.now().isoformat()
+            self.runs.pop(taskresult['id'], None)
         self.client.patch_results(id_=taskresult['id'], result=update)
 
         # ensure that the /tasks namespace is connected. This may take a while
@@ -406,6 +528,8 @@ class Node:
                 port['result_id'] = taskresult['id']
                 self.client.request('port', method='POST', json=port)
 
+        return task_status
+
     def __listening_worker(self) -> None:
         """
         Listen for incoming (websocket) messages from the server.
@@ -434,13 +558,13 @@ class Node:
         Routine that is in a seperate thread sending results
         to the server when they come available.
         """
-        # TODO change to a single request, might need to reconsider
-        #     the flow
         self.log.debug("Waiting for results to send to the server")
 
         while True:
             try:
                 results = self.__docker.get_result()
+                # the container has exited, so another task can be started
+                self.scheduler.release(results.result_id)
 
                 # notify socket channel of algorithm status change
                 self.socketIO.emit(
@@ -461,43 +585,63 @@ class Node:
                 self.log.info(
                     f"Sending result (id={results.result_id}) to the server!")
 
-                # FIXME: why are we retrieving the result *again*? Shouldn't we
-                # just store the task_id when retrieving the task the first
-                # time?
-                response = self.client.request(
-                    f"result/{results.result_id}"
-                )
-                task_id = response.get("task").get("id")
-
-                if not task_id:
-                    self.log.error(
-                        f"task_id of result (id={results.result_id}) "
-                        f"could not be retrieved"
-                    )
-                    return
-
-                response = self.client.request(f"task/{task_id}")
-
-                init_org_id = response.get("initiator")
-                if not init_org_id:
-                    self.log.error(
-                        f"Initiator organization from task (id={task_id})could"
-                        " not be retrieved!"
-                    )
-
+                # the task and initiator are known from when the task was
+                # started, and the public key of the initiator is cached, so
+                # that only the result itself has to be sent to the server
+                run = self.runs.pop(results.result_id, None)
+                init_org_id = run.initiator_id if run else \
+                    self.__get_initiator_id(results.result_id)
+
+                result = {
+                    'log': results.logs,
+                    'status': results.status,
+                    'finished_at': datetime.datetime.now().isoformat(),
+                }
+                if not results.output_file:
+                    result['result'] = results.data
                 self.client.patch_results(
                     id_=results.result_id,
-                    result={
-                        'result': results.data,
-                        'log': results.logs,
-                        'status': results.status,
-                        'finished_at': datetime.datetime.now().isoformat(),
-                    },
+                    result=result,
                     init_org_id=init_org_id,
+                    result_file=results.output_file,
                 )
             except Exception:
                 self.log.exception('Speaking thread had an exception')
 
+    def __get_initiator_id(self, result_id: int) -> int | None:
+        """
+        Retrieve the organization that created the task of a result from the
+        server. Only required for runs that were not started by this node
+        instance.
+
+        Parameters
+        ----------
+        result_id: int
+            ID of the result
+
+        Returns
+        -------
+        int | None
+            ID of the initiating organization, or None if it could not be
+            retrieved
+        """
+        response = self.client.request(f"result/{result_id}")
+        task_id = response.get("task", {}).get("id")
+        if not task_id:
+            self.log.error(
+                f"task_id of result (id={result_id}) could not be retrieved"
+            )
+            return None
+
+        response = self.client.request(f"task/{task_id}")
+        init_org_id = response.get("initiator")
+        if not init_org_id:
+            self.log.error(
+                f"Initiator organization from task (id={task_id})could"
+                " not be retrieved!"
+            )
+        return init_org_id
+
     def __print_connection_error_logs(self):
         """ Print error message when node cannot find the server """
         self.log.warning(
@@ -592,6 +736,11 @@ class Node:
             private_key_file = self.private_key_filename()
             self.client.setup_encryption(private_key_file)
 
+            # retrieve the public keys of all organizations in the
+            # collaboration at once, so that they do not have to be retrieved
+            # for each task individually
+            self.client.public_keys.prefetch(self.client.collaboration_id)
+
         else:
             self.log.warn('Disabling encryption!')
             self.client.setup_encryption(None)
@@ -944,35 +1093,15 @@ class Node:
             time.sleep(PING_INTERVAL_SECONDS)
 
     def run_forever(self) -> None:
-        """Keep checking queue for incoming tasks (and execute them)."""
+        """Keep running until the node is shut down. Tasks are started by the
+        threads of the task scheduler."""
         kill_listener = ContainerKillListener()
         try:
-            while True:
-                # blocking untill a task comes available
-                # timeout specified, else Keyboard interupts are ignored
-                self.log.info("Waiting for new tasks....")
-
-                while not kill_listener.kill_now:
-                    try:
-                        taskresult = self.queue.get(timeout=1)
-                        # if no item is returned, the Empty exception is
-                        # triggered, thus break statement is not reached
-                        break
-
-                    except queue.Empty:
-                        pass
-
-                    except Exception as e:
-                        self.log.debug(e)
-
-                if kill_listener.kill_now:
-                    raise InterruptedError
-
-                # if task comes available, attempt to execute it
-                try:
-                    self.__start_task(taskresult)
-                except Exception as e:
-                    self.log.exception(e)
+            self.log.info("Waiting for new tasks....")
+            # sleep in short intervals, else Keyboard interupts are ignored
+            while not kill_listener.kill_now:
+                time.sleep(1)
+            raise InterruptedError
 
         except (KeyboardInterrupt, InterruptedError):
             self.log.info("Vnode is interrupted, shutting down...")
@@ -1012,8 +1141,20 @@ class Node:
         killed_algos = self.__docker.kill_tasks(
             org_id=self.client.whoami.organization_id, kill_list=kill_list
         )
+        # tasks that have not been started yet are removed from the queue
+        discarded = self.scheduler.discard(
+            [
+                to_kill['result_id'] for to_kill in kill_list
+                if to_kill['organization_id'] ==
+                self.client.whoami.organization_id
+            ] if kill_list else None
+        )
+        if discarded:
+            self.log.info(f"Removed results {discarded} from the task queue")
         # update status of killed tasks
         for killed_algo in killed_algos:
+            self.scheduler.release(killed_algo.result_id)
+            self.runs.pop(killed_algo.result_id, None)
             self.client.patch_results(
                 id_=killed_algo.result_id, result={'status': TaskStatus.KILLED}
             )
@@ -1056,6 +1197,15 @@ class Node:
             config_to_share['allowed_orgs'] = \
                 policies.get('allowed_organizations')
 
+        # share the load of the node, so that it can be seen why tasks are
+        # not started yet
+        status = self.scheduler.status()
+        config_to_share['queued_tasks'] = status['queued']
+        config_to_share['running_tasks'] = status['running']
+        if status['average_start_latency'] is not None:
+            config_to_share['average_start_latency'] = \
+                round(status['average_start_latency'], 1)
+
         self.log.debug(f"Sharing node configuration: {config_to_share}")
         self.socketIO.emit(
             'node_info_update', config_to_share, namespace='/tasks'
@@ -0,0 +1,249 @@
+"""
+Cache of file-based databases converted to a columnar format.
+
+Every algorithm run that uses a CSV database parses the complete file again,
+which for large files takes much longer than the analysis itself. The node
+therefore converts the file once to the Arrow IPC file format and makes the
+converted file available to the algorithm containers, which memory map it
+instead of parsing the CSV file.
+
+Databases are converted in the background, so that starting a task is never
+delayed by a conversion: until the converted file is ready, algorithms read
+the source file. The CSV file is converted in batches, so that it is never
+loaded into memory completely.
+
+Converted files are stored in the data volume, which is mounted in the
+algorithm containers. Each file is named after a key that is derived from the
+path, modification time and size of the source file, so that a file is
+converted again as soon as the source file changes. The size of the cache is
+limited per database label and in total; when the total size is exceeded, the
+least recently used files are removed.
+"""
+import hashlib
+import logging
+import os
+import queue
+import threading
+
+from pathlib import Path
+
+from vantage6.common import logger_name
+from vantage6.tools import columnar
+
+# types of file-based databases that can be converted
+CONVERTIBLE_TYPES = ('csv',)
+
+CACHE_FILE_EXTENSION = '.arrow'
+
+# number of bytes of the CSV file that are converted at once. The data types
+# of the columns are inferred from the first block.
+CSV_BLOCK_SIZE = 16 * 1024 * 1024
+
+
+class DatasetCache:
+    """
+    Converts file-based databases to the Arrow IPC file format in the
+    background, and keeps the converted files within a configured size.
+    """
+    log = logging.getLogger(logger_name(__name__))
+
+    def __init__(self, cache_dir: Path, max_size: int,
+                 max_size_per_label: dict[str, int] | None = None) -> None:
+        """
+        Parameters
+        ----------
+        cache_dir: Path
+            Directory in which the converted files are stored, in a
+            subdirectory per database label
+        max_size: int
+            Maximum total size (in bytes) of the converted files
+        max_size_per_label: dict[str, int] | None
+            Maximum size (in bytes) of the converted files of a database
+            label. Labels that are not in this dictionary are limited by
+            `max_size` only.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.max_size_per_label = max_size_per_label or {}
+
+        # databases are converted one at a time, so that conversions do not
+        # compete with the algorithms for resources
+        self._queue = queue.Queue()
+        # cache files that are queued or being written
+        self._pending: set[Path] = set()
+        self._lock = threading.Lock()
+        self._eviction_lock = threading.Lock()
+        threading.Thread(target=self._worker, daemon=True).start()
+
+    @staticmethod
+    def key(path: Path) -> str:
+        """
+        Get the key of the converted version of a file.
+
+        Parameters
+        ----------
+        path: Path
+            Path to the source file
+
+        Returns
+        -------
+        str
+            Key that changes when the path, modification time or size of the
+            file changes
+        """
+        stat = os.stat(path)
+        source = f"{Path(path).resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def get(self, label: str, database: dict) -> Path | None:
+        """
+        Get the converted version of a database. If it is not available yet,
+        the database is converted in the background.
+
+        Parameters
+        ----------
+        label: str
+            Label of the database
+        database: dict
+            Database as set by the docker manager, with keys 'uri',
+            'is_file' and 'type'
+
+        Returns
+        -------
+        Path | None
+            Path to the converted file, or None if the database is not
+            converted yet or cannot be cached
+        """
+        if not database['is_file'] or \
+                database['type'] not in CONVERTIBLE_TYPES:
+            return None
+
+        try:
+            cache_file = self.cache_dir / label / \
+                f"{self.key(database['uri'])}{CACHE_FILE_EXTENSION}"
+        except OSError:
+            self.log.warning(f"Cannot read database '{label}' to cache it")
+            return None
+
+        with self._lock:
+            if cache_file.exists():
+                # mark the file as recently used
+                os.utime(cache_file)
+                return cache_file
+            if cache_file in self._pending:
+                return None
+            self._pending.add(cache_file)
+        self.log.debug(f"Queued database '{label}' for the dataset cache")
+        self._queue.put((label, Path(database['uri']), cache_file))
+        return None
+
+    def join(self) -> None:
+        """ Wait until all queued databases have been converted. """
+        self._queue.join()
+
+    def evict(self, keep: Path | None = None) -> None:
+        """
+        Remove the least recently used files until the total size of the
+        cache is within the maximum size.
+
+        Parameters
+        ----------
+        keep: Path | None
+            File that should not be removed, e.g. because it is about to be
+            used
+        """
+        with self._eviction_lock:
+            files = [
+                (file.stat(), file) for file in
+                self.cache_dir.glob(f"*/*{CACHE_FILE_EXTENSION}")
+            ]
+            total_size = sum(stat.st_size for stat, _ in files)
+            for stat, file in sorted(files, key=lambda f: f[0].st_mtime):
+                if total_size <= self.max_size:
+                    break
+                if file == keep:
+                    continue
+                self.log.debug(f"Removing {file} from the dataset cache")
+                self._remove_files([file])
+                total_size -= stat.st_size
+
+    def _worker(self) -> None:
+        while True:
+            label, uri, cache_file = self._queue.get()
+            try:
+                self._add(label, uri, cache_file)
+            except Exception as e:
+                # algorithms keep reading the source file
+                self.log.warning(f"Could not cache database '{label}': {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(cache_file)
+                self._queue.task_done()
+
+    def _add(self, label: str, uri: Path, cache_file: Path) -> None:
+        """
+        Convert a database and add it to the cache, replacing the previous
+        version of the database.
+        """
+        label_dir = cache_file.parent
+        label_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_files(label_dir.glob(f"*{CACHE_FILE_EXTENSION}"))
+        self._convert(uri, cache_file)
+
+        label_max_size = self.max_size_per_label.get(label, self.max_size)
+        size = cache_file.stat().st_size
+        if size > label_max_size:
+            self.log.warning(
+                f"Converted database '{label}' ({size} bytes) exceeds the "
+                f"maximum cache size of {label_max_size} bytes and is not "
+                "cached"
+            )
+            self._remove_files([cache_file])
+            return
+
+        self.evict(keep=cache_file)
+
+    def _convert(self, uri: Path, cache_file: Path) -> None:
+        """
+        Convert a CSV file to the Arrow IPC file format, one batch at a time.
+
+        The file is written under a temporary name first, so that algorithms
+        never use a partially written file.
+        """
+        self.log.info(f"Converting {uri} for the dataset cache")
+        pa = columnar.import_pyarrow()
+        from pyarrow import csv
+
+        read_options = csv.ReadOptions(block_size=CSV_BLOCK_SIZE)
+        # the algorithm wrappers read dates and times in CSV files as text,
+        # so these columns are not converted either
+        with csv.open_csv(uri, read_options=read_options) as reader:
+            text_columns = {
+                field.name: pa.string() for field in reader.schema
+                if pa.types.is_temporal(field.type)
+            }
+        convert_options = csv.ConvertOptions(column_types=text_columns,
+                                             strings_can_be_null=True)
+
+        tmp_file = cache_file.with_suffix('.tmp')
+        try:
+            with csv.open_csv(uri, read_options=read_options,
+                              convert_options=convert_options) as reader, \
+                    pa.OSFile(str(tmp_file), 'wb') as sink, \
+                    pa.ipc.new_file(sink, reader.schema) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+            # algorithm containers should not modify the cached data
+            tmp_file.chmod(0o444)
+            os.replace(tmp_file, cache_file)
+        finally:
+            self._remove_files([tmp_file])
+
+    def _remove_files(self, files) -> None:
+        for file in files:
+            try:
+                file.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.log.warning(f"Could not remove {file}: {e}")
@@ -10,20 +10,28 @@ import os
 import time
 import logging
 import docker
+import queue
 import re
 import shutil
 
 from typing import NamedTuple
 from pathlib import Path
+from threading import Lock, Thread
 
 from vantage6.common import logger_name
 from vantage6.common import get_database_config
 from vantage6.common.docker.addons import get_container, running_in_docker
-from vantage6.common.globals import APPNAME
+from vantage6.common.globals import APPNAME, REGISTRY_CACHE_TTL_SECONDS
 from vantage6.common.task_status import TaskStatus, has_task_failed
 from vantage6.common.docker.network_manager import NetworkManager
+from vantage6.tools import columnar
 from vantage6.cli.context import NodeContext
 from vantage6.node.context import DockerNodeContext
+from vantage6.node.globals import (
+    CHECK_ACTIVE_TASKS_INTERVAL,
+    DEFAULT_DATASET_CACHE_SIZE_MB
+)
+from vantage6.node.dataset_cache import DatasetCache
 from vantage6.node.docker.docker_base import DockerBaseManager
 from vantage6.node.docker.vpn_manager import VPNManager
 from vantage6.node.docker.task_manager import DockerTaskManager
@@ -53,6 +61,9 @@ class Result(NamedTuple):
         Output data of the algorithm
     status_code: int
         Status code of the algorithm run
+    output_file: str | None
+        File containing the output of the algorithm. If set, the output is
+        read from this file instead of from `data`
     """
     result_id: int
     task_id: int
@@ -60,6 +71,7 @@ class Result(NamedTuple):
     data: str
     status: str
     parent_id: int | None
+    output_file: str | None = None
 
 
 class ToBeKilled(NamedTuple):
@@ -84,6 +96,10 @@ class DockerManager(DockerBaseManager):
     docker registries, managing input/output files, logs etc. Results
     can be retrieved through `get_result()` which returns the first available
     algorithm result.
+
+    Algorithm containers that exit are detected by listening to the docker
+    events in a separate thread, which adds their tasks to a queue of
+    completed tasks.
     """
     log = logging.getLogger(logger_name(__name__))
 
@@ -120,12 +136,19 @@ class DockerManager(DockerBaseManager):
         self.__tasks_dir = tasks_dir
         self.alpine_image = config.get('alpine')
         self.proxy = proxy
+        # number of seconds the metadata of algorithm images in the registry
+        # is reused before it is retrieved again
+        self.registry_cache_ttl = config.get('registry_cache_ttl',
+                                             REGISTRY_CACHE_TTL_SECONDS)
 
-        # keep track of the running containers
+        # keep track of the running containers. These are accessed from
+        # multiple threads, so they are guarded by a lock
         self.active_tasks: list[DockerTaskManager] = []
+        self._active_tasks_lock = Lock()
 
-        # keep track of the containers that have failed to start
-        self.failed_tasks: list[DockerTaskManager] = []
+        # tasks whose containers have exited or failed to start, that still
+        # need to be reported to the server
+        self.completed_tasks: queue.Queue[DockerTaskManager] = queue.Queue()
 
         # before a task is executed it gets exposed to these regex
         # TODO remove in v4+ as it is supersed by the 'policies' block
@@ -150,6 +173,11 @@ class DockerManager(DockerBaseManager):
         # set database uri and whether or not it is a file
         self._set_database(ctx.databases)
 
+        # cache of file-based databases converted to a columnar format
+        self.dataset_cache = self._create_dataset_cache(
+            config.get('dataset_cache', {})
+        )
+
         # keep track of linked docker services
         self.linked_services: list[str] = []
 
@@ -160,6 +188,9 @@ class DockerManager(DockerBaseManager):
                 config['algorithm_device_requests']
             )
 
+        # detect algorithm containers that exit
+        Thread(target=self._watch_container_events, daemon=True).start()
+
     def _set_database(self, databases: dict | list) -> None:
         """
         Set database location and whether or not it is a file
@@ -216,6 +247,38 @@ class DockerManager(DockerBaseManager):
                                      'type': db_config['type']}
         self.log.debug(f"Databases: {self.databases}")
 
+    def _create_dataset_cache(self, cache_config: dict) -> DatasetCache | None:
+        """
+        Create the cache of converted file-based databases, if it is enabled
+
+        Parameters
+        ----------
+        cache_config: dict
+            The `dataset_cache` section of the node configuration
+
+        Returns
+        -------
+        DatasetCache | None
+            The dataset cache, or None if it is disabled
+        """
+        if not cache_config.get('enabled', False):
+            return None
+        try:
+            columnar.import_pyarrow()
+        except ImportError as e:
+            self.log.warning(f"Dataset cache is disabled: {e}")
+            return None
+
+        mb = 1024 * 1024
+        max_size = cache_config.get('max_size', DEFAULT_DATASET_CACHE_SIZE_MB)
+        max_size_per_label = {
+            label: size * mb for label, size in
+            cache_config.get('max_size_per_label', {}).items()
+        }
+        return DatasetCache(self.__tasks_dir / 'dataset-cache',
+                            max_size=max_size * mb,
+                            max_size_per_label=max_size_per_label)
+
     def _set_algorithm_device_requests(self, device_requests_config: dict) \
             -> None:
         """
@@ -331,6 +394,35 @@ class DockerManager(DockerBaseManager):
         # if not, it is considered an illegal image
         return False
 
+    def is_image_allowed(self, docker_image_name: str) -> bool:
+        """
+        Check if a docker image matches the allowed algorithms of this node.
+
+        Unlike `is_docker_image_allowed`, this does not check the user and
+        organization that created a task. It is used to decide whether an
+        image may be pulled before a task that uses it is received.
+
+        Parameters
+        ----------
+        docker_image_name: str
+            uri to the docker image
+
+        Returns
+        -------
+        bool
+            Whether docker image is allowed or not
+        """
+        for patterns in (self._policies.get('allowed_algorithms'),
+                         self._allowed_images):
+            if not patterns:
+                continue
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            if not any(re.match(regex_expr, docker_image_name)
+                       for regex_expr in patterns):
+                return False
+        return True
+
     def is_running(self, result_id: int) -> bool:
         """
         Check if a container is already running for <result_id>.
@@ -364,10 +456,11 @@ class DockerManager(DockerBaseManager):
             List of information on tasks that have been killed
         """
         result_ids_killed = []
-        if self.active_tasks:
-            self.log.debug(f'Killing {len(self.active_tasks)} active task(s)')
-        while self.active_tasks:
-            task = self.active_tasks.pop()
+        with self._active_tasks_lock:
+            tasks, self.active_tasks = self.active_tasks, []
+        if tasks:
+            self.log.debug(f'Killing {len(tasks)} active task(s)')
+        for task in tasks:
             task.cleanup()
             result_ids_killed.append(KilledResult(
                 result_id=task.result_id,
@@ -404,6 +497,12 @@ class DockerManager(DockerBaseManager):
         Checks if docker task is running. If not, creates DockerTaskManager to
         run the task
 
+        This is called concurrently by the threads of the task scheduler,
+        which never start the same result twice. The state that is shared
+        between tasks is guarded by locks: the list of active tasks here, the
+        assignment of VPN ports in the `VPNManager` and the files in the
+        `DatasetCache`.
+
         Parameters
         ----------
         result_id: int
@@ -448,10 +547,12 @@ class DockerManager(DockerBaseManager):
             tasks_dir=self.__tasks_dir,
             isolated_network_mgr=self.isolated_network_mgr,
             databases=self.databases,
+            dataset_cache=self.dataset_cache,
             docker_volume_name=self.data_volume_name,
             alpine_image=self.alpine_image,
             proxy=self.proxy,
-            device_requests=self.algorithm_device_requests
+            device_requests=self.algorithm_device_requests,
+            registry_cache_ttl=self.registry_cache_ttl
         )
         database = database if (database and len(database)) else 'default'
 
@@ -479,12 +580,76 @@ class DockerManager(DockerBaseManager):
 
         # keep track of the active container
         if has_task_failed(task.status):
-            self.failed_tasks.append(task)
+            self.completed_tasks.put(task)
             return task.status, None
         else:
-            self.active_tasks.append(task)
+            with self._active_tasks_lock:
+                self.active_tasks.append(task)
+            # the container may have exited before it was registered as
+            # active, in which case its exit event has been missed
+            self._complete_if_finished(task)
             return task.status, vpn_ports
 
+    def _watch_container_events(self) -> None:
+        """
+        Listen to the docker events of the algorithm containers of this node,
+        and mark their tasks as completed when the containers exit.
+        """
+        filters = {
+            "type": "container",
+            "event": "die",
+            "label": [f"{APPNAME}-type=algorithm", f"node={self.node_name}"]
+        }
+        while True:
+            try:
+                for event in self.docker.events(decode=True, filters=filters):
+                    with self._active_tasks_lock:
+                        task = next((
+                            t for t in self.active_tasks
+                            if t.container and t.container.id == event['id']
+                        ), None)
+                    if task:
+                        self._mark_completed(task)
+            except Exception:
+                self.log.exception('Listening to docker events failed, '
+                                   'reconnecting')
+                time.sleep(1)
+
+    def _complete_if_finished(self, task: DockerTaskManager) -> None:
+        """
+        Check if the container of a task has exited, and if so, mark the
+        task as completed.
+
+        Parameters
+        ----------
+        task: DockerTaskManager
+            Task to check
+        """
+        try:
+            if task.is_finished():
+                self._mark_completed(task)
+        except AlgorithmContainerNotFound:
+            self.log.exception(f'Failed to find container for '
+                               f'result {task.result_id}')
+            self._mark_completed(task)
+
+    def _mark_completed(self, task: DockerTaskManager) -> None:
+        """
+        Move a task from the active tasks to the completed tasks. Nothing is
+        done if the task is no longer active, e.g. when it has been killed or
+        has already been marked as completed.
+
+        Parameters
+        ----------
+        task: DockerTaskManager
+            Task of which the container has exited
+        """
+        with self._active_tasks_lock:
+            if task not in self.active_tasks:
+                return
+            self.active_tasks.remove(task)
+        self.completed_tasks.put(task)
+
     def get_result(self) -> Result:
         """
         Returns the oldest (FIFO) finished docker container.
@@ -499,31 +664,25 @@ class DockerManager(DockerBaseManager):
             result of the docker image
         """
 
-        # get finished results and get the first one, if no result is available
-        # this is blocking
-        finished_tasks = []
-        while (not finished_tasks) and (not self.failed_tasks):
-            for task in self.active_tasks:
-
-                try:
-                    if task.is_finished():
-                        finished_tasks.append(task)
-                        self.active_tasks.remove(task)
-                        break
-                except AlgorithmContainerNotFound:
-                    self.log.exception(f'Failed to find container for '
-                                       f'result {task.result_id}')
-                    self.failed_tasks.append(task)
-                    self.active_tasks.remove(task)
-                    break
-
-            # sleep for a second before checking again
-            time.sleep(1)
-
-        if finished_tasks:
-            # at least one task is finished
-
-            finished_task = finished_tasks.pop()
+        # get the first completed task, if no task is available this is
+        # blocking. Multiple threads can wait for completed tasks at the same
+        # time.
+        while True:
+            try:
+                finished_task = self.completed_tasks.get(
+                    timeout=CHECK_ACTIVE_TASKS_INTERVAL
+                )
+                break
+            except queue.Empty:
+                # in case docker events have been missed, check the active
+                # containers
+                with self._active_tasks_lock:
+                    tasks = list(self.active_tasks)
+                for task in tasks:
+                    self._complete_if_finished(task)
+
+        if finished_task.status == TaskStatus.ACTIVE:
+            # the container of the task has exited
             self.log.debug(f"Result id={finished_task.result_id} is finished")
 
             # Check exit status and report
@@ -532,19 +691,17 @@ class DockerManager(DockerBaseManager):
             # Cleanup containers
             finished_task.cleanup()
 
-            # Retrieve results from file
-            results = finished_task.get_results()
-
-            # remove the VPN ports of this run from the database
-            self.client.request(
-                'port', params={'result_id': finished_task.result_id},
-                method="DELETE"
-            )
+            # The results are not read into memory here, they are streamed
+            # from the output file when they are sent to the server
+            results = b''
+            output_file = finished_task.output_file
+            # the VPN ports of this run are removed by the server when the
+            # result is reported
         else:
-            # at least one task failed to start
-            finished_task = self.failed_tasks.pop()
+            # the task failed to start or its container could not be found
             logs = 'Container failed'
             results = b''
+            output_file = None
 
         return Result(
             result_id=finished_task.result_id,
@@ -553,6 +710,7 @@ class DockerManager(DockerBaseManager):
             data=results,
             status=finished_task.status,
             parent_id=finished_task.parent_id,
+            output_file=output_file,
         )
 
     def login_to_registries(self, registries: list = []) -> None:
@@ -627,14 +785,16 @@ class DockerManager(DockerBaseManager):
             if container_to_kill['organization_id'] != org_id:
                 continue  # this result is on another node
             # find the task
-            task = next((
-                t for t in self.active_tasks
-                if t.result_id == container_to_kill['result_id']
-            ), None)
+            with self._active_tasks_lock:
+                task = next((
+                    t for t in self.active_tasks
+                    if t.result_id == container_to_kill['result_id']
+                ), None)
+                if task:
+                    self.active_tasks.remove(task)
             if task:
                 self.log.info(
                     f"Killing containers for result_id={task.result_id}")
-                self.active_tasks.remove(task)
                 task.cleanup()
                 killed_list.append(KilledResult(
                     result_id=task.result_id,
@@ -0,0 +1,110 @@
+"""
+Background pulling of algorithm images.
+
+Algorithm images are normally pulled when a task that uses them is started,
+which delays the start of the task. The `ImagePrefetcher` pulls images
+before they are needed: when a task is created in the collaboration (so that
+the image is available once subtasks are sent to this node), and
+periodically for the images on a watch-list.
+"""
+import logging
+import queue
+import threading
+import time
+
+from typing import Callable
+
+from docker.client import DockerClient
+
+from vantage6.common import logger_name
+from vantage6.common.docker.addons import pull_if_newer
+from vantage6.common.globals import REGISTRY_CACHE_TTL_SECONDS
+from vantage6.node.globals import (
+    DEFAULT_MAX_CONCURRENT_PULLS, IMAGE_WATCH_INTERVAL_SECONDS
+)
+
+
+class ImagePrefetcher:
+    """
+    Pull images in the background, using a limited number of threads so that
+    prefetching does not use all bandwidth of the node.
+
+    Parameters
+    ----------
+    docker_client: DockerClient
+        Docker client used to pull the images
+    is_allowed: Callable[[str], bool]
+        Function that checks whether an image is allowed on this node. Images
+        that are not allowed are never pulled.
+    max_concurrent_pulls: int, optional
+        Number of images that are pulled at the same time
+    watch_list: list[str], optional
+        Images that are periodically updated
+    watch_interval: float, optional
+        Number of seconds between updates of the images on the watch-list
+    registry_cache_ttl: float, optional
+        Number of seconds the metadata of the images in the registry is reused
+    """
+
+    def __init__(
+        self, docker_client: DockerClient, is_allowed: Callable[[str], bool],
+        max_concurrent_pulls: int = DEFAULT_MAX_CONCURRENT_PULLS,
+        watch_list: list[str] = None,
+        watch_interval: float = IMAGE_WATCH_INTERVAL_SECONDS,
+        registry_cache_ttl: float = REGISTRY_CACHE_TTL_SECONDS
+    ) -> None:
+        self.log = logging.getLogger(logger_name(__name__))
+        self.docker = docker_client
+        self.is_allowed = is_allowed
+        self.watch_list = watch_list or []
+        self.watch_interval = watch_interval
+        self.registry_cache_ttl = registry_cache_ttl
+
+        self._queue = queue.Queue()
+        # images that are queued or being pulled
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+
+        for _ in range(max(1, max_concurrent_pulls)):
+            threading.Thread(target=self._worker, daemon=True).start()
+        if self.watch_list:
+            threading.Thread(target=self._watch, daemon=True).start()
+
+    def prefetch(self, image: str) -> None:
+        """
+        Pull an image in the background, if it is allowed and not already
+        being pulled.
+
+        Parameters
+        ----------
+        image: str
+            Image to pull
+        """
+        if not image or not self.is_allowed(image):
+            return
+        with self._lock:
+            if image in self._pending:
+                return
+            self._pending.add(image)
+        self.log.debug(f"Prefetching image {image}")
+        self._queue.put(image)
+
+    def _worker(self) -> None:
+        while True:
+            image = self._queue.get()
+            try:
+                pull_if_newer(self.docker, image, self.log,
+                              cache_ttl=self.registry_cache_ttl)
+            except Exception as e:
+                # the image is pulled again when a task is started
+                self.log.warning(f"Could not prefetch image {image}")
+                self.log.debug(e)
+            finally:
+                with self._lock:
+                    self._pending.discard(image)
+
+    def _watch(self) -> None:
+        while True:
+            for image in self.watch_list:
+                self.prefetch(image)
+            time.sleep(self.watch_interval)
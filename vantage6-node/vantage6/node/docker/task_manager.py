@@ -8,7 +8,7 @@ import json
 
 from pathlib import Path
 
-from vantage6.common.globals import APPNAME
+from vantage6.common.globals import APPNAME, REGISTRY_CACHE_TTL_SECONDS
 from vantage6.common.docker.addons import (
     remove_container_if_exists, remove_container, pull_if_newer,
     running_in_docker
@@ -19,6 +19,7 @@ from vantage6.node.util import get_parent_id
 from vantage6.node.globals import ALPINE_IMAGE
 from vantage6.node.docker.vpn_manager import VPNManager
 from vantage6.node.docker.squid import Squid
+from vantage6.node.dataset_cache import DatasetCache
 from vantage6.node.docker.docker_base import DockerBaseManager
 from vantage6.node.docker.exceptions import (
     UnknownAlgorithmStartFail,
@@ -41,8 +42,10 @@ class DockerTaskManager(DockerBaseManager):
                  result_id: int, task_info: dict, tasks_dir: Path,
                  isolated_network_mgr: NetworkManager,
                  databases: dict, docker_volume_name: str,
+                 dataset_cache: DatasetCache | None = None,
                  alpine_image: str | None = None, proxy: Squid | None = None,
-                 device_requests: list | None = None):
+                 device_requests: list | None = None,
+                 registry_cache_ttl: float = REGISTRY_CACHE_TTL_SECONDS):
         """
         Initialization creates DockerTaskManager instance
 
@@ -66,11 +69,17 @@ class DockerTaskManager(DockerBaseManager):
             List of databases
         docker_volume_name: str
             Name of the docker volume
+        dataset_cache: DatasetCache | None
+            Cache of converted file-based databases. If None, databases are
+            not converted.
         alpine_image: str | None
             Name of alternative Alpine image to be used
         device_requests: list | None
             List of DeviceRequest objects to be passed to the algorithm
             container
+        registry_cache_ttl: float
+            Number of seconds the metadata of the image in the registry is
+            reused before it is retrieved again
         """
         self.task_id = task_info['id']
         self.log = logging.getLogger(f"task ({self.task_id})")
@@ -82,11 +91,13 @@ class DockerTaskManager(DockerBaseManager):
         self.parent_id = get_parent_id(task_info)
         self.__tasks_dir = tasks_dir
         self.databases = databases
+        self.dataset_cache = dataset_cache
         self.data_volume_name = docker_volume_name
         self.node_name = node_name
         self.alpine_image = ALPINE_IMAGE if alpine_image is None \
             else alpine_image
         self.proxy = proxy
+        self.registry_cache_ttl = registry_cache_ttl
 
         self.container = None
         self.status_code = None
@@ -145,7 +156,10 @@ class DockerTaskManager(DockerBaseManager):
         """
         logs = self.container.logs().decode('utf8')
 
-        # report if the container has a different status than 0
+        # report if the container has a different status than 0. The
+        # container is reloaded as its state may have changed since it was
+        # last retrieved
+        self.container.reload()
         self.status_code = self.container.attrs["State"]["ExitCode"]
         if self.status_code:
             self.log.error(f"Received non-zero exitcode: {self.status_code}")
@@ -156,24 +170,12 @@ class DockerTaskManager(DockerBaseManager):
             self.status = TaskStatus.COMPLETED
         return logs
 
-    def get_results(self) -> bytes:
-        """
-        Read results output file of the algorithm container
-
-        Returns
-        -------
-        bytes:
-            Results of the algorithm container
-        """
-        with open(self.output_file, "rb") as fp:
-            results = fp.read()
-        return results
-
     def pull(self):
         """ Pull the latest docker image. """
         try:
             self.log.info(f"Retrieving latest image: '{self.image}'")
-            pull_if_newer(self.docker, self.image, self.log)
+            pull_if_newer(self.docker, self.image, self.log,
+                          cache_ttl=self.registry_cache_ttl)
 
         except docker.errors.APIError as e:
             self.log.debug('Failed to pull image: could not find image')
@@ -501,6 +503,21 @@ class DockerTaskManager(DockerBaseManager):
             db_labels.append(label)
         environment_variables['DB_LABELS'] = json.dumps(db_labels)
 
+        # only the requested database is cached. It is converted in the
+        # background when it is not cached yet, in which case the algorithm
+        # reads the source file
+        if self.dataset_cache and database in self.databases:
+            cache_file = self.dataset_cache.get(
+                database, self.databases[database]
+            )
+            if cache_file:
+                environment_variables[
+                    f'{database.upper()}_DATABASE_CACHE_URI'
+                ] = (
+                    f"{self.data_folder}/"
+                    f"{cache_file.relative_to(self.__tasks_dir).as_posix()}"
+                )
+
         # Support legacy algorithms
         # TODO remove in v4+
         try:
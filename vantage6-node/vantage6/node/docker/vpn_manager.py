@@ -3,6 +3,7 @@ import logging
 import json
 import time
 import ipaddress
+import threading
 
 from json.decoder import JSONDecodeError
 from docker.models.containers import Container
@@ -66,6 +67,11 @@ class VPNManager(DockerBaseManager):
         self.network_config_image = NETWORK_CONFIG_IMAGE \
             if not network_config_image else network_config_image
 
+        # tasks are started by multiple threads. Finding free ports and
+        # claiming them must not be interleaved, or two algorithms could be
+        # assigned the same port
+        self._port_lock = threading.Lock()
+
         self._update_images()
 
         self.log.debug('Used VPN images:')
@@ -358,6 +364,30 @@ class VPNManager(DockerBaseManager):
         self.log.debug("Finding exposed ports of algorithm container")
         ports = self._find_exposed_ports(algo_image_name)
 
+        with self._port_lock:
+            return self._assign_vpn_ports(ports, algo_ip)
+
+    def _assign_vpn_ports(self, ports: list[dict], algo_ip: str
+                          ) -> list[dict]:
+        """
+        Assign free ports on the VPN client to the ports of an algorithm
+        container, and forward the traffic on them to the algorithm.
+
+        This should be called while holding `_port_lock`.
+
+        Parameters
+        ----------
+        ports: list[dict]
+            Exposed ports of the algorithm container
+        algo_ip: str
+            IP address of the algorithm container in the isolated network
+
+        Returns
+        -------
+        list[dict]
+            Description of each port on the VPN client that forwards traffic to
+            the algo container
+        """
         # Find ports on VPN container that are already occupied
         cmd = (
             'sh -c '
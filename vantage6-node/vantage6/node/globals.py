@@ -50,5 +50,34 @@ SSH_TUNNEL_IMAGE = "harbor2.vantage6.ai/infrastructure/ssh-tunnel"
 #
 SQUID_IMAGE = "harbor2.vantage6.ai/infrastructure/squid"
 
+# Algorithm containers that exit are detected through docker events. In case
+# events are missed (e.g. when the docker daemon restarts), the running
+# containers are also checked at this interval (in seconds)
+CHECK_ACTIVE_TASKS_INTERVAL = 60
+
+# number of threads that send finished results to the server concurrently
+NUMBER_OF_SPEAKING_WORKERS = 4
+
+# default number of tasks that are started concurrently. This can be changed
+# in the `task_scheduler` section of the node configuration file.
+DEFAULT_MAX_CONCURRENT_TASK_STARTS = 4
+
+# default number of images that are prefetched at the same time, and the
+# interval (in seconds) at which the images on the watch-list are updated.
+# These can be changed in the `image_prefetch` section of the node
+# configuration file.
+DEFAULT_MAX_CONCURRENT_PULLS = 1
+IMAGE_WATCH_INTERVAL_SECONDS = 60 * 60
+
+# maximum size (in bytes) of the decrypted results that the proxy server keeps
+# in memory, so that algorithms that poll for results do not decrypt the same
+# results over and over again
+DECRYPTED_RESULT_CACHE_SIZE = 64 * 1024 * 1024
+
+# default maximum size (in MB) of the files in the dataset cache, in which
+# the node stores file-based databases converted to a columnar format. This
+# can be changed in the `dataset_cache` section of the node configuration file.
+DEFAULT_DATASET_CACHE_SIZE_MB = 10 * 1024
+
 # start trying to refresh the JWT token 10 minutes before it expires.
 REFRESH_BEFORE_EXPIRES_SECONDS = 600
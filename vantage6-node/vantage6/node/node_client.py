@@ -6,6 +6,7 @@ import jwt
 import datetime
 import time
 
+from pathlib import Path
 from threading import Thread
 
 from vantage6.common import WhoAmI
@@ -152,6 +153,24 @@ class NodeClient(ClientBase):
             node_id=self.whoami.id_
         )
 
+    def decrypt_result(self, result: dict) -> dict:
+        """
+        Decrypt the input and result of a result that was not obtained via
+        `get_results`, e.g. because it was sent along with a socket event.
+
+        Parameters
+        ----------
+        result : dict
+            The result, which is decrypted in-place
+
+        Returns
+        -------
+        dict
+            The decrypted result
+        """
+        self._decrypt_result(result)
+        return result
+
     def is_encrypted_collaboration(self) -> bool:
         """
         Check whether the encryption is enabled.
@@ -186,7 +205,8 @@ class NodeClient(ClientBase):
         })
 
     def patch_results(self, id_: int, result: dict,
-                      init_org_id: int = None) -> None:
+                      init_org_id: int = None,
+                      result_file: str | Path = None) -> None:
         """
         Update the results at the central server.
 
@@ -203,23 +223,38 @@ class NodeClient(ClientBase):
             Organization id of the origin of the task. This is required
             when the result dict includes results, because then results have
             to be encrypted specifically for them
+        result_file: str | Path, optional
+            File containing the output of the algorithm. If provided, it is
+            encrypted in chunks and uploaded as binary data, so that large
+            results do not have to be kept in memory.
+
+        Raises
+        ------
+        requests.HTTPError
+            If the result file could not be uploaded. The other fields are
+            not patched in that case.
         """
         # TODO: the key `result` is not always present, e.g. when
         #     only the timestamps are updated
-        # FIXME: public keys should be cached
+        if result_file:
+            # the result is sent as binary data before the other fields, as
+            # the result can no longer be updated once it is finished
+            try:
+                with open(result_file, "rb") as fp:
+                    self.upload_payload(id_, fp, init_org_id, field='result')
+            except Exception:
+                self.log.error(f"Could not upload the result of run {id_}, "
+                               "so it is not marked as finished")
+                raise
+
         if "result" in result:
             if not init_org_id:
                 self.log.critical(
                     "Organization id is not provided: cannot send results to "
                     "server as they cannot be encrypted")
-            msg = f"Retrieving public key from organization={init_org_id}"
-            self.log.debug(msg)
 
-            org = self.request(f"organization/{init_org_id}")
-            public_key = None
-            try:
-                public_key = org["public_key"]
-            except KeyError:
+            public_key = self.public_keys.get(init_org_id)
+            if not public_key:
                 self.log.critical('Public key could not be retrieved...')
                 self.log.critical('Does the initiating organization belong to '
                                   'your organization?')
@@ -6,16 +6,25 @@ methods to handle tasks and results, including their encryption and decryption.
 (!) Not to be confused with the squid proxy that allows algorithm containers
 to access other places in the network.
 """
+import io
 import requests
 import logging
+import tempfile
+import time
 
 from http import HTTPStatus
 from requests import Response
 
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, send_file
+from gevent import get_hub, sleep
+from gevent.threadpool import ThreadPool
 
 from vantage6.common import bytes_to_base64s, base64s_to_bytes, logger_name
+from vantage6.common.task_status import has_task_failed
+from vantage6.common.http_session import create_http_session
 from vantage6.node.node_client import NodeClient
+from vantage6.node.result_cache import DecryptedResultCache
+from vantage6.node.task_status_notifier import TaskStatusNotifier
 
 # Initialize FLASK
 app = Flask(__name__)
@@ -23,11 +32,58 @@ log = logging.getLogger(logger_name(__name__))
 
 # Need to be set when the proxy server is initialized
 app.config["SERVER_IO"] = None
+app.config["TASK_STATUS_NOTIFIER"] = None
 server_url = None
 
 # Number of times the request is retried before the proxy server gives up
 RETRY = 3
 
+# Connection pool to the central server, shared by all requests that the
+# algorithm containers make. Retries are done by `make_request`, so the
+# session itself does not retry.
+session = create_http_session(max_retries=0)
+
+# Decrypted results, so that algorithms that poll for the results of their
+# subtasks do not decrypt the same results on every poll
+result_cache = DecryptedResultCache()
+
+# Default and maximum number of seconds that a request to wait for the
+# results of a task is kept open. While waiting, the results are retrieved
+# from the server when the node is notified of a status change of the task,
+# and at least every WAIT_RECHECK_INTERVAL seconds in case a notification
+# was missed.
+DEFAULT_WAIT_TIMEOUT = 30
+MAX_WAIT_TIMEOUT = 300
+WAIT_RECHECK_INTERVAL = 10
+
+# Maximum number of public keys that are retrieved (and inputs that are
+# encrypted) at the same time when an algorithm creates a subtask, and the
+# number of results that are decrypted at the same time
+MAX_CONCURRENT_ENCRYPTIONS = 8
+_encryption_pool: ThreadPool = None
+
+
+def get_encryption_pool() -> ThreadPool:
+    """
+    Obtain the pool of threads used to retrieve public keys, encrypt task
+    inputs and decrypt results.
+
+    The proxy server does not monkey patch the standard library, so blocking
+    calls in a greenlet block all other requests. Running them in the
+    threadpool lets the other greenlets continue in the meantime. A gevent
+    threadpool belongs to the hub of the thread that created it, so the pool
+    is created by the thread that runs the proxy server.
+
+    Returns
+    -------
+    ThreadPool
+        Threadpool of the current gevent hub
+    """
+    global _encryption_pool
+    if _encryption_pool is None or _encryption_pool.hub is not get_hub():
+        _encryption_pool = ThreadPool(MAX_CONCURRENT_ENCRYPTIONS)
+    return _encryption_pool
+
 
 def get_method(method: str) -> callable:
     """
@@ -46,14 +102,14 @@ def get_method(method: str) -> callable:
     method_name: str = method.lower()
 
     loopup = {
-        "get": requests.get,
-        "post": requests.post,
-        "patch": requests.patch,
-        "put": requests.put,
-        "delete": requests.delete
+        "get": session.get,
+        "post": session.post,
+        "patch": session.patch,
+        "put": session.put,
+        "delete": session.delete
     }
 
-    return loopup.get(method_name, requests.get)
+    return loopup.get(method_name, session.get)
 
 
 def make_proxied_request(endpoint: str) -> Response:
@@ -102,6 +158,7 @@ def make_request(method: str, endpoint: str, json: dict = None,
         Response from the vantage6 server
     """
 
+    method_name = method
     method = get_method(method)
 
     # Forward the request to the central server. Retry when an exception is
@@ -118,7 +175,7 @@ def make_request(method: str, endpoint: str, json: dict = None,
             if response.status_code > 210:
                 log.warn('Proxy server received status code:'
                          f'{response.status_code}')
-                log.debug(f'method: {request.method}, url: {url}, json: {json}'
+                log.debug(f'method: {method_name}, url: {url}, json: {json}'
                           f', params: {params}, headers: {headers}')
                 if 'application/json' in response.headers.get('Content-Type'):
                     log.debug(response.json().get("msg", "no description..."))
@@ -136,34 +193,100 @@ def make_request(method: str, endpoint: str, json: dict = None,
     raise Exception("Proxy request failed")
 
 
-def decrypt_result(result: dict) -> dict:
+def download_result(result_id: int, headers: dict | None) -> str:
+    """
+    Download and decrypt the result of a run that the server did not include
+    in a list of results.
+
+    The server does not include payloads that are stored in its blob store
+    when it returns multiple results, but only their size and digest. These
+    are downloaded from the binary payload endpoint and decrypted in chunks.
+
+    Parameters
+    ----------
+    result_id: int
+        Id of the result
+    headers: dict | None
+        Headers (with the token of the algorithm) to send to the server
+
+    Returns
+    -------
+    str
+        The decrypted result, base64 encoded
+
+    Raises
+    ------
+    requests.HTTPError
+        If the server does not return the result
+    """
+    client: NodeClient = app.config.get('SERVER_IO')
+    decrypted = io.BytesIO()
+    with session.get(f"{server_url}/result/{result_id}/result",
+                     headers=headers, stream=True) as response:
+        if response.status_code != HTTPStatus.OK:
+            raise requests.HTTPError(
+                f"Could not retrieve the result of run {result_id}: "
+                f"{response.status_code}", response=response
+            )
+        response.raw.decode_content = True
+        client.cryptor.decrypt_stream(response.raw, decrypted, binary=True)
+    return bytes_to_base64s(decrypted.getvalue())
+
+
+def decrypt_result(result: dict, headers: dict | None = None) -> dict:
     """
     Decrypt the `result` from a result dictonary
 
+    Decrypted results are kept in the `result_cache`, keyed by the digest of
+    the encrypted result, so that each result is only decrypted once. Results
+    that the server did not include because they are stored in its blob
+    store are only downloaded when they are not in the cache.
+
     Parameters
     ----------
     result: dict
         Result dict
+    headers: dict | None
+        Headers (with the token of the algorithm) to send to the server when
+        the result has to be downloaded
 
     Returns
     -------
     dict
         Result dict with the `result` decrypted
+
+    Raises
+    ------
+    requests.HTTPError
+        If the result has to be downloaded and the server does not return it
     """
     client: NodeClient = app.config.get('SERVER_IO')
 
     # if the result is a None, there is no need to decrypt that..
-    try:
-        if result['result']:
-            result["result"] = bytes_to_base64s(
-                client.cryptor.decrypt_str_to_bytes(
-                    result["result"]
+    encrypted = result.get('result')
+    missing = encrypted is None and bool(result.get('result_size'))
+    if not encrypted and not missing:
+        return result
+
+    digest = result.get('result_digest') or \
+        (DecryptedResultCache.digest(encrypted) if encrypted else None)
+    decrypted = result_cache.get(result.get('id'), digest) if digest \
+        else None
+    if decrypted is None:
+        if missing:
+            decrypted = download_result(result['id'], headers)
+        else:
+            try:
+                decrypted = bytes_to_base64s(
+                    client.cryptor.decrypt_str_to_bytes(encrypted)
                 )
-            )
-    except Exception:
-        log.exception("Unable to decrypt and/or decode results, sending them "
-                      "to the algorithm...")
-
+            except Exception:
+                log.exception("Unable to decrypt and/or decode results, "
+                              "sending them to the algorithm...")
+                return result
+        if digest:
+            result_cache.put(result.get('id'), digest, decrypted)
+    result["result"] = decrypted
     return result
 
 
@@ -222,59 +345,90 @@ def proxy_task():
 
     log.debug(f"{len(organizations)} organizations")
 
-    # For every organization we need to encrypt the input field. This is done
-    # in parallel as the client (algorithm) is waiting for a timely response.
-    # For every organizationn the public key is retrieved an the input is
-    # encrypted specifically for them.
-    def encrypt_input(organization: dict) -> dict:
+    # For every organization we need to encrypt the input field. Algorithms
+    # often send the same input to all organizations, in which case the input
+    # is encrypted only once and the shared key is wrapped for each of the
+    # organizations that receive that input. The public keys are obtained from
+    # the cache of the node. Both the retrieval of the keys and the
+    # encryption are done in parallel.
+    timings = {}
+
+    def encrypt_inputs(organizations: list[dict]) -> list[dict]:
         """
-        Encrypt the input for a specific organization by using its private key.
-        This method is run as background
+        Encrypt the input for the organizations by using their public keys.
 
         Parameters
         ----------
-        organization : dict
+        organizations : list[dict]
             Input as specified by the client (algorithm in this case)
 
         Returns
         -------
-        dict
-            Modified organization dictionary in which the `input` key is
+        list[dict]
+            Modified organization dictionaries in which the `input` key
             contains encrypted input
         """
-        input_ = organization.get("input", {})
-        organization_id = organization.get("id")
-
-        # retrieve public key of the organization
-        log.debug(f"Retrieving public key of org: {organization_id}")
-        response = make_request('get', f'organization/{organization_id}',
-                                headers=headers)
-        public_key = response.json().get("public_key")
-
-        # Encrypt the input field
-        client: NodeClient = app.config.get("SERVER_IO")
-        organization["input"] = client.cryptor.encrypt_bytes_to_str(
-            base64s_to_bytes(input_),
-            public_key
-        )
+        pool = get_encryption_pool()
+
+        start = time.perf_counter()
+        organization_ids = list({o.get("id") for o in organizations})
+        # retrieve the keys of all organizations in the collaboration at once
+        # if any of them is not cached. Keys that are still missing after
+        # that are retrieved per organization.
+        if client.public_keys.uncached(organization_ids):
+            try:
+                client.public_keys.prefetch(client.collaboration_id)
+            except Exception:
+                log.warning('Could not retrieve the public keys of the '
+                            'collaboration, retrieving them per organization')
+        public_keys = dict(zip(
+            organization_ids,
+            pool.map(client.public_keys.get, organization_ids)
+        ))
+        timings['keys'] = time.perf_counter() - start
+
+        groups: dict[str, list[dict]] = {}
+        for organization in organizations:
+            groups.setdefault(organization.get("input", ""), []).append(
+                organization)
+
+        def encrypt_group(input_: str, group: list[dict]) -> None:
+            encrypted_input = client.cryptor.encrypt_bytes_to_str_multi(
+                base64s_to_bytes(input_),
+                [public_keys[o.get("id")] for o in group]
+            )
+            for organization in group:
+                organization["input"] = encrypted_input
+
+            log.debug("Input succesfully encrypted for organizations "
+                      f"{[o.get('id') for o in group]}!")
 
-        log.debug("Input succesfully encrypted for organization "
-                  f"{organization_id}!")
-        return organization
+        start = time.perf_counter()
+        pool.map(lambda item: encrypt_group(*item), groups.items())
+        timings['encryption'] = time.perf_counter() - start
+        return organizations
 
     if client.is_encrypted_collaboration():
 
         log.debug("Applying end-to-end encryption")
-        data["organizations"] = [encrypt_input(o) for o in organizations]
+        data["organizations"] = encrypt_inputs(organizations)
 
     # Attempt to send the task to the central server
+    start = time.perf_counter()
     try:
         response = make_request('post', 'task', data, headers=headers)
     except Exception:
         log.exception('post task failed')
         return {'msg': 'Request failed, see node logs'},\
             HTTPStatus.INTERNAL_SERVER_ERROR
-
+    timings['post'] = time.perf_counter() - start
+
+    log.info(
+        f"Created subtask for {len(organizations)} organization(s) in "
+        f"{sum(timings.values()):.3f}s ("
+        + ", ".join(f"{step}: {t:.3f}s" for step, t in timings.items())
+        + ")"
+    )
     return response.json(), HTTPStatus.OK
 
 
@@ -308,16 +462,100 @@ def proxy_task_result(id: int) -> Response:
             HTTPStatus.INTERNAL_SERVER_ERROR
 
     # Attempt to decrypt the results. The enpoint should have returned
-    # a list of results
-    unencrypted = []
+    # a list of results, which are downloaded (if not included) and
+    # decrypted in parallel
     results = get_response_json_and_handle_exceptions(response)
-    for result in results:
-        result = decrypt_result(result)
-        unencrypted.append(result)
+    headers = {'Authorization': request.headers.get('Authorization')}
+    try:
+        unencrypted = get_encryption_pool().map(
+            lambda result: decrypt_result(result, headers), results
+        )
+    except Exception:
+        log.exception(f'Error retrieving the results of task {id}')
+        return {'msg': 'Request failed, see node logs'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
 
     return jsonify(unencrypted), HTTPStatus.OK
 
 
+@app.route('/task/<int:id>/result/wait', methods=["GET"])
+def proxy_wait_for_task_result(id: int) -> Response:
+    """
+    Wait until all results of a task are finished, and return them decrypted.
+
+    Instead of polling the server, the request is kept open until the node
+    is notified (through the websocket connection) that the runs of the task
+    have finished, or until the timeout expires. In the latter case the
+    results are returned as they are, and the algorithm should wait again.
+
+    Parameters
+    ----------
+    id : int
+        Task id from which the results need to be obtained
+
+    Returns
+    -------
+    requests.Response
+        Decrypted results of the task
+    """
+    client: NodeClient = app.config.get("SERVER_IO")
+    notifier: TaskStatusNotifier = app.config.get("TASK_STATUS_NOTIFIER")
+    if not client or not notifier:
+        return {'msg': 'Proxy server not initialized properly'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+
+    try:
+        timeout = min(
+            float(request.args.get('timeout', DEFAULT_WAIT_TIMEOUT)),
+            MAX_WAIT_TIMEOUT
+        )
+    except ValueError:
+        return {'msg': 'Timeout should be a number'}, HTTPStatus.BAD_REQUEST
+
+    headers = {'Authorization': request.headers.get('Authorization')}
+    deadline = time.monotonic() + timeout
+    while True:
+        # the version is obtained before the results, so that changes that
+        # happen while the results are retrieved are not missed
+        version = notifier.version(id)
+        try:
+            response = make_request('get', f"task/{id}/result",
+                                    headers=headers)
+        except Exception:
+            log.exception(f'Error on /task/{id}/result/wait')
+            return {'msg': 'Request failed, see node logs'},\
+                HTTPStatus.INTERNAL_SERVER_ERROR
+        results = get_response_json_and_handle_exceptions(response)
+        if results is None:
+            return {'msg': 'Request failed, see node logs'},\
+                HTTPStatus.INTERNAL_SERVER_ERROR
+
+        # runs that crashed or were killed will not produce a result
+        finished = all(
+            r.get('finished_at') or
+            (r.get('status') and has_task_failed(r['status']))
+            for r in results
+        )
+        if finished or time.monotonic() >= deadline:
+            break
+
+        # wait for a notification without blocking the other greenlets
+        recheck_at = min(deadline, time.monotonic() + WAIT_RECHECK_INTERVAL)
+        while notifier.version(id) == version and \
+                time.monotonic() < recheck_at:
+            sleep(0.1)
+
+    try:
+        unencrypted = get_encryption_pool().map(
+            lambda result: decrypt_result(result, headers), results
+        )
+    except Exception:
+        log.exception(f'Error retrieving the results of task {id}')
+        return {'msg': 'Request failed, see node logs'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+    return jsonify(unencrypted), HTTPStatus.OK
+
+
 @app.route('/result/<int:id>', methods=["GET"])
 def proxy_results(id: int) -> Response:
     """
@@ -355,6 +593,96 @@ def proxy_results(id: int) -> Response:
     return result, HTTPStatus.OK
 
 
+@app.route('/result/<int:id>/<any(input, result):field>', methods=["GET"])
+def proxy_result_payload(id: int, field: str) -> Response:
+    """
+    Obtain and decrypt the input or result of a result as binary data. The
+    payload is decrypted in chunks and returned unencrypted to the algorithm.
+
+    Parameters
+    ----------
+    id : int
+        Id of the result
+    field : str
+        Either 'input' or 'result'
+
+    Returns
+    -------
+    flask.Response
+        The decrypted payload
+    """
+    client: NodeClient = app.config.get("SERVER_IO")
+    if not client:
+        return {'msg': 'Proxy server not initialized properly'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+
+    url = f"{server_url}/result/{id}/{field}"
+    headers = {'Authorization': request.headers.get('Authorization')}
+    decrypted = tempfile.TemporaryFile()
+    try:
+        with session.get(url, headers=headers, stream=True) as response:
+            if response.status_code > 210:
+                decrypted.close()
+                return response.content, response.status_code, \
+                    response.headers.items()
+            response.raw.decode_content = True
+            client.cryptor.decrypt_stream(response.raw, decrypted,
+                                          binary=True)
+    except Exception:
+        decrypted.close()
+        log.exception(f'Error on /result/{id}/{field}')
+        return {'msg': 'Request failed, see node logs...'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+
+    decrypted.seek(0)
+    return send_file(decrypted, mimetype='application/octet-stream')
+
+
+@app.route('/result/<int:id>/input', methods=["PUT"])
+def proxy_result_input(id: int) -> Response:
+    """
+    Encrypt the binary input of a result for the organization that executes
+    it, and upload it to the vantage6 server.
+
+    Parameters
+    ----------
+    id : int
+        Id of the result
+
+    Returns
+    -------
+    requests.Response
+        Response from the vantage6 server
+    """
+    client: NodeClient = app.config.get("SERVER_IO")
+    if not client:
+        return {'msg': 'Proxy server not initialized properly'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+
+    headers = {'Authorization': request.headers.get('Authorization')}
+    try:
+        response = make_request('get', f'result/{id}', headers=headers)
+        organization_id = response.json().get("organization").get("id")
+
+        with tempfile.TemporaryFile() as encrypted:
+            client.cryptor.encrypt_stream(
+                request.stream, encrypted,
+                client.public_keys.get(organization_id), binary=True
+            )
+            encrypted.seek(0)
+            response = session.put(
+                f"{server_url}/result/{id}/input", data=encrypted,
+                headers={**headers,
+                         'Content-Type': 'application/octet-stream'}
+            )
+    except Exception:
+        log.exception(f'Error on /result/{id}/input')
+        return {'msg': 'Request failed, see node logs...'},\
+            HTTPStatus.INTERNAL_SERVER_ERROR
+
+    return response.content, response.status_code, response.headers.items()
+
+
 @app.route('/<path:central_server_path>', methods=["GET", "POST", "PATCH",
                                                    "PUT", "DELETE"])
 def proxy(central_server_path: str) -> Response:
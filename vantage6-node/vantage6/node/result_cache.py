@@ -0,0 +1,112 @@
+"""
+Cache of decrypted results for the proxy server.
+
+Master algorithms often poll the results of their subtasks until all of them
+are finished. Without a cache, each poll decrypts all results that are
+already finished again. The cache is keyed by the result id and the digest
+of the encrypted result, so that a result that changes on the server is never
+served from the cache. The server includes this digest in the results it
+returns, so a cached result is found without retrieving the encrypted result
+itself.
+"""
+import hashlib
+import threading
+
+from collections import OrderedDict
+
+from vantage6.node.globals import DECRYPTED_RESULT_CACHE_SIZE
+
+
+class DecryptedResultCache:
+    """
+    Thread safe, memory bounded cache of decrypted results. When the cache
+    is full, the least recently used results are evicted.
+
+    Parameters
+    ----------
+    max_size: int, optional
+        Maximum total size (in bytes) of the decrypted results in the cache
+    """
+
+    def __init__(self, max_size: int = DECRYPTED_RESULT_CACHE_SIZE) -> None:
+        self.max_size = max_size
+        self.size = 0
+
+        # (result id, digest of encrypted result) -> decrypted result
+        self._results: OrderedDict[tuple[int, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(encrypted: str) -> str:
+        """
+        Compute the digest of an encrypted result, for results of which the
+        server does not report the digest.
+
+        Parameters
+        ----------
+        encrypted: str
+            Encrypted result, as received from the server
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-256 digest of the encrypted result
+        """
+        return hashlib.sha256(encrypted.encode()).hexdigest()
+
+    def get(self, result_id: int, digest: str) -> str | None:
+        """
+        Get a decrypted result from the cache.
+
+        Parameters
+        ----------
+        result_id: int
+            Id of the result
+        digest: str
+            Digest of the encrypted result
+
+        Returns
+        -------
+        str | None
+            The decrypted result, or None if it is not in the cache
+        """
+        key = (result_id, digest)
+        with self._lock:
+            decrypted = self._results.get(key)
+            if decrypted is not None:
+                self._results.move_to_end(key)
+            return decrypted
+
+    def put(self, result_id: int, digest: str, decrypted: str) -> None:
+        """
+        Add a decrypted result to the cache.
+
+        Results that are larger than the cache are not stored.
+
+        Parameters
+        ----------
+        result_id: int
+            Id of the result
+        digest: str
+            Digest of the encrypted result
+        decrypted: str
+            Decrypted result
+        """
+        if len(decrypted) > self.max_size:
+            return
+        key = (result_id, digest)
+        with self._lock:
+            previous = self._results.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._results[key] = decrypted
+            self.size += len(decrypted)
+            while self.size > self.max_size:
+                _, evicted = self._results.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """ Remove all results from the cache. """
+        with self._lock:
+            self._results.clear()
+            self.size = 0
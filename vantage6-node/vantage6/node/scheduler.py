@@ -0,0 +1,241 @@
+"""
+Scheduling of the tasks that the node receives from the server.
+
+Tasks are started by a pool of worker threads, so that a slow start (e.g.
+pulling a large image) does not delay the start of other tasks. Subtasks are
+started before other tasks, as their parent task is already running and
+waiting for them.
+
+The number of tasks that run concurrently can be limited in total, per
+algorithm image and per database. A task occupies a slot until it is released,
+which the node does when the container of the task has exited or is killed.
+Subtasks are exempt from these limits: their parent tasks occupy a slot while
+waiting for them, so limiting the subtasks as well could cause a deadlock.
+
+The worker threads only limit how many tasks are *started* at the same time.
+Starting tasks concurrently is safe, as `DockerManager.run` guards the state
+that is shared between tasks.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from collections import deque
+from typing import Callable
+
+from vantage6.common import logger_name
+from vantage6.common.task_status import has_task_failed
+from vantage6.node.globals import DEFAULT_MAX_CONCURRENT_TASK_STARTS
+from vantage6.node.util import get_parent_id
+
+
+class _QueuedTask:
+    """ A task that is waiting to be started. """
+
+    def __init__(self, task_result: dict, sequence: int) -> None:
+        self.task_result = task_result
+        task = task_result['task']
+        self.result_id = task_result['id']
+        self.image = task['image']
+        self.database = task.get('database', 'default')
+        self.is_subtask = get_parent_id(task) is not None
+        self.queued_at = time.monotonic()
+        # subtasks first, then first in first out
+        self.priority = (0 if self.is_subtask else 1, sequence)
+
+
+class TaskScheduler:
+    """
+    Start tasks using a pool of worker threads, respecting the configured
+    concurrency limits.
+
+    A task occupies a slot from the moment it is started until it is released
+    with `release()`, which should be done when its results have been sent to
+    the server or when it is killed.
+
+    Parameters
+    ----------
+    start_task: Callable[[dict], str]
+        Function that starts a task and returns its status
+    max_concurrent_starts: int, optional
+        Number of tasks that can be started at the same time
+    max_running_tasks: int, optional
+        Maximum number of tasks that can run at the same time. By default,
+        the number of running tasks is not limited.
+    image_limits: dict[str, int], optional
+        Maximum number of tasks that can run at the same time per algorithm
+        image
+    database_limits: dict[str, int], optional
+        Maximum number of tasks that can run at the same time per database
+        label
+    """
+
+    def __init__(
+        self, start_task: Callable[[dict], str],
+        max_concurrent_starts: int = DEFAULT_MAX_CONCURRENT_TASK_STARTS,
+        max_running_tasks: int = None,
+        image_limits: dict[str, int] = None,
+        database_limits: dict[str, int] = None
+    ) -> None:
+        self.log = logging.getLogger(logger_name(__name__))
+        self.start_task = start_task
+        self.max_running_tasks = max_running_tasks
+        self.image_limits = image_limits or {}
+        self.database_limits = database_limits or {}
+
+        self._queue: list[_QueuedTask] = []
+        # result id -> task that is starting or running
+        self._running: dict[int, _QueuedTask] = {}
+        self._condition = threading.Condition()
+        self._sequence = itertools.count()
+        # start latencies (in seconds) of the most recently started tasks
+        self._start_latencies = deque(maxlen=100)
+
+        for _ in range(max(1, max_concurrent_starts)):
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+
+    def submit(self, task_result: dict) -> None:
+        """
+        Add a task to the queue. Tasks that are already queued or running are
+        ignored.
+
+        Parameters
+        ----------
+        task_result: dict
+            Result (including the task) that should be started
+        """
+        with self._condition:
+            result_id = task_result['id']
+            if result_id in self._running or \
+                    any(q.result_id == result_id for q in self._queue):
+                self.log.debug(f"Result {result_id} is already scheduled")
+                return
+            self._queue.append(
+                _QueuedTask(task_result, next(self._sequence))
+            )
+            self._queue.sort(key=lambda q: q.priority)
+            self._condition.notify()
+            self.log.debug(
+                f"Queued result {result_id}, {len(self._queue)} task(s) "
+                "waiting to be started"
+            )
+
+    def release(self, result_id: int) -> None:
+        """
+        Free the slot of a task that is no longer running.
+
+        Parameters
+        ----------
+        result_id: int
+            Id of the result of the task
+        """
+        with self._condition:
+            if self._running.pop(result_id, None):
+                # tasks that were held back by a limit may be startable now
+                self._condition.notify_all()
+
+    def discard(self, result_ids: list[int] = None) -> list[int]:
+        """
+        Remove tasks from the queue that have not been started yet.
+
+        Parameters
+        ----------
+        result_ids: list[int], optional
+            Ids of the results to remove. If not given, all queued tasks are
+            removed.
+
+        Returns
+        -------
+        list[int]
+            Ids of the results that were removed from the queue
+        """
+        with self._condition:
+            discarded = [
+                q.result_id for q in self._queue
+                if result_ids is None or q.result_id in result_ids
+            ]
+            self._queue = [
+                q for q in self._queue if q.result_id not in discarded
+            ]
+        return discarded
+
+    def status(self) -> dict:
+        """
+        Get the current state of the scheduler.
+
+        Returns
+        -------
+        dict
+            Number of queued and running tasks, and the average start latency
+            (time between queueing and starting, in seconds) of the recently
+            started tasks
+        """
+        with self._condition:
+            latencies = list(self._start_latencies)
+            return {
+                'queued': len(self._queue),
+                'running': len(self._running),
+                'average_start_latency':
+                    sum(latencies) / len(latencies) if latencies else None,
+            }
+
+    def _count_running(self, attribute: str = None, value: str = None
+                       ) -> int:
+        return sum(
+            1 for t in self._running.values()
+            if not t.is_subtask and
+            (attribute is None or getattr(t, attribute) == value)
+        )
+
+    def _can_start(self, queued: _QueuedTask) -> bool:
+        if queued.is_subtask:
+            return True
+        if self.max_running_tasks is not None and \
+                self._count_running() >= self.max_running_tasks:
+            return False
+        image_limit = self.image_limits.get(queued.image)
+        if image_limit is not None and \
+                self._count_running('image', queued.image) >= image_limit:
+            return False
+        database_limit = self.database_limits.get(queued.database)
+        if database_limit is not None and \
+                self._count_running('database', queued.database) \
+                >= database_limit:
+            return False
+        return True
+
+    def _next(self) -> _QueuedTask:
+        """ Block until a task can be started, and claim its slot. """
+        with self._condition:
+            while True:
+                for queued in self._queue:
+                    if self._can_start(queued):
+                        self._queue.remove(queued)
+                        self._running[queued.result_id] = queued
+                        return queued
+                self._condition.wait()
+
+    def _worker(self) -> None:
+        while True:
+            queued = self._next()
+            latency = time.monotonic() - queued.queued_at
+            with self._condition:
+                self._start_latencies.append(latency)
+                n_queued = len(self._queue)
+            self.log.info(
+                f"Starting result {queued.result_id} after {latency:.1f}s in "
+                f"the queue ({n_queued} task(s) still waiting)"
+            )
+            try:
+                status = self.start_task(queued.task_result)
+            except Exception:
+                self.log.exception(
+                    f"Starting result {queued.result_id} failed"
+                )
+                status = None
+            # tasks that did not start will never be released by their
+            # results, so free their slot now
+            if status is None or has_task_failed(status):
+                self.release(queued.result_id)
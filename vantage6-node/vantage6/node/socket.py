@@ -13,6 +13,11 @@ class NodeTaskNamespace(ClientNamespace):
     # node instance.
     node_worker_ref = None
 
+    # whether the server sends the `new_task_run` event, which replaces the
+    # `new_task` event. Servers that send it say so in the `server_features`
+    # event, before any task event is sent.
+    receives_task_runs = False
+
     def __init__(self, *args, **kwargs):
         """ Handler for a websocket namespace. """
         super().__init__(*args, **kwargs)
@@ -40,16 +45,38 @@ class NodeTaskNamespace(ClientNamespace):
         """ Actions to be taken on socket disconnect event. """
         # self.node_worker_ref.socketIO.disconnect()
         self.log.info('Disconnected from the server')
+        # the server tells which events it sends again on reconnect
+        self.receives_task_runs = False
+
+    def on_server_features(self, features: dict):
+        """
+        Actions to be taken when the server tells which features it supports.
+        The server sends this event on connect, before the node joins the
+        rooms in which task events are sent.
+
+        Parameters
+        ----------
+        features: dict
+            Dictionary with the features of the server. If `new_task_run` is
+            set, the server sends the `new_task_run` event for each new run.
+        """
+        self.receives_task_runs = bool(features.get('new_task_run'))
 
     def on_new_task(self, task_id: int):
         """
         Actions to be taken when node is notified of new task by server
 
+        Servers that send the `new_task_run` event tell so on connect, in
+        which case this event is ignored.
+
         Parameters
         ----------
         task_id: int
             ID of the new task
         """
+        if self.receives_task_runs:
+            return
+
         if self.node_worker_ref:
             self.node_worker_ref.get_task_and_add_to_queue(task_id)
             self.log.info(f'New task has been added task_id={task_id}')
@@ -59,6 +86,48 @@ class NodeTaskNamespace(ClientNamespace):
                 'Task Master Node reference not set is socket namespace'
             )
 
+    def on_new_task_run(self, data: dict):
+        """
+        Actions to be taken when node is notified of a new run for its
+        organization by the server
+
+        Parameters
+        ----------
+        data: dict
+            Dictionary with the `task_id` and `result_id` of the new run, and
+            the `result` itself if its input is small enough.
+        """
+        if self.node_worker_ref:
+            self.node_worker_ref.add_result_to_queue(
+                data['result_id'], data.get('result')
+            )
+            self.log.info(
+                f"New task has been added task_id={data['task_id']}"
+            )
+
+        else:
+            self.log.critical(
+                'Task Master Node reference not set is socket namespace'
+            )
+
+    def on_task_created(self, data: dict):
+        """
+        Actions to be taken when a task is created in the collaboration.
+
+        The image of the task is pulled in the background, so that it is
+        available when (sub)tasks that use it are sent to this node.
+
+        Parameters
+        ----------
+        data: dict
+            Dictionary with information on the new task, including the
+            `image` of the task
+        """
+        prefetcher = self.node_worker_ref.image_prefetcher \
+            if self.node_worker_ref else None
+        if prefetcher and data.get('image'):
+            prefetcher.prefetch(data['image'])
+
     def on_algorithm_status_change(self, data):
         """
         Actions to be taken when an algorithm container in the collaboration
@@ -75,6 +144,7 @@ class NodeTaskNamespace(ClientNamespace):
         """
         status = data.get('status')
         run_id = data.get('run_id')
+        self._notify_task_status(data.get('task_id'))
         if has_task_failed(status):
             # TODO handle run sequence at this node. Maybe terminate all
             #     containers with the same run_id?
@@ -85,6 +155,32 @@ class NodeTaskNamespace(ClientNamespace):
         # else: no need to do anything when a task has started/finished/... on
         # another node
 
+    def on_status_update(self, data: dict):
+        """
+        Actions to be taken when a result in the collaboration has been
+        updated at the server.
+
+        Parameters
+        ----------
+        data: dict
+            Dictionary with the `result_id` and `task_id` of the result
+        """
+        self._notify_task_status(data.get('task_id'))
+
+    def _notify_task_status(self, task_id: int) -> None:
+        """
+        Wake up the algorithms that wait for the results of a task.
+
+        Parameters
+        ----------
+        task_id: int
+            ID of the task of which a result has changed
+        """
+        notifier = self.node_worker_ref.task_notifier \
+            if self.node_worker_ref else None
+        if notifier:
+            notifier.notify(task_id)
+
     def on_expired_token(self):
         """
         Action to be taken when node is notified by server that its token
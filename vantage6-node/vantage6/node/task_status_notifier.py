@@ -0,0 +1,63 @@
+"""
+Notifications of task status changes for the proxy server.
+
+The node receives a websocket event when a run in its collaboration changes
+status or when a result is stored at the server. The proxy server uses these
+notifications to answer requests of algorithms that wait for the results of
+their subtasks, so that the algorithms do not have to poll the server.
+"""
+import threading
+
+# number of tasks of which the status changes are remembered. When more tasks
+# are registered, the tasks that changed least recently are forgotten.
+MAX_TRACKED_TASKS = 10000
+
+
+class TaskStatusNotifier:
+    """
+    Thread safe register of status changes per task.
+
+    Each task has a version that is incremented on every status change of
+    one of its runs. Waiting for a change is done by comparing the version
+    with the version that was seen before; this way no change is missed that
+    happens between checking the results and starting to wait.
+    """
+
+    def __init__(self) -> None:
+        # task id -> number of status changes of the task
+        self._versions: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def notify(self, task_id: int) -> None:
+        """
+        Register a status change of a task.
+
+        Parameters
+        ----------
+        task_id: int
+            Id of the task of which a run changed status
+        """
+        if task_id is None:
+            return
+        with self._lock:
+            # (re)insert the task so that the dict is ordered by last change
+            self._versions[task_id] = self._versions.pop(task_id, 0) + 1
+            if len(self._versions) > MAX_TRACKED_TASKS:
+                del self._versions[next(iter(self._versions))]
+
+    def version(self, task_id: int) -> int:
+        """
+        Get the number of status changes of a task.
+
+        Parameters
+        ----------
+        task_id: int
+            Id of the task
+
+        Returns
+        -------
+        int
+            Number of status changes that have been registered for the task
+        """
+        with self._lock:
+            return self._versions.get(task_id, 0)
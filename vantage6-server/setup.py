@@ -61,6 +61,10 @@ setup(
     extras_require={
         'dev': [
             'coverage==6.4.4'
+        ],
+        # required for the 's3' blob store
+        's3': [
+            'boto3==1.28.85'
         ]
     },
     package_data={
@@ -167,6 +167,21 @@ class TestNodeModel(TestBaseModel):
         node.save()
         self.assertIsInstance(Node.get_by_api_key("some-secret-monkeys"), Node)
 
+    def test_api_key_fingerprint_migration(self):
+        node = Node(name="legacy node", api_key="old-secret-monkeys")
+        node.save()
+        self.assertEqual(node.api_key_fingerprint,
+                         Node.fingerprint("old-secret-monkeys"))
+
+        # nodes that were created before fingerprints were stored get one on
+        # their first login
+        node.api_key_fingerprint = None
+        node.save()
+        self.assertEqual(Node.get_by_api_key("old-secret-monkeys"), node)
+        self.assertEqual(node.api_key_fingerprint,
+                         Node.fingerprint("old-secret-monkeys"))
+        self.assertIsNone(Node.get_by_api_key("wrong-secret-monkeys"))
+
     def test_relations(self):
         node = Node.get()[0]
         self.assertIsNotNone(node)
@@ -309,6 +324,39 @@ class TestTaskModel(TestBaseModel):
             for user in task.collaboration.organizations[0].users:
                 self.assertIsInstance(user, User)
 
+    def test_status_expressions(self):
+        collaboration = Collaboration.get()[0]
+        finished = datetime.datetime(2023, 1, 1)
+        statuses = [
+            [],
+            [(None, None)],
+            [('active', None), ('pending', None)],
+            [('completed', finished), ('initializing', None)],
+            [('completed', finished), ('crashed', finished)],
+            [('completed', finished), (None, None)],
+            [('completed', finished), ('completed', finished)],
+        ]
+        tasks = []
+        for results in statuses:
+            task = Task(image="some-image", collaboration=collaboration)
+            for status, finished_at in results:
+                Result(task=task, status=status, finished_at=finished_at)
+            task.save()
+            tasks.append(task)
+
+        # the SQL expressions should give the same outcome as the Python
+        # implementations
+        session = DatabaseSessionManager.get_session()
+        rows = session.query(
+            Task.id, Task.status, Task.complete, Task.finished_at
+        ).filter(Task.id.in_([task.id for task in tasks])).all()
+        self.assertEqual(len(rows), len(tasks))
+        for id_, status, complete, finished_at in rows:
+            task = Task.get(id_)
+            self.assertEqual(status, task.status)
+            self.assertEqual(bool(complete), task.complete)
+            self.assertEqual(finished_at, task.finished_at)
+
 
 class TestRuleModel(TestBaseModel):
 
@@ -6,9 +6,11 @@ import unittest
 import logging
 import json
 import uuid
+import tempfile
+import io
 
 from http import HTTPStatus
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from flask import Response as BaseResponse
 from flask.testing import FlaskClient
 from flask_socketio import SocketIO
@@ -19,12 +21,15 @@ from vantage6.common.globals import APPNAME
 from vantage6.server.globals import PACKAGE_FOLDER
 from vantage6.server import ServerApp, session
 from vantage6.server.model import (Rule, Role, Organization, User, Node,
-                                   Collaboration, Task, Result)
+                                   Collaboration, Task, Result, AlgorithmPort)
 from vantage6.server.model.rule import Scope, Operation
 from vantage6.server import context
 from vantage6.server._version import __version__
 from vantage6.server.model.base import Database, DatabaseSessionManager
 from vantage6.server.controller.fixture import load
+from vantage6.server.blob_store import (BlobStore, configure_blob_store,
+                                        content_key)
+from vantage6.server.heartbeat import HeartbeatTracker
 
 
 logger = logger_name(__name__)
@@ -2461,3 +2466,534 @@ class TestResources(unittest.TestCase):
                                        task=task)
         results = self.app.get(f'/api/task/{task.id}/result', headers=headers)
         self.assertEqual(results.status_code, HTTPStatus.OK)
+
+    def test_result_payload_binary(self):
+        org = Organization()
+        col = Collaboration(organizations=[org], encrypted=True)
+        task = Task(collaboration=col, image="some-image")
+        task.save()
+        res = Result(task=task, organization=org, input="key$iv$aW5wdXQ=")
+        res.save()
+        node, api_key = self.create_node(org, col)
+        headers = self.login_node(api_key)
+
+        # the message of the input is returned as raw bytes
+        result = self.app.get(f'/api/result/{res.id}/input', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual(result.data, b'key$iv$input')
+
+        # upload the result as binary data
+        result = self.app.put(f'/api/result/{res.id}/result', headers=headers,
+                              data=b'key$iv$\x00$result',
+                              content_type='application/octet-stream')
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        result = self.app.get(f'/api/result/{res.id}', headers=headers)
+        self.assertEqual(result.json['result'], 'key$iv$ACRyZXN1bHQ=')
+
+        # patching the other fields does not remove the result
+        result = self.app.patch(
+            f'/api/result/{res.id}', headers=headers,
+            json={'finished_at': '2023-01-01T00:00:00.000'}
+        )
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        result = self.app.get(f'/api/result/{res.id}/result', headers=headers)
+        self.assertEqual(result.data, b'key$iv$\x00$result')
+
+        # finished results cannot be updated
+        result = self.app.put(f'/api/result/{res.id}/result', headers=headers,
+                              data=b'key$iv$result',
+                              content_type='application/octet-stream')
+        self.assertEqual(result.status_code, HTTPStatus.BAD_REQUEST)
+
+        # only the creator of the task can upload the input
+        result = self.app.put(f'/api/result/{res.id}/input', headers=headers,
+                              data=b'key$iv$input',
+                              content_type='application/octet-stream')
+        self.assertEqual(result.status_code, HTTPStatus.UNAUTHORIZED)
+
+        # cleanup
+        node.delete()
+
+    def test_result_blob_store(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        store = configure_blob_store({'type': 'filesystem',
+                                      'path': tmp_dir.name})
+
+        org = Organization()
+        col = Collaboration(organizations=[org], encrypted=True)
+        task = Task(collaboration=col, image="some-image")
+        task.save()
+        res = Result(task=task, organization=org)
+        res.set_payload('input', 'key$iv$aW5wdXQ=')
+        res.save()
+        other = Result(task=task, organization=org)
+        other.set_payload('input', 'key$iv$aW5wdXQ=')
+        other.save()
+
+        # identical payloads are stored once, outside of the database
+        self.assertIsNone(res.input)
+        self.assertEqual(res.input_key, other.input_key)
+        self.assertEqual(res.input_size, len(b'key$iv$input'))
+        self.assertEqual(store.get(res.input_key), b'key$iv$input')
+
+        node, api_key = self.create_node(org, col)
+        headers = self.login_node(api_key)
+        result = self.app.get(f'/api/result/{res.id}', headers=headers)
+        self.assertEqual(result.json['input'], 'key$iv$aW5wdXQ=')
+        self.assertNotIn('input_key', result.json)
+        result = self.app.get(f'/api/result/{res.id}/input', headers=headers)
+        self.assertEqual(result.data, b'key$iv$input')
+
+        # lists of results refer to payloads in the blob store instead of
+        # reading them
+        user_headers = self.create_user_and_login(rules=[
+            Rule.get_by_("result", Scope.GLOBAL, Operation.VIEW),
+            Rule.get_by_("task", Scope.GLOBAL, Operation.VIEW),
+        ])
+        for url in (f'/api/result?task_id={task.id}',
+                    f'/api/task/{task.id}/result'):
+            result = self.app.get(url, headers=user_headers)
+            self.assertEqual(result.status_code, HTTPStatus.OK)
+            data = result.json
+            if isinstance(data, dict):
+                data = data['data']
+            for item in data:
+                self.assertIsNone(item['input'])
+                self.assertEqual(item['input_size'], len(b'key$iv$input'))
+                self.assertEqual(item['input_link'],
+                                 f"/api/result/{item['id']}/input")
+
+        # the result that is uploaded as binary data is not sent back when
+        # the run is finished
+        result = self.app.put(f'/api/result/{res.id}/result', headers=headers,
+                              data=b'key$iv$result',
+                              content_type='application/octet-stream')
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        session.session.refresh(res)
+        self.assertEqual(res.result_key, content_key(b'key$iv$result'))
+        self.assertEqual(res.result_digest, res.result_key)
+        self.assertEqual(store.get(res.result_key), b'key$iv$result')
+        result = self.app.get(f'/api/result/{res.id}/result', headers=headers)
+        self.assertEqual(result.data, b'key$iv$result')
+        self.assertEqual(result.content_length, len(b'key$iv$result'))
+        result = self.app.patch(
+            f'/api/result/{res.id}', headers=headers,
+            json={'finished_at': '2023-01-01T00:00:00.000'}
+        )
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertIsNone(result.json['input'])
+        self.assertIsNone(result.json['result'])
+        self.assertEqual(result.json['result_size'], len(b'key$iv$result'))
+
+        # legacy payloads that are not base64 encoded are stored as they are
+        legacy = Result(task=task, organization=org)
+        legacy.set_payload('input', '{"method": "ab"}')
+        legacy.save()
+        self.assertIsNone(legacy.input_key)
+        self.assertEqual(legacy.input, '{"method": "ab"}')
+        result = self.app.get(f'/api/result/{legacy.id}', headers=headers)
+        self.assertEqual(result.json['input'], '{"method": "ab"}')
+        result = self.app.get(f'/api/result?task_id={task.id}',
+                              headers=headers)
+        data = result.json
+        if isinstance(data, dict):
+            data = data['data']
+        self.assertIn('{"method": "ab"}', [item['input'] for item in data])
+        legacy.delete()
+
+        # the payload is only removed when no result refers to it anymore
+        key = res.input_key
+        res.delete()
+        self.assertEqual(store.get(key), b'key$iv$input')
+        other.delete()
+        with self.assertRaises(FileNotFoundError):
+            store.get(key)
+
+        # cleanup
+        node.delete()
+        configure_blob_store(None)
+        tmp_dir.cleanup()
+
+    def test_s3_blob_store(self):
+        objects = {}
+        client = MagicMock()
+        client.put_object.side_effect = \
+            lambda Bucket, Key, Body: objects.__setitem__((Bucket, Key), Body)
+        client.get_object.side_effect = \
+            lambda Bucket, Key: {'Body': io.BytesIO(objects[(Bucket, Key)])}
+        client.delete_object.side_effect = \
+            lambda Bucket, Key: objects.pop((Bucket, Key), None)
+        client.upload_fileobj.side_effect = \
+            lambda fp, bucket, key: objects.__setitem__((bucket, key),
+                                                        fp.read())
+        boto3 = MagicMock()
+        boto3.client.return_value = client
+
+        with patch.dict('sys.modules', {'boto3': boto3}):
+            store = configure_blob_store({
+                'type': 's3', 'bucket': 'vantage6',
+                'endpoint_url': 'http://localhost:9000'
+            })
+        boto3.client.assert_called_once()
+        self.assertEqual(
+            boto3.client.call_args.kwargs['endpoint_url'],
+            'http://localhost:9000'
+        )
+
+        store.put('key', b'payload')
+        self.assertEqual(objects, {('vantage6', 'key'): b'payload'})
+        self.assertEqual(store.get('key'), b'payload')
+        store.delete('key')
+        self.assertEqual(objects, {})
+
+        # streamed payloads are stored by their content key
+        key, size = store.put_stream(io.BytesIO(b'stream'))
+        self.assertEqual(key, content_key(b'stream'))
+        self.assertEqual(size, len(b'stream'))
+        self.assertEqual(objects, {('vantage6', key): b'stream'})
+        store.delete(key)
+
+        # payloads of results are stored in the bucket
+        org = Organization()
+        col = Collaboration(organizations=[org], encrypted=True)
+        task = Task(collaboration=col, image="some-image")
+        task.save()
+        res = Result(task=task, organization=org)
+        res.set_payload('input', 'key$iv$czM=')
+        res.save()
+        self.assertEqual(objects[('vantage6', res.input_key)], b'key$iv$s3')
+        self.assertEqual(res.get_payload('input'), 'key$iv$czM=')
+
+        # cleanup
+        res.delete()
+        self.assertEqual(objects, {})
+        configure_blob_store(None)
+
+    def test_blob_store_interface_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BlobStore()
+
+    def test_result_and_task_fields_projection(self):
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        task = Task(collaboration=col, image="some-image")
+        node = Node(organization=org, collaboration=col)
+        res = Result(task=task, organization=org, input="input",
+                     result="result", log="log")
+        res.save()
+        node.save()
+
+        rule = Rule.get_by_("result", Scope.GLOBAL, Operation.VIEW)
+        task_rule = Rule.get_by_("task", Scope.GLOBAL, Operation.VIEW)
+        headers = self.create_user_and_login(rules=[rule, task_rule])
+
+        # only the requested fields are returned
+        result = self.app.get(f'/api/result?task_id={task.id}'
+                              '&fields=id,finished_at', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual(result.json, [{'id': res.id, 'finished_at': None}])
+
+        result = self.app.get(f'/api/task/{task.id}/result?fields=id,result',
+                              headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual(result.json, [{'id': res.id, 'result': 'result'}])
+
+        # fields of included results can be selected
+        result = self.app.get(f'/api/task?collaboration_id={col.id}'
+                              '&include=results&fields=id,results.id',
+                              headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual(result.json,
+                         [{'id': task.id, 'results': [{'id': res.id}]}])
+
+        # unknown fields are rejected
+        result = self.app.get('/api/result?fields=id,unknown',
+                              headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.BAD_REQUEST)
+
+        # cleanup
+        node.delete()
+
+    def test_task_status_filter_and_sort(self):
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        active = Task(collaboration=col, image="some-image")
+        Result(task=active, organization=org, status='active')
+        completed = Task(collaboration=col, image="some-image")
+        Result(task=completed, organization=org, status='completed',
+               finished_at=datetime.datetime(2023, 1, 1))
+        active.save()
+        completed.save()
+
+        rule = Rule.get_by_("task", Scope.GLOBAL, Operation.VIEW)
+        headers = self.create_user_and_login(rules=[rule])
+
+        # filter on status in the database
+        result = self.app.get(f'/api/task?collaboration_id={col.id}'
+                              '&status=active', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual([task['id'] for task in result.json], [active.id])
+
+        # sort on status
+        result = self.app.get(f'/api/task?collaboration_id={col.id}'
+                              '&sort=status', headers=headers)
+        self.assertEqual([task['status'] for task in result.json],
+                         ['active', 'completed'])
+        result = self.app.get(f'/api/task?collaboration_id={col.id}'
+                              '&sort=-status', headers=headers)
+        self.assertEqual([task['status'] for task in result.json],
+                         ['completed', 'active'])
+
+        # cannot sort on unknown fields
+        result = self.app.get('/api/task?sort=unknown', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_permission_cache_invalidation(self):
+        org = Organization()
+        role = Role(name="cached-role", organization=org)
+        user = self.create_user(org)
+        user.roles = [role]
+        user.save()
+        headers = self.login(user.username)
+        root_headers = self.login()
+        rule = Rule.get_by_("collaboration", Scope.GLOBAL, Operation.VIEW)
+
+        result = self.app.get('/api/collaboration', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.UNAUTHORIZED)
+
+        # adding a rule to the role is effective immediately
+        result = self.app.post(f'/api/role/{role.id}/rule/{rule.id}',
+                               headers=root_headers)
+        self.assertEqual(result.status_code, HTTPStatus.CREATED)
+        result = self.app.get('/api/collaboration', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+
+        # and so is removing the role from the user
+        result = self.app.patch(f'/api/user/{user.id}', headers=root_headers,
+                                json={'roles': []})
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        result = self.app.get('/api/collaboration', headers=headers)
+        self.assertEqual(result.status_code, HTTPStatus.UNAUTHORIZED)
+
+    def test_heartbeat_tracker(self):
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        long_ago = datetime.datetime(2020, 1, 1)
+        pinging = Node(organization=org, collaboration=col, status='offline',
+                       last_seen=long_ago)
+        stale = Node(organization=org, collaboration=col, status='online',
+                     last_seen=long_ago)
+        pinging.save()
+        stale.save()
+
+        tracker = HeartbeatTracker()
+        tracker.record(pinging.id, ping=True)
+        tracker.record(pinging.id)
+
+        # heartbeats are only written to the database when flushed
+        session = DatabaseSessionManager.get_session()
+        session.expire_all()
+        self.assertEqual(pinging.status, 'offline')
+
+        tracker.flush(offline_before=datetime.datetime(2021, 1, 1))
+        session.expire_all()
+        self.assertEqual(pinging.status, 'online')
+        self.assertGreater(pinging.last_seen, long_ago)
+        self.assertEqual(stale.status, 'offline')
+
+        # cleanup
+        pinging.delete()
+        stale.delete()
+
+    def test_finishing_result_removes_ports(self):
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        task = Task(collaboration=col, image="some-image")
+        res = Result(task=task, organization=org)
+        res.save()
+        port = AlgorithmPort(port=1234, result=res, label='label')
+        port.save()
+
+        node, api_key = self.create_node(org, col)
+        headers = self.login_node(api_key)
+
+        # ports are kept while the algorithm is running
+        result = self.app.patch(f'/api/result/{res.id}', headers=headers,
+                                json={'status': 'active'})
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        self.assertEqual(len(res.ports), 1)
+
+        result = self.app.patch(f'/api/result/{res.id}', headers=headers,
+                                json={
+                                    'status': 'completed',
+                                    'finished_at':
+                                        '2023-01-01T00:00:00.000000',
+                                })
+        self.assertEqual(result.status_code, HTTPStatus.OK)
+        session.session.refresh(res)
+        self.assertEqual(res.ports, [])
+
+        # cleanup
+        node.delete()
+
+    def test_nodes_are_told_about_new_task_run_on_connect(self):
+        headers = self.create_node_and_login()
+
+        client = self.server.socketio.test_client(
+            self.server.app, namespace='/tasks', headers=headers
+        )
+        events = client.get_received('/tasks')
+        client.disconnect(namespace='/tasks')
+
+        self.assertEqual(events[0]['name'], 'server_features')
+        self.assertEqual(events[0]['args'], [{'new_task_run': True}])
+
+    def test_new_task_event_targets_assigned_nodes(self):
+        org = Organization()
+        org2 = Organization()
+        col = Collaboration(organizations=[org, org2])
+        col.save()
+        node = Node(organization=org, collaboration=col)
+        node2 = Node(organization=org2, collaboration=col)
+        node.save()
+        node2.save()
+
+        rule = Rule.get_by_("task", Scope.ORGANIZATION, Operation.CREATE)
+        headers = self.create_user_and_login(org, rules=[rule])
+        with patch.object(self.server.socketio, 'emit') as emit:
+            results = self.app.post('/api/task', headers=headers, json={
+                "organizations": [{'id': org.id, 'input': 'input'}],
+                'collaboration_id': col.id
+            })
+        self.assertEqual(results.status_code, HTTPStatus.CREATED)
+
+        # only the node of the organization that received the task is
+        # notified of the run, and the event includes the result and its
+        # input
+        events = [
+            c for c in emit.call_args_list if c.args[0] == 'new_task_run'
+        ]
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].kwargs['room'],
+                         f'collaboration_{col.id}_organization_{org.id}')
+        event = events[0].args[1]
+        self.assertEqual(event['task_id'], results.json['id'])
+        self.assertEqual(event['result']['id'], event['result_id'])
+        self.assertEqual(event['result']['input'], 'input')
+        self.assertEqual(event['result']['task']['id'], results.json['id'])
+
+        # the collaboration still receives the id of the task
+        events = [c for c in emit.call_args_list if c.args[0] == 'new_task']
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].args[1], results.json['id'])
+        self.assertEqual(events[0].kwargs['room'], f'collaboration_{col.id}')
+
+        # large inputs are not included
+        with patch('vantage6.server.resource.task.'
+                   'NEW_TASK_EVENT_MAX_INPUT_SIZE', 1), \
+                patch.object(self.server.socketio, 'emit') as emit:
+            self.app.post('/api/task', headers=headers, json={
+                "organizations": [{'id': org.id, 'input': 'input'}],
+                'collaboration_id': col.id
+            })
+        events = [
+            c for c in emit.call_args_list if c.args[0] == 'new_task_run'
+        ]
+        self.assertNotIn('result', events[0].args[1])
+
+        # cleanup
+        node.delete()
+        node2.delete()
+
+    def test_create_task_batch(self):
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        col.save()
+        node = Node(organization=org, collaboration=col)
+        node.save()
+
+        rule = Rule.get_by_("task", Scope.ORGANIZATION, Operation.CREATE)
+        headers = self.create_user_and_login(org, rules=[rule])
+        task_json = {
+            "organizations": [{'id': org.id, 'input': 'input'}],
+            'collaboration_id': col.id
+        }
+
+        # none of the tasks are created if one of them is invalid
+        n_tasks = len(Task.get())
+        results = self.app.post('/api/task/batch', headers=headers, json={
+            'tasks': [task_json, {**task_json, 'collaboration_id': 9999}]
+        })
+        self.assertEqual(results.status_code, HTTPStatus.NOT_FOUND)
+        self.assertTrue(results.json['msg'].startswith('Task 1:'))
+        self.assertEqual(len(Task.get()), n_tasks)
+
+        results = self.app.post('/api/task/batch', headers=headers,
+                                json={'tasks': []})
+        self.assertEqual(results.status_code, HTTPStatus.BAD_REQUEST)
+
+        with patch.object(self.server.socketio, 'emit') as emit:
+            results = self.app.post('/api/task/batch', headers=headers,
+                                    json={'tasks': [task_json] * 3})
+        self.assertEqual(results.status_code, HTTPStatus.CREATED)
+        self.assertEqual(len(results.json), 3)
+
+        # each task starts its own run
+        tasks = [Task.get(task['id']) for task in results.json]
+        self.assertEqual([t.run_id for t in tasks], [t.id for t in tasks])
+        self.assertTrue(all(len(t.results) == 1 for t in tasks))
+        events = [c for c in emit.call_args_list if c.args[0] == 'new_task']
+        self.assertEqual(len(events), 3)
+
+        # cleanup
+        node.delete()
+
+    def test_create_task_removes_inputs_on_failure(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        store = configure_blob_store({'type': 'filesystem',
+                                      'path': tmp_dir.name})
+        org = Organization()
+        col = Collaboration(organizations=[org])
+        col.save()
+        node = Node(organization=org, collaboration=col)
+        node.save()
+
+        rule = Rule.get_by_("task", Scope.ORGANIZATION, Operation.CREATE)
+        headers = self.create_user_and_login(org, rules=[rule])
+        tasks = [{
+            "organizations": [{'id': org.id, 'input': input_}],
+            'collaboration_id': col.id
+        } for input_ in ('Zmlyc3Q=', 'c2Vjb25k')]
+
+        # the input of the first task is stored before storing the second
+        # one fails
+        set_payload = Result.set_payload
+
+        def fail_on_second_input(result, field, payload):
+            if payload == 'c2Vjb25k':
+                raise OSError('blob store unavailable')
+            set_payload(result, field, payload)
+
+        n_tasks = len(Task.get())
+        with patch.object(Result, 'set_payload', fail_on_second_input):
+            results = self.app.post('/api/task/batch', headers=headers,
+                                    json={'tasks': tasks})
+        self.assertEqual(results.status_code,
+                         HTTPStatus.INTERNAL_SERVER_ERROR)
+        self.assertEqual(len(Task.get()), n_tasks)
+        with self.assertRaises(FileNotFoundError):
+            store.get(content_key(b'first'))
+
+        # inputs are stored once the tasks are created
+        results = self.app.post('/api/task/batch', headers=headers,
+                                json={'tasks': tasks})
+        self.assertEqual(results.status_code, HTTPStatus.CREATED)
+        self.assertEqual(store.get(content_key(b'first')), b'first')
+
+        # cleanup
+        for task in results.json:
+            for result in Task.get(task['id']).results:
+                result.delete()
+        node.delete()
+        configure_blob_store(None)
+        tmp_dir.cleanup()
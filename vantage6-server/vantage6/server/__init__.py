@@ -45,7 +45,7 @@ from vantage6.cli.context import ServerContext
 from vantage6.cli.globals import DEFAULT_SERVER_ENVIRONMENT
 from vantage6.server.model.base import DatabaseSessionManager, Database
 from vantage6.server.resource.common._schema import HATEOASModelSchema
-from vantage6.server.permission import RuleNeed, PermissionManager
+from vantage6.server.permission import PermissionManager
 from vantage6.server.globals import (
     APPNAME,
     ACCESS_TOKEN_EXPIRES_HOURS,
@@ -56,11 +56,14 @@ from vantage6.server.globals import (
     DEFAULT_SUPPORT_EMAIL_ADDRESS,
     MIN_TOKEN_VALIDITY_SECONDS,
     MIN_REFRESH_TOKEN_EXPIRY_DELTA,
-    SERVER_MODULE_NAME
+    SERVER_MODULE_NAME,
+    HEARTBEAT_FLUSH_INTERVAL_SECONDS
 )
 from vantage6.server.resource.common.swagger_templates import swagger_template
 from vantage6.server._version import __version__
 from vantage6.server.mail_service import MailService
+from vantage6.server.blob_store import configure_blob_store
+from vantage6.server.heartbeat import heartbeats
 from vantage6.server.websockets import DefaultSocketNamespace
 from vantage6.server.default_roles import get_default_roles, DefaultRole
 
@@ -118,6 +121,10 @@ class ServerApp:
         # setup the permission manager for the API endpoints
         self.permissions = PermissionManager()
 
+        # Setup the storage of task input and results outside of the
+        # database, if configured
+        configure_blob_store(self.ctx.config.get('blob_store'))
+
         # Api - REST JSON-rpc
         self.api = Api(self.app)
         self.configure_api()
@@ -515,38 +522,18 @@ class ServerApp:
                 auth = db.Authenticatable.get(identity)
 
                 if isinstance(auth, db.Node):
-
-                    for rule in db.Role.get_by_name(DefaultRole.NODE).rules:
-                        auth_identity.provides.add(
-                                RuleNeed(
-                                    name=rule.name,
-                                    scope=rule.scope,
-                                    operation=rule.operation
-                                )
-                            )
+                    auth_identity.provides.update(self.permissions.cache.get(
+                        ('role', DefaultRole.NODE),
+                        lambda: db.Role.get_by_name(DefaultRole.NODE).rules
+                    ))
 
                 if isinstance(auth, db.User):
-
-                    # add role permissions
-                    for role in auth.roles:
-                        for rule in role.rules:
-                            auth_identity.provides.add(
-                                RuleNeed(
-                                    name=rule.name,
-                                    scope=rule.scope,
-                                    operation=rule.operation
-                                )
-                            )
-
-                    # add 'extra' permissions
-                    for rule in auth.rules:
-                        auth_identity.provides.add(
-                            RuleNeed(
-                                name=rule.name,
-                                scope=rule.scope,
-                                operation=rule.operation
-                            )
-                        )
+                    # role permissions and 'extra' permissions
+                    auth_identity.provides.update(self.permissions.cache.get(
+                        ('user', auth.id),
+                        lambda: [rule for role in auth.roles
+                                 for rule in role.rules] + auth.rules
+                    ))
 
                 identity_changed.send(current_app._get_current_object(),
                                       identity=auth_identity)
@@ -554,15 +541,10 @@ class ServerApp:
                 return auth
             else:
                 # container identity
-
-                for rule in db.Role.get_by_name(DefaultRole.CONTAINER).rules:
-                    auth_identity.provides.add(
-                        RuleNeed(
-                            name=rule.name,
-                            scope=rule.scope,
-                            operation=rule.operation
-                        )
-                    )
+                auth_identity.provides.update(self.permissions.cache.get(
+                    ('role', DefaultRole.CONTAINER),
+                    lambda: db.Role.get_by_name(DefaultRole.CONTAINER).rules
+                ))
                 identity_changed.send(current_app._get_current_object(),
                                       identity=auth_identity)
                 log.debug(identity)
@@ -636,28 +618,24 @@ class ServerApp:
 
     def __node_status_worker(self) -> None:
         """
-        Set node status to offline if they haven't send a ping message in a
+        Periodically write the heartbeats of nodes and users to the database,
+        and set nodes to offline if they haven't sent a ping message in a
         while.
         """
-        # start periodic check if nodes are responsive
         while True:
-            # Send ping event
             try:
-                before_wait = dt.datetime.utcnow()
-
-                # Wait a while to give nodes opportunity to pong. This interval
-                # is a bit longer than the interval at which the nodes ping,
-                # because we want to make sure that the nodes have had time to
-                # respond.
-                time.sleep(PING_INTERVAL_SECONDS + 5)
-
-                # Check for each node that is online if they have responded.
-                # Otherwise set them to offline.
-                online_status_nodes = db.Node.get_online_nodes()
-                for node in online_status_nodes:
-                    if node.last_seen < before_wait:
-                        node.status = 'offline'
-                        node.save()
+                time.sleep(HEARTBEAT_FLUSH_INTERVAL_SECONDS)
+
+                # Heartbeats may be kept in memory (possibly by another server
+                # instance) for one flush interval before they are written to
+                # the database. Nodes are therefore set to offline when they
+                # have not pinged for a ping interval plus a flush interval,
+                # with a small margin for the nodes to respond.
+                offline_before = dt.datetime.utcnow() - dt.timedelta(
+                    seconds=PING_INTERVAL_SECONDS +
+                    HEARTBEAT_FLUSH_INTERVAL_SECONDS + 5
+                )
+                heartbeats.flush(offline_before=offline_before)
             except Exception:
                 log.exception('Node-status thread had an exception')
                 time.sleep(PING_INTERVAL_SECONDS)
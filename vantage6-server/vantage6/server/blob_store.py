@@ -0,0 +1,353 @@
+"""
+Storage of (large) payloads outside of the relational database.
+
+The (encrypted) input and results of tasks can become very large. When a blob
+store is configured, these payloads are stored in the blob store instead of
+in the `result` table, which then only contains a reference (content key),
+the size and the digest of the payload.
+
+Two backends are available: a local filesystem backend and a backend for
+S3-compatible object storage (e.g. AWS S3 or MinIO). The latter requires the
+optional `boto3` package, which is installed with the `s3` extra
+(`pip install vantage6-server[s3]`). The blob store is configured in the
+server configuration file:
+
+.. code-block:: yaml
+
+    blob_store:
+      type: filesystem
+      path: /path/to/blobs
+
+or
+
+.. code-block:: yaml
+
+    blob_store:
+      type: s3
+      bucket: vantage6
+      endpoint_url: http://localhost:9000
+      access_key_id: minio
+      secret_access_key: minio123
+      region: us-east-1
+"""
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO
+
+from vantage6.common import logger_name
+
+log = logging.getLogger(logger_name(__name__))
+
+# the blob store that is used by the server, None if payloads are stored in
+# the database
+_blob_store = None
+
+# number of bytes that are read at once when a payload is stored from a
+# stream
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def content_key(data: bytes) -> str:
+    """
+    Compute the content key (SHA-256 digest) of a payload.
+
+    Payloads are stored by their content key, so identical payloads (e.g.
+    the same encrypted input for multiple organizations) are stored only
+    once.
+
+    Parameters
+    ----------
+    data : bytes
+        The payload
+
+    Returns
+    -------
+    str
+        Hexadecimal SHA-256 digest of the payload
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
+def _copy_and_digest(in_fp: IO, out_fp: IO) -> tuple[str, int]:
+    """
+    Copy a payload in chunks while computing its content key.
+
+    Parameters
+    ----------
+    in_fp : IO
+        Binary file-like object to read the payload from
+    out_fp : IO
+        Binary file-like object to write the payload to
+
+    Returns
+    -------
+    tuple[str, int]
+        Content key and size (in bytes) of the payload
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := in_fp.read(STREAM_CHUNK_SIZE):
+        digest.update(chunk)
+        size += len(chunk)
+        out_fp.write(chunk)
+    return digest.hexdigest(), size
+
+
+class BlobStore(ABC):
+    """ Base class/interface for blob store implementations. """
+
+    @abstractmethod
+    def put(self, key: str, data: bytes | IO) -> None:
+        """
+        Store a payload.
+
+        Parameters
+        ----------
+        key : str
+            Content key of the payload
+        data : bytes | IO
+            The payload, or a binary file-like object containing it
+        """
+        pass
+
+    def put_stream(self, fp: IO) -> tuple[str, int]:
+        """
+        Store a payload from a file-like object, without reading it into
+        memory.
+
+        As the content key is only known once the complete payload has been
+        read, the payload is first written to a temporary file.
+
+        Parameters
+        ----------
+        fp : IO
+            Binary file-like object containing the payload
+
+        Returns
+        -------
+        tuple[str, int]
+            Content key and size (in bytes) of the payload
+        """
+        with tempfile.TemporaryFile() as tmp:
+            key, size = _copy_and_digest(fp, tmp)
+            tmp.seek(0)
+            self.put(key, tmp)
+        return key, size
+
+    def get(self, key: str) -> bytes:
+        """
+        Retrieve a payload.
+
+        Parameters
+        ----------
+        key : str
+            Content key of the payload
+
+        Returns
+        -------
+        bytes
+            The payload
+        """
+        with self.open(key) as fp:
+            return fp.read()
+
+    @abstractmethod
+    def open(self, key: str) -> IO:
+        """
+        Open a payload for reading, without reading it into memory.
+
+        Parameters
+        ----------
+        key : str
+            Content key of the payload
+
+        Returns
+        -------
+        IO
+            Binary file-like object containing the payload
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Delete a payload. Deleting a payload that does not exist is not an
+        error.
+
+        Parameters
+        ----------
+        key : str
+            Content key of the payload
+        """
+        pass
+
+
+class FileSystemBlobStore(BlobStore):
+    """
+    Store payloads as files in a local directory.
+
+    Parameters
+    ----------
+    path : str | Path
+        Directory in which the payloads are stored
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _path_to(self, key: str) -> Path:
+        # use a subdirectory per key prefix to prevent very large directories
+        return self.path / key[:2] / key
+
+    def put(self, key: str, data: bytes | IO) -> None:
+        path = self._path_to(key)
+        if path.exists():
+            return
+        path.parent.mkdir(exist_ok=True)
+
+        # write to a temporary file first, so that a payload is never read
+        # while it is only partially written
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(fd, 'wb') as fp:
+            if isinstance(data, bytes):
+                fp.write(data)
+            else:
+                shutil.copyfileobj(data, fp, STREAM_CHUNK_SIZE)
+        os.replace(tmp_path, path)
+
+    def put_stream(self, fp: IO) -> tuple[str, int]:
+        # the temporary file is created in the store itself, so that it only
+        # has to be renamed once the content key is known
+        fd, tmp_path = tempfile.mkstemp(dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                key, size = _copy_and_digest(fp, tmp)
+            path = self._path_to(key)
+            path.parent.mkdir(exist_ok=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return key, size
+
+    def open(self, key: str) -> IO:
+        return open(self._path_to(key), 'rb')
+
+    def delete(self, key: str) -> None:
+        self._path_to(key).unlink(missing_ok=True)
+
+
+class S3BlobStore(BlobStore):
+    """
+    Store payloads in an S3-compatible object store.
+
+    Parameters
+    ----------
+    bucket : str
+        Name of the bucket in which the payloads are stored
+    endpoint_url : str, optional
+        URL of the object store. Required for stores other than AWS S3,
+        e.g. MinIO.
+    access_key_id : str, optional
+        Access key of the object store
+    secret_access_key : str, optional
+        Secret access key of the object store
+    region : str, optional
+        Region of the bucket
+
+    Raises
+    ------
+    ImportError
+        If the `boto3` package is not installed
+    """
+
+    def __init__(self, bucket: str, endpoint_url: str = None,
+                 access_key_id: str = None, secret_access_key: str = None,
+                 region: str = None) -> None:
+        try:
+            import boto3
+        except ImportError as e:
+            raise ImportError(
+                "The 's3' blob store requires the boto3 package. Install it "
+                "with 'pip install vantage6-server[s3]'."
+            ) from e
+
+        self.bucket = bucket
+        self.client = boto3.client(
+            's3',
+            endpoint_url=endpoint_url,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            region_name=region
+        )
+
+    def put(self, key: str, data: bytes | IO) -> None:
+        if isinstance(data, bytes):
+            self.client.put_object(Bucket=self.bucket, Key=key, Body=data)
+        else:
+            self.client.upload_fileobj(data, self.bucket, key)
+
+    def open(self, key: str) -> IO:
+        return self.client.get_object(Bucket=self.bucket, Key=key)['Body']
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+
+def configure_blob_store(config: dict | None) -> BlobStore | None:
+    """
+    Create the blob store from the `blob_store` section of the server
+    configuration and set it as the blob store of the server.
+
+    Parameters
+    ----------
+    config : dict | None
+        The `blob_store` section of the server configuration. If None, the
+        payloads are stored in the database.
+
+    Returns
+    -------
+    BlobStore | None
+        The configured blob store
+
+    Raises
+    ------
+    ValueError
+        If the type of blob store is unknown
+    """
+    global _blob_store
+
+    if not config:
+        _blob_store = None
+        return None
+
+    config = dict(config)
+    type_ = config.pop('type', 'filesystem')
+    if type_ == 'filesystem':
+        _blob_store = FileSystemBlobStore(**config)
+    elif type_ == 's3':
+        _blob_store = S3BlobStore(**config)
+    else:
+        raise ValueError(f"Unknown blob store type '{type_}'")
+
+    log.info(f"Storing task input and results in a {type_} blob store")
+    return _blob_store
+
+
+def get_blob_store() -> BlobStore | None:
+    """
+    Get the blob store of the server.
+
+    Returns
+    -------
+    BlobStore | None
+        The blob store, or None if payloads are stored in the database
+    """
+    return _blob_store
@@ -117,7 +117,6 @@ def load(fixtures: dict, drop_all: bool = False) -> None:
                 name="Example task",
                 image=image,
                 collaboration=collaboration,
-                run_id=db.Task.next_run_id(),
                 initiator=init_org
             )
 
@@ -129,5 +128,8 @@ def load(fixtures: dict, drop_all: bool = False) -> None:
                 )
                 result.save()
 
+            task.save()
+            # the task starts a new run, of which the run_id is the task id
+            task.run_id = task.id
             task.save()
             log.debug(f"Processed task {task.name}")
@@ -31,6 +31,10 @@ REFRESH_TOKENS_EXPIRE_HOURS = 48
 # refresh token.
 MIN_REFRESH_TOKEN_EXPIRY_DELTA = 1
 
+# Interval at which the heartbeats of nodes and users, that are collected in
+# memory, are written to the database
+HEARTBEAT_FLUSH_INTERVAL_SECONDS = 15
+
 # Expiretime of JWT token in a test environment
 JWT_TEST_ACCESS_TOKEN_EXPIRES = datetime.timedelta(days=1)
 
@@ -52,3 +56,14 @@ DEFAULT_SUPPORT_EMAIL_ADDRESS = 'support@vantage6.ai'
 
 # default time that token is valid in minutes
 DEFAULT_EMAILED_TOKEN_VALIDITY_MINUTES = 60
+
+# Maximum time in seconds that the permissions of users, nodes and containers
+# are cached. Within a server instance the cache is invalidated when roles or
+# rules change, this limits how long changes made via other server instances
+# take to become effective.
+PERMISSION_CACHE_TTL_SECONDS = 60
+
+# Inputs of at most this size (in bytes) are sent along with the
+# `new_task_run` socket event, so that nodes can start the task without
+# retrieving it first
+NEW_TASK_EVENT_MAX_INPUT_SIZE = 64 * 1024
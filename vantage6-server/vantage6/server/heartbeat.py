@@ -0,0 +1,109 @@
+"""
+Tracking of the heartbeats of nodes and users.
+
+Nodes ping the server periodically to signal that they are online, and each
+authenticated request updates the time at which a node or user was last
+seen. Instead of writing each of these to the database individually, they
+are collected in memory by the `HeartbeatTracker` and written to the
+database periodically in a single transaction.
+
+When multiple server instances are running, each instance tracks the
+heartbeats of the clients that are connected to it. As each instance writes
+its heartbeats to the shared database at least every
+`HEARTBEAT_FLUSH_INTERVAL_SECONDS`, the database is never more than that
+interval behind.
+"""
+import datetime as dt
+import logging
+import threading
+
+from vantage6.common import logger_name
+from vantage6.server.model.authenticatable import Authenticatable
+from vantage6.server.model.base import DatabaseSessionManager
+
+log = logging.getLogger(logger_name(__name__))
+
+
+class HeartbeatTracker:
+    """
+    Collects heartbeats in memory and writes them to the database in bulk.
+    """
+
+    def __init__(self) -> None:
+        # authenticatable id -> (last seen, whether a ping was received)
+        self._seen: dict[int, tuple[dt.datetime, bool]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, auth_id: int, ping: bool = False) -> None:
+        """
+        Record that a node or user has been seen.
+
+        Parameters
+        ----------
+        auth_id: int
+            Id of the node or user
+        ping: bool, optional
+            Whether the node or user sent a ping, in which case its status is
+            set to 'online' as well. By default False.
+        """
+        with self._lock:
+            previous = self._seen.get(auth_id)
+            ping = ping or (previous is not None and previous[1])
+            self._seen[auth_id] = (dt.datetime.utcnow(), ping)
+
+    def forget(self, auth_id: int) -> None:
+        """
+        Discard the recorded heartbeat of a node or user, e.g. when it
+        disconnects, so that its status is not set to 'online' again.
+
+        Parameters
+        ----------
+        auth_id: int
+            Id of the node or user
+        """
+        with self._lock:
+            self._seen.pop(auth_id, None)
+
+    def flush(self, offline_before: dt.datetime = None) -> None:
+        """
+        Write the recorded heartbeats to the database, and optionally set
+        nodes that have not been seen for a while to offline.
+
+        Parameters
+        ----------
+        offline_before: datetime, optional
+            Nodes with status 'online' that have not been seen since this
+            time are set to 'offline'
+        """
+        with self._lock:
+            seen, self._seen = self._seen, {}
+
+        session = DatabaseSessionManager.get_session()
+        try:
+            if seen:
+                session.bulk_update_mappings(Authenticatable, [
+                    {'id': id_, 'last_seen': last_seen, 'status': 'online'}
+                    if ping else {'id': id_, 'last_seen': last_seen}
+                    for id_, (last_seen, ping) in seen.items()
+                ])
+            if offline_before:
+                n_offline = session.query(Authenticatable)\
+                    .filter(Authenticatable.type == 'node')\
+                    .filter(Authenticatable.status == 'online')\
+                    .filter(Authenticatable.last_seen < offline_before)\
+                    .update({'status': 'offline'}, synchronize_session=False)
+                if n_offline:
+                    log.info(f"Set {n_offline} node(s) to offline")
+            session.commit()
+        except Exception:
+            session.rollback()
+            # keep the heartbeats so that they are written on the next flush,
+            # unless they have been seen again in the meantime
+            with self._lock:
+                for id_, value in seen.items():
+                    self._seen.setdefault(id_, value)
+            raise
+
+
+# heartbeat tracker of this server instance
+heartbeats = HeartbeatTracker()
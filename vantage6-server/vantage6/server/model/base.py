@@ -206,6 +206,11 @@ class Database(metaclass=Singleton):
             'ALTER TABLE "%s" ADD COLUMN %s %s' % (tab_name, col_name,
                                                    col_type)
         )
+        # columns that are looked up should also get their index
+        for index in column.table.indexes:
+            if column in index.columns.values():
+                log.warn(f"Adding index {index.name} to table {tab_name}")
+                index.create(self.engine)
 
     @staticmethod
     def is_column_missing(column: Column, column_names: list[str],
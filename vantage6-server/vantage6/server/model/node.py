@@ -1,5 +1,6 @@
 from __future__ import annotations
 import bcrypt
+import hashlib
 
 from vantage6.server.model.base import DatabaseSessionManager
 from sqlalchemy.orm import relationship, validates
@@ -20,18 +21,22 @@ class Node(Authenticatable):
         Name of the node
     api_key : str
         API key of the node
+    api_key_fingerprint : str
+        SHA-256 digest of the API key, used to find the node of an API key
+        without checking the (bcrypt) hash of every node
     collaboration : :class:`~.model.collaboration.Collaboration`
         Collaboration that the node belongs to
     organization : :class:`~.model.organization.Organization`
         Organization that the node belongs to
     """
-    _hidden_attributes = ['api_key']
+    _hidden_attributes = ['api_key', 'api_key_fingerprint']
 
     id = Column(Integer, ForeignKey('authenticatable.id'), primary_key=True)
 
     # fields
     name = Column(String)
     api_key = Column(String)
+    api_key_fingerprint = Column(String, index=True)
     collaboration_id = Column(Integer, ForeignKey("collaboration.id"))
     organization_id = Column(Integer, ForeignKey("organization.id"))
 
@@ -48,7 +53,8 @@ class Node(Authenticatable):
     @validates("api_key")
     def _validate_api_key(self, key: str, api_key: str) -> str:
         """
-        Hashes the api_key before storing it in the database.
+        Hashes the api_key before storing it in the database, and stores
+        its fingerprint.
 
         Parameters
         ----------
@@ -62,8 +68,30 @@ class Node(Authenticatable):
         str
             The hashed api_key
         """
+        self.api_key_fingerprint = self.fingerprint(api_key)
         return self.hash(api_key)
 
+    @staticmethod
+    def fingerprint(api_key: str) -> str:
+        """
+        Compute the fingerprint of an API key.
+
+        API keys are random UUIDs, so a (fast) SHA-256 digest does not make
+        them guessable. The fingerprint only selects the node to check; the
+        key itself is still verified against the bcrypt hash.
+
+        Parameters
+        ----------
+        api_key : str
+            The API key
+
+        Returns
+        -------
+        str
+            Hex digest of the API key
+        """
+        return hashlib.sha256(api_key.encode('utf8')).hexdigest()
+
     def check_key(self, key: str) -> bool:
         """
         Checks if the provided key matches the stored key.
@@ -88,6 +116,11 @@ class Node(Authenticatable):
         """
         Returns Node based on the provided API key.
 
+        The node is looked up by the fingerprint of the key. Nodes of which
+        the key was set before fingerprints were introduced are checked one
+        by one; their fingerprint is stored when the key matches, so that
+        they are found directly on their next login.
+
         Parameters
         ----------
         api_key : str
@@ -101,11 +134,25 @@ class Node(Authenticatable):
         """
         session = DatabaseSessionManager.get_session()
 
-        nodes = session.query(cls).all()
+        fingerprint = cls.fingerprint(api_key)
+        nodes = session.query(cls).filter_by(
+            api_key_fingerprint=fingerprint
+        ).all()
         session.commit()
         for node in nodes:
-            is_correct_key = node.check_key(api_key)
-            if is_correct_key:
+            if node.check_key(api_key):
+                return node
+
+        legacy_nodes = session.query(cls).filter(
+            cls.api_key_fingerprint.is_(None)
+        ).all()
+        session.commit()
+        for node in legacy_nodes:
+            if node.check_key(api_key):
+                # set the column directly, assigning the api_key would hash
+                # it again
+                node.api_key_fingerprint = fingerprint
+                node.save()
                 return node
         # no node found with matching API key
         return None
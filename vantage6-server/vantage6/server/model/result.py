@@ -1,12 +1,18 @@
 import datetime
+import io
 import logging
 
-from sqlalchemy import Column, Text, DateTime, Integer, ForeignKey
+from typing import IO, Iterable
+
+from sqlalchemy import Column, Text, DateTime, Integer, ForeignKey, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm.exc import NoResultFound, MultipleResultsFound
 from sqlalchemy.ext.hybrid import hybrid_property
 
 from vantage6.common import logger_name
+from vantage6.common.globals import STRING_ENCODING
+from vantage6.common.encryption import payload_to_binary, payload_from_binary
+from vantage6.server.blob_store import get_blob_store, content_key
 from vantage6.server.model.base import Base
 from vantage6.server.model import (
     Node,
@@ -25,18 +31,32 @@ class Result(Base):
     description of a Task as executed by a Node.
 
     The result (and the input) is encrypted and can be only read by the
-    intended receiver of the message.
+    intended receiver of the message. When a blob store is configured, the
+    input and result are stored in the blob store and the table only holds
+    a reference to them. Use `get_payload` and `set_payload` to access them.
 
     Attributes
     ----------
     input : str
-        Input data of the task
+        Input data of the task, if it is stored in the database
+    input_key : str
+        Key of the input in the blob store, if it is stored there
+    input_size : int
+        Size of the input in bytes (in binary format, if possible)
+    input_digest : str
+        SHA-256 digest of the input (in binary format, if possible)
     task_id : int
         Id of the task that was executed
     organization_id : int
         Id of the organization that executed the task
     result : str
-        Result of the task
+        Result of the task, if it is stored in the database
+    result_key : str
+        Key of the result in the blob store, if it is stored there
+    result_size : int
+        Size of the result in bytes (in binary format, if possible)
+    result_digest : str
+        SHA-256 digest of the result (in binary format, if possible)
     assigned_at : datetime
         Time when the task was assigned to the node
     started_at : datetime
@@ -60,6 +80,12 @@ class Result(Base):
     task_id = Column(Integer, ForeignKey("task.id"))
     organization_id = Column(Integer, ForeignKey("organization.id"))
     result = Column(Text)
+    input_key = Column(String)
+    input_size = Column(Integer)
+    input_digest = Column(String)
+    result_key = Column(String)
+    result_size = Column(Integer)
+    result_digest = Column(String)
     assigned_at = Column(DateTime, default=datetime.datetime.utcnow)
     started_at = Column(DateTime)
     finished_at = Column(DateTime)
@@ -71,6 +97,10 @@ class Result(Base):
     organization = relationship("Organization", back_populates="results")
     ports = relationship("AlgorithmPort", back_populates="result")
 
+    # columns that can be large, and are therefore only loaded when they are
+    # requested
+    large_columns = ('input', 'result', 'log')
+
     @property
     def node(self) -> Node:
         """
@@ -106,6 +136,228 @@ class Result(Base):
             raise
         return node
 
+    def get_payload(self, field: str) -> str | None:
+        """
+        Returns the input or result in its string format.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+
+        Returns
+        -------
+        str | None
+            The payload, loaded from the blob store if it is stored there
+        """
+        key = getattr(self, f"{field}_key")
+        if not key:
+            return getattr(self, field)
+        return payload_from_binary(get_blob_store().get(key),
+                                   self.task.collaboration.encrypted)
+
+    def get_binary_payload(self, field: str) -> bytes:
+        """
+        Returns the input or result in its binary format.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+
+        Returns
+        -------
+        bytes
+            The payload, loaded from the blob store if it is stored there
+        """
+        key = getattr(self, f"{field}_key")
+        if key:
+            return get_blob_store().get(key)
+
+        payload = getattr(self, field)
+        try:
+            return payload_to_binary(payload)
+        except ValueError:
+            # legacy payloads that are not base64 encoded
+            return payload.encode(STRING_ENCODING)
+
+    def set_payload(self, field: str, payload: str | None) -> None:
+        """
+        Set the input or result from its string format.
+
+        Note that the changes still need to be saved.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+        payload : str | None
+            The payload
+        """
+        try:
+            binary = payload_to_binary(payload) if payload else None
+        except ValueError:
+            # legacy payloads that are not base64 encoded can only be stored
+            # as they are
+            binary = None
+        if binary is not None and payload_from_binary(
+            binary, self.task.collaboration.encrypted
+        ) != payload:
+            # the payload cannot be restored from its binary format, e.g.
+            # because it is not in the format of its collaboration
+            binary = None
+        self._set_payload(field, payload, binary)
+
+    def open_binary_payload(self, field: str) -> IO:
+        """
+        Open the input or result in its binary format for reading, without
+        reading payloads from the blob store into memory.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+
+        Returns
+        -------
+        IO
+            Binary file-like object containing the payload
+        """
+        key = getattr(self, f"{field}_key")
+        if key:
+            return get_blob_store().open(key)
+        return io.BytesIO(self.get_binary_payload(field))
+
+    def set_binary_payload(self, field: str, payload: bytes | IO) -> None:
+        """
+        Set the input or result from its binary format.
+
+        When a blob store is configured, a payload that is passed as a
+        file-like object is streamed into the blob store without reading it
+        into memory.
+
+        Note that the changes still need to be saved.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+        payload : bytes | IO
+            The payload, or a binary file-like object containing it
+        """
+        if isinstance(payload, bytes):
+            self._set_payload(field, None, payload)
+            return
+
+        store = get_blob_store()
+        if not store:
+            self._set_payload(field, None, payload.read())
+            return
+
+        old_key = getattr(self, f"{field}_key")
+        key, size = store.put_stream(payload)
+        setattr(self, field, None)
+        setattr(self, f"{field}_key", key)
+        setattr(self, f"{field}_size", size)
+        setattr(self, f"{field}_digest", key)
+        if old_key and old_key != key:
+            self._delete_blob_if_unused(old_key)
+
+    def _set_payload(self, field: str, payload: str | None,
+                     binary: bytes | None) -> None:
+        """
+        Store the payload in the blob store or in the database.
+
+        The payload is stored in the blob store if one is configured and the
+        payload is available in binary format. Otherwise, it is stored in the
+        database in string format.
+
+        Parameters
+        ----------
+        field : str
+            Either 'input' or 'result'
+        payload : str | None
+            The payload in string format
+        binary : bytes | None
+            The payload in binary format
+        """
+        old_key = getattr(self, f"{field}_key")
+        store = get_blob_store()
+
+        if store and binary is not None:
+            # payloads are stored by their digest, so identical payloads are
+            # only stored once
+            digest = content_key(binary)
+            store.put(digest, binary)
+            setattr(self, field, None)
+            setattr(self, f"{field}_key", digest)
+        else:
+            if payload is None and binary is not None:
+                payload = payload_from_binary(
+                    binary, self.task.collaboration.encrypted)
+            elif binary is None and payload is not None:
+                binary = payload.encode(STRING_ENCODING)
+            digest = content_key(binary) \
+                if binary is not None else None
+            setattr(self, field, payload)
+            setattr(self, f"{field}_key", None)
+
+        setattr(self, f"{field}_size",
+                len(binary) if binary is not None else None)
+        setattr(self, f"{field}_digest", digest)
+
+        if old_key and old_key != getattr(self, f"{field}_key"):
+            self._delete_blob_if_unused(old_key)
+
+    def _delete_blob_if_unused(self, key: str) -> None:
+        """
+        Delete a payload from the blob store if no other result refers to it.
+
+        Parameters
+        ----------
+        key : str
+            Key of the payload in the blob store
+        """
+        self.delete_unused_blobs([key], ignore_id=self.id)
+
+    @staticmethod
+    def delete_unused_blobs(keys: Iterable[str],
+                            ignore_id: int | None = None) -> None:
+        """
+        Delete payloads from the blob store that no result refers to.
+
+        Parameters
+        ----------
+        keys : Iterable[str]
+            Keys of the payloads in the blob store
+        ignore_id : int | None
+            Id of a result of which the references are ignored, e.g. because
+            it is being deleted
+        """
+        store = get_blob_store()
+        if not store:
+            return
+        session = DatabaseSessionManager.get_session()
+        for key in keys:
+            in_use = session.query(Result.id)\
+                .filter(Result.id != ignore_id)\
+                .filter((Result.input_key == key) |
+                        (Result.result_key == key))\
+                .first()
+            session.commit()
+            if not in_use:
+                store.delete(key)
+
+    def delete(self) -> None:
+        """
+        Delete the result from the database, and its payloads from the blob
+        store when no other results refer to them.
+        """
+        keys = {key for key in (self.input_key, self.result_key) if key}
+        id_ = self.id
+        super().delete()
+        self.delete_unused_blobs(keys, ignore_id=id_)
+
     @hybrid_property
     def complete(self) -> bool:
         """
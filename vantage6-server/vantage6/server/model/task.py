@@ -6,7 +6,7 @@ from sqlalchemy.ext.hybrid import hybrid_property
 
 from vantage6.common.task_status import TaskStatus, has_task_failed
 from vantage6.server.model.node import Node
-from vantage6.server.model.base import Base, DatabaseSessionManager
+from vantage6.server.model.base import Base
 
 
 class Task(Base):
@@ -88,6 +88,19 @@ class Task(Base):
         """
         return all([r.complete for r in self.results])
 
+    @complete.expression
+    def complete(cls) -> sql.ColumnElement:
+        """
+        SQL expression of `complete`: a task is complete when none of its
+        results is unfinished.
+
+        Returns
+        -------
+        sql.ColumnElement
+            Boolean expression that can be used in queries
+        """
+        return ~cls._any_result(cls._result_model().finished_at.is_(None))
+
     # TODO update in v4+, with renaming to 'run'
     @hybrid_property
     def finished_at(self) -> datetime.datetime | None:
@@ -103,6 +116,22 @@ class Task(Base):
         return max([r.finished_at for r in self.results]) \
             if self.complete and self.results else None
 
+    @finished_at.expression
+    def finished_at(cls) -> sql.ColumnElement:
+        """
+        SQL expression of `finished_at`.
+
+        Returns
+        -------
+        sql.ColumnElement
+            Expression that can be used in queries
+        """
+        Result = cls._result_model()
+        last_finished = sql.select(sql.func.max(Result.finished_at))\
+            .where(Result.task_id == cls.id)\
+            .scalar_subquery()
+        return sql.case((cls.complete, last_finished), else_=None)
+
     @hybrid_property
     def status(self) -> str:
         """
@@ -131,6 +160,70 @@ class Task(Base):
         else:
             return TaskStatus.COMPLETED.value
 
+    @status.expression
+    def status(cls) -> sql.ColumnElement:
+        """
+        SQL expression of `status`, which follows the same rules as the
+        Python implementation. This allows filtering and sorting tasks on
+        their status in the database.
+
+        Returns
+        -------
+        sql.ColumnElement
+            Expression that can be used in queries
+        """
+        result_status = cls._result_model().status
+        not_failed = [
+            TaskStatus.PENDING.value, TaskStatus.INITIALIZING.value,
+            TaskStatus.ACTIVE.value, TaskStatus.COMPLETED.value
+        ]
+        return sql.case(
+            (~cls._any_result(result_status.isnot(None)), 'unknown'),
+            (cls._any_result(sql.or_(result_status.is_(None),
+                                     result_status.notin_(not_failed))),
+             TaskStatus.FAILED.value),
+            (cls._any_result(result_status == TaskStatus.ACTIVE.value),
+             TaskStatus.ACTIVE.value),
+            (cls._any_result(result_status == TaskStatus.INITIALIZING.value),
+             TaskStatus.INITIALIZING.value),
+            (cls._any_result(result_status == TaskStatus.PENDING.value),
+             TaskStatus.PENDING.value),
+            else_=TaskStatus.COMPLETED.value
+        )
+
+    @staticmethod
+    def _result_model() -> type:
+        """
+        Get the result model. It cannot be imported at module level as the
+        result model depends on this model.
+
+        Returns
+        -------
+        type
+            The result model
+        """
+        from vantage6.server.model.result import Result
+        return Result
+
+    @classmethod
+    def _any_result(cls, condition: sql.ColumnElement) -> sql.ColumnElement:
+        """
+        SQL expression that checks whether any result of the task matches a
+        condition.
+
+        Parameters
+        ----------
+        condition : sql.ColumnElement
+            Condition on the result model
+
+        Returns
+        -------
+        sql.ColumnElement
+            Boolean expression that can be used in queries
+        """
+        Result = cls._result_model()
+        return sql.exists().where(Result.task_id == cls.id).where(condition)
+
     def results_for_node(self, node: Node) -> list:
         """
         Get all results for a given node.
@@ -150,24 +243,6 @@ class Task(Base):
                 self.collaboration == node.collaboration and
                 self.organization == node.organization]
 
-    @classmethod
-    def next_run_id(cls) -> int:
-        """
-        Get the next available run id for a new task.
-
-        Returns
-        -------
-        int
-            Next available run id
-        """
-        session = DatabaseSessionManager.get_session()
-        max_run_id = session.query(sql.func.max(cls.run_id)).scalar()
-        session.commit()
-        if max_run_id:
-            return max_run_id + 1
-        else:
-            return 1
-
     def __repr__(self) -> str:
         """
         String representation of the Task object
@@ -1,10 +1,13 @@
 import logging
 import importlib
+import threading
+import time
 
 from collections import namedtuple
+from typing import Callable, Hashable
 from flask_principal import Permission, PermissionDenied
 
-from vantage6.server.globals import RESOURCES
+from vantage6.server.globals import RESOURCES, PERMISSION_CACHE_TTL_SECONDS
 from vantage6.server.default_roles import DefaultRole
 from vantage6.server.model.role import Role
 from vantage6.server.model.rule import Rule, Operation, Scope
@@ -45,13 +48,95 @@ class RuleCollection:
         self.__setattr__(f'{operation.value}_{scope.value}', permission)
 
 
+class PermissionCache:
+    """
+    Cache of the permissions (rule needs) of users, nodes and containers.
+
+    Building the permissions requires several database queries, which would
+    otherwise be executed on every authenticated request. Entries should be
+    invalidated when the roles or rules they are built from change.
+
+    Parameters
+    ----------
+    ttl: float, optional
+        Number of seconds an entry is kept in the cache, by default
+        `PERMISSION_CACHE_TTL_SECONDS`
+    """
+
+    def __init__(self, ttl: float = PERMISSION_CACHE_TTL_SECONDS) -> None:
+        self.ttl = ttl
+
+        # key -> (expiry timestamp, rule needs)
+        self._needs: dict[Hashable, tuple[float, frozenset[RuleNeed]]] = {}
+        # incremented on each invalidation, to prevent storing permissions
+        # that were loaded before the invalidation
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable,
+            load_rules: Callable[[], list[Rule]]) -> frozenset[RuleNeed]:
+        """
+        Get the rule needs of an entity, loading them if they are not cached.
+
+        Parameters
+        ----------
+        key: Hashable
+            Key of the entity, e.g. ('user', <id>)
+        load_rules: Callable[[], list[Rule]]
+            Function that loads the rules of the entity from the database
+
+        Returns
+        -------
+        frozenset[RuleNeed]
+            The rule needs of the entity
+        """
+        with self._lock:
+            entry = self._needs.get(key)
+            version = self._version
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        needs = frozenset(
+            RuleNeed(name=rule.name, scope=rule.scope,
+                     operation=rule.operation)
+            for rule in load_rules()
+        )
+        with self._lock:
+            if version == self._version:
+                self._needs[key] = (time.monotonic() + self.ttl, needs)
+        return needs
+
+    def invalidate(self, key: Hashable = None) -> None:
+        """
+        Remove an entry from the cache.
+
+        Parameters
+        ----------
+        key: Hashable, optional
+            Key of the entity. If not provided, all entries are removed,
+            which is required when the rules of a role change.
+        """
+        with self._lock:
+            self._version += 1
+            if key is None:
+                self._needs.clear()
+            else:
+                self._needs.pop(key, None)
+
+
 class PermissionManager:
     """
     Loads the permissions and syncs rules in database with rules defined in
     the code
+
+    Attributes
+    ----------
+    cache: PermissionCache
+        Cache of the permissions of users, nodes and containers
     """
 
     def __init__(self) -> None:
+        self.cache = PermissionCache()
         self.collections = {}
         log.info("Loading permission system...")
         self.load_rules_from_resources()
@@ -13,11 +13,13 @@ from flask_jwt_extended import (
 )
 from flask_socketio import SocketIO
 from marshmallow_sqlalchemy import ModelSchema
+from sqlalchemy.orm import defer
 
 
 from vantage6.common import logger_name
 from vantage6.server import db
 from vantage6.server.permission import PermissionManager
+from vantage6.server.heartbeat import heartbeats
 from vantage6.server.resource.pagination import Page
 
 log = logging.getLogger(logger_name(__name__))
@@ -68,7 +70,82 @@ class ServicesResources(Resource):
         """
         return field in request.args.getlist('include')
 
-    def dump(self, page: Page, schema: ModelSchema) -> dict:
+    @staticmethod
+    def requested_fields(schema: ModelSchema) -> list[str] | None:
+        """
+        Obtain the fields that are requested using the `fields` request
+        argument. Fields may be comma separated and nested fields can be
+        selected using a dot, e.g. `results.id`.
+
+        Parameters
+        ----------
+        schema : ModelSchema
+            Schema that is used to serialize the resources
+
+        Returns
+        -------
+        list[str] | None
+            The requested fields, or None if all fields are requested
+
+        Raises
+        ------
+        ValueError
+            If one of the requested fields is not in the schema
+        """
+        fields = [
+            field.strip() for value in request.args.getlist('fields')
+            for field in value.split(',') if field.strip()
+        ]
+        if not fields:
+            return None
+
+        unknown = {field.split('.', 1)[0] for field in fields} - \
+            set(schema.fields)
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s) requested: {', '.join(sorted(unknown))}"
+            )
+        return fields
+
+    @staticmethod
+    def defer_unrequested(model: db.Base, fields: list[str] | None,
+                          prefix: str = None) -> list:
+        """
+        Create loader options that defer loading the large columns of a
+        model (see `large_columns` of the model) that are not requested, so
+        that they are never read from the database.
+
+        Parameters
+        ----------
+        model : db.Base
+            Model of which the columns are deferred
+        fields : list[str] | None
+            The requested fields, None if all fields are requested
+        prefix : str, optional
+            Name of the field by which the model is nested in the requested
+            fields, e.g. 'results' for the results of a task
+
+        Returns
+        -------
+        list
+            Loader options to apply to the query
+        """
+        if fields is None:
+            return []
+        if prefix:
+            if prefix in fields:
+                return []
+            fields = [field.split('.', 1)[1] for field in fields
+                      if field.startswith(f'{prefix}.')]
+
+        return [
+            defer(getattr(model, name))
+            for name in getattr(model, 'large_columns', ())
+            if name not in fields
+        ]
+
+    def dump(self, page: Page, schema: ModelSchema,
+             fields: list[str] = None) -> dict:
         """
         Dump based on the request context (to paginate or not)
 
@@ -78,18 +155,24 @@ class ServicesResources(Resource):
             Page object to dump
         schema : ModelSchema
             Schema to use for dumping
+        fields : list[str], optional
+            Only dump these fields, by default all fields are dumped
 
         Returns
         -------
         dict
             Dumped page
         """
+        if fields is not None:
+            schema = type(schema)(only=fields)
+
         if self.is_included('metadata'):
             return schema.meta_dump(page)
         else:
             return schema.default_dump(page)
 
-    def response(self, page: Page, schema: ModelSchema):
+    def response(self, page: Page, schema: ModelSchema,
+                 fields: list[str] = None):
         """
         Prepare a valid HTTP OK response from a page object
 
@@ -99,13 +182,15 @@ class ServicesResources(Resource):
             Page object to dump
         schema : ModelSchema
             Schema to use for dumping
+        fields : list[str], optional
+            Only dump these fields, by default all fields are dumped
 
         Returns
         -------
         tuple
             Tuple of (dumped page, HTTPStatus.OK, headers of the page)
         """
-        return self.dump(page, schema), HTTPStatus.OK, page.headers
+        return self.dump(page, schema, fields), HTTPStatus.OK, page.headers
 
     @staticmethod
     def obtain_auth() -> db.Authenticatable | dict:
@@ -226,7 +311,8 @@ def only_for(types: tuple[str] = ('user', 'node', 'container')):
 
 def get_and_update_authenticatable_info(auth_id: int) -> db.Authenticatable:
     """
-    Get user or node from ID and update last time seen online.
+    Get user or node from ID and record the last time seen online. This is
+    written to the database periodically by the heartbeat tracker.
 
     Parameters
     ----------
@@ -239,8 +325,7 @@ def get_and_update_authenticatable_info(auth_id: int) -> db.Authenticatable:
         User or node database model
     """
     auth = db.Authenticatable.get(auth_id)
-    auth.last_seen = datetime.datetime.utcnow()
-    auth.save()
+    heartbeats.record(auth_id)
     return auth
 
 
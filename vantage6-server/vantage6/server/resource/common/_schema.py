@@ -147,10 +147,46 @@ class TaskIncludedSchema(TaskSchema):
     results = fields.Nested('TaskResultSchema', many=True, exclude=['task'])
 
 
+class ResultPayloadSchema(HATEOASModelSchema):
+    """
+    Base schema of results, that serializes their input and result.
+
+    Payloads that are stored in the blob store are only included when the
+    schema has `inline_blob_payloads` set in its context, which is done when
+    a single result is serialized. Collections of results contain the size
+    and digest of these payloads and a link to the binary payload endpoint
+    instead, so that listing results never reads payloads from the blob
+    store.
+    """
+    input = fields.Method("input_payload")
+    result = fields.Method("result_payload")
+    input_link = fields.Method("input_payload_link")
+    result_link = fields.Method("result_payload_link")
+
+    def input_payload(self, obj):
+        return self._payload(obj, 'input')
+
+    def result_payload(self, obj):
+        return self._payload(obj, 'result')
+
+    def input_payload_link(self, obj):
+        return url_for('result_payload', id=obj.id, field='input')
+
+    def result_payload_link(self, obj):
+        return url_for('result_payload', id=obj.id, field='result')
+
+    def _payload(self, obj, field):
+        if getattr(obj, f"{field}_key") and \
+                not self.context.get('inline_blob_payloads'):
+            return None
+        return obj.get_payload(field)
+
+
 # /task/{id}/result
-class TaskResultSchema(HATEOASModelSchema):
+class TaskResultSchema(ResultPayloadSchema):
     class Meta:
         model = db.Result
+        exclude = ('input_key', 'result_key')
 
     node = fields.Function(
         func=lambda obj: ResultNodeSchema().dump(obj.node, many=False).data
@@ -160,9 +196,10 @@ class TaskResultSchema(HATEOASModelSchema):
     )
 
 
-class ResultSchema(HATEOASModelSchema):
+class ResultSchema(ResultPayloadSchema):
     class Meta:
         model = db.Result
+        exclude = ('input_key', 'result_key')
 
     organization = fields.Method("organization")
     task = fields.Method("task")
@@ -181,8 +218,8 @@ class ResultTaskIncludedSchema(ResultSchema):
 class ResultNodeSchema(HATEOASModelSchema):
     class Meta:
         model = db.Node
-        exclude = ('type', 'api_key', 'collaboration', 'organization',
-                   'last_seen')
+        exclude = ('type', 'api_key', 'api_key_fingerprint', 'collaboration',
+                   'organization', 'last_seen')
 
 
 class PortSchema(HATEOASModelSchema):
@@ -257,7 +294,7 @@ class NodeSchema(HATEOASModelSchema):
 
     class Meta:
         model = db.Node
-        exclude = ('api_key',)
+        exclude = ('api_key', 'api_key_fingerprint')
 
 
 class NodeConfigSchema(HATEOASModelSchema):
@@ -301,6 +338,7 @@ class NodeSchemaSimple(HATEOASModelSchema):
             'collaboration',
             'taskresults',
             'api_key',
+            'api_key_fingerprint',
             'type',
         ]
 
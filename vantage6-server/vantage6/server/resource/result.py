@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 
-from flask import g, request
+from flask import g, request, send_file
 from flask_restful import Api
 from http import HTTPStatus
 from sqlalchemy import desc
@@ -66,11 +66,24 @@ def setup(api: Api, api_base: str, services: dict) -> None:
         methods=('GET', 'PATCH'),
         resource_class_kwargs=services
     )
+    api.add_resource(
+        ResultPayload,
+        path + '/<int:id>/<any(input, result):field>',
+        endpoint='result_payload',
+        methods=('GET', 'PUT'),
+        resource_class_kwargs=services
+    )
 
 
 # Schemas
 result_schema = ResultSchema()
 result_inc_schema = ResultTaskIncludedSchema()
+# a single result includes its payloads, also when they are stored in the
+# blob store
+result_detail_schema = ResultSchema(context={'inline_blob_payloads': True})
+result_inc_detail_schema = ResultTaskIncludedSchema(
+    context={'inline_blob_payloads': True}
+)
 
 
 # -----------------------------------------------------------------------------
@@ -187,6 +200,13 @@ class Results(ResultBase):
               description: Include 'task' to include task data. Include
                 'metadata' to get pagination metadata. Note that this will put
                 the actual data in an envelope.
+            - in: query
+              name: fields
+              schema:
+                type: string (can be multiple)
+              description: Comma separated list of fields to return, e.g.
+                'id,started_at,finished_at'. Large fields that are not
+                requested, such as the input and result, are not loaded.
             - in: query
               name: page
               schema:
@@ -247,14 +267,19 @@ class Results(ResultBase):
                 return {'msg': 'You lack the permission to do that!'}, \
                     HTTPStatus.UNAUTHORIZED
 
+        # serialization of the models
+        s = result_inc_schema if self.is_included('task') else result_schema
+        try:
+            fields = self.requested_fields(s)
+        except ValueError as e:
+            return {'msg': str(e)}, HTTPStatus.BAD_REQUEST
+        q = q.options(*self.defer_unrequested(db_Result, fields))
+
         # query the DB and paginate
         q = q.order_by(desc(db_Result.id))
         page = Pagination.from_query(query=q, request=request)
 
-        # serialization of the models
-        s = result_inc_schema if self.is_included('task') else result_schema
-
-        return self.response(page, s)
+        return self.response(page, s, fields)
 
 
 class Result(ResultBase):
@@ -318,8 +343,8 @@ class Result(ResultBase):
                 return {'msg': 'You lack the permission to do that!'}, \
                     HTTPStatus.UNAUTHORIZED
 
-        s = result_inc_schema if request.args.get('include') == 'task' \
-            else result_schema
+        s = result_inc_detail_schema \
+            if request.args.get('include') == 'task' else result_detail_schema
 
         return s.dump(result, many=False).data, HTTPStatus.OK
 
@@ -329,7 +354,8 @@ class Result(ResultBase):
         ---
         description: >-
           Update results from the node. Only done if the request comes from the
-          correct, authenticated node.\n
+          correct, authenticated node. When the result is finished, the VPN
+          ports of the algorithm are removed.\n
 
           The user cannot access this endpoint so they cannot tamper with any
           results.
@@ -394,18 +420,188 @@ class Result(ResultBase):
             return {"msg": "Cannot update an already finished result!"}, \
                 HTTPStatus.BAD_REQUEST
 
-        # notify collaboration nodes/users that the task has an update
-        self.socketio.emit(
-            "status_update", {'result_id': id}, namespace='/tasks',
-            room=f'collaboration_{result.task.collaboration.id}'
-        )
-
         result.started_at = parse_datetime(data.get("started_at"),
                                            result.started_at)
         result.finished_at = parse_datetime(data.get("finished_at"))
-        result.result = data.get("result")
+        # the result may have been uploaded separately using the binary
+        # payload endpoint, in which case it should not be overwritten
+        if "result" in data:
+            result.set_payload('result', data.get("result"))
         result.log = data.get("log")
         result.status = data.get("status", result.status)
+        if result.finished_at:
+            # the VPN ports of the algorithm are no longer in use, remove them
+            # so that the node does not need a separate request for this
+            g.session.query(db.AlgorithmPort).filter(
+                db.AlgorithmPort.result_id == result.id
+            ).delete()
         result.save()
 
+        # notify collaboration nodes/users that the task has an update. This
+        # is done after saving, so that the update is visible to anyone that
+        # retrieves the result when receiving the event.
+        self.socketio.emit(
+            "status_update", {'result_id': id, 'task_id': result.task_id},
+            namespace='/tasks',
+            room=f'collaboration_{result.task.collaboration_id}'
+        )
+
+        # payloads in the blob store are not sent back, as the node has just
+        # uploaded them
         return result_schema.dump(result, many=False).data, HTTPStatus.OK
+
+
+class ResultPayload(ResultBase):
+    """
+    Resource for /api/result/<id>/input and /api/result/<id>/result
+
+    The payloads are transferred as binary data (`application/octet-stream`)
+    instead of base64 encoded strings in a JSON body.
+    """
+
+    @only_for(('node', 'user', 'container'))
+    def get(self, id, field):
+        """ Download the input or result of a result
+        ---
+        description: >-
+          Returns the (encrypted) input or result as binary data. The header
+          fields of encrypted payloads (encrypted key(s) and initialization
+          vector) are separated by a `$`, followed by the raw encrypted
+          message.\n
+
+          ### Permission Table\n
+          |Rule name|Scope|Operation|Assigned to node|Assigned to container|
+          Description|\n
+          |--|--|--|--|--|--|\n
+          |Result|Global|View|❌|❌|View any result|\n
+          |Result|Organization|View|✅|✅|View the results of your
+          organizations collaborations|\n
+
+        parameters:
+          - in: path
+            name: id
+            schema:
+              type: integer
+            minimum: 1
+            description: Result id
+            required: true
+          - in: path
+            name: field
+            schema:
+              type: string
+            description: Payload to download, either 'input' or 'result'
+            required: true
+
+        responses:
+          200:
+            description: Ok
+            content:
+              application/octet-stream: {}
+          401:
+            description: Unauthorized
+          404:
+            description: Result id not found
+
+        security:
+          - bearerAuth: []
+
+        tags: ["Result"]
+        """
+        auth_org = self.obtain_auth_organization()
+
+        result = db_Result.get(id)
+        if not result:
+            return {'msg': f'Result id={id} not found!'}, \
+                HTTPStatus.NOT_FOUND
+        if not self.r.v_glo.can():
+            c_orgs = result.task.collaboration.organizations
+            if not (self.r.v_org.can() and auth_org in c_orgs):
+                return {'msg': 'You lack the permission to do that!'}, \
+                    HTTPStatus.UNAUTHORIZED
+
+        # the payload is streamed from the blob store, instead of reading it
+        # into memory first
+        response = send_file(result.open_binary_payload(field),
+                             mimetype='application/octet-stream')
+        size = getattr(result, f"{field}_size")
+        if size is not None:
+            response.content_length = size
+        return response
+
+    @only_for(('node', 'user', 'container'))
+    def put(self, id, field):
+        """ Upload the input or result of a result
+        ---
+        description: >-
+          Upload the (encrypted) input or result as binary data, in the same
+          format as it is downloaded.\n
+
+          The result can only be uploaded by the node that executes the task,
+          before the result is finished. The input can only be uploaded by
+          the user or algorithm container that created the task, before the
+          task is started.
+
+        parameters:
+          - in: path
+            name: id
+            schema:
+              type: integer
+            minimum: 1
+            description: Result id
+            required: true
+          - in: path
+            name: field
+            schema:
+              type: string
+            description: Payload to upload, either 'input' or 'result'
+            required: true
+
+        requestBody:
+          content:
+            application/octet-stream: {}
+
+        responses:
+          200:
+            description: Ok
+          400:
+            description: Result already started or finished
+          401:
+            description: Unauthorized
+          404:
+            description: Result id not found
+
+        security:
+          - bearerAuth: []
+
+        tags: ["Result"]
+        """
+        result = db_Result.get(id)
+        if not result:
+            return {'msg': f'Result id={id} not found!'}, \
+                HTTPStatus.NOT_FOUND
+
+        if field == 'result':
+            if not g.node or result.organization_id != g.node.organization_id:
+                return {"msg": "This is not your result to upload!"}, \
+                    HTTPStatus.UNAUTHORIZED
+            if result.finished_at is not None:
+                return {"msg": "Cannot update an already finished result!"}, \
+                    HTTPStatus.BAD_REQUEST
+        else:
+            is_creator = (
+                (g.user and result.task.init_user_id == g.user.id) or
+                (g.container and result.task.parent_id ==
+                 g.container["task_id"])
+            )
+            if not is_creator:
+                return {"msg": "Only the creator of the task can upload its "
+                        "input!"}, HTTPStatus.UNAUTHORIZED
+            if result.started_at is not None:
+                return {"msg": "Cannot update the input of a result that has "
+                        "already started!"}, HTTPStatus.BAD_REQUEST
+
+        result.set_binary_payload(field, request.stream)
+        result.save()
+
+        return {"msg": f"The {field} of result id={id} has been uploaded"}, \
+            HTTPStatus.OK
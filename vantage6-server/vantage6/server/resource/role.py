@@ -528,6 +528,9 @@ class Role(RoleBase):
                 return denied, HTTPStatus.UNAUTHORIZED
             role.rules = rules
         role.save()
+        if 'rules' in data:
+            # permissions of all users with this role have changed
+            self.permissions.cache.invalidate()
 
         return role_schema.dump(role, many=False).data, HTTPStatus.OK
 
@@ -584,6 +587,7 @@ class Role(RoleBase):
                         'organization'}, HTTPStatus.UNAUTHORIZED
 
         role.delete()
+        self.permissions.cache.invalidate()
 
         return {"msg": "Role removed from the database."}, HTTPStatus.OK
 
@@ -731,6 +735,7 @@ class RoleRules(RoleBase):
         # We're good, lets add the rule
         role.rules.append(rule)
         role.save()
+        self.permissions.cache.invalidate()
 
         return rule_schema.dump(role.rules, many=False).data, \
             HTTPStatus.CREATED
@@ -801,6 +806,8 @@ class RoleRules(RoleBase):
 
         # Ok jumped all hoopes, remove it..
         role.rules.remove(rule)
+        role.save()
+        self.permissions.cache.invalidate()
 
         return rule_schema.dump(role.rules, many=False).data, \
             HTTPStatus.OK
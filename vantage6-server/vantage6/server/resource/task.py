@@ -6,10 +6,11 @@ from flask import g, request, url_for
 from flask_restful import Api
 from http import HTTPStatus
 from sqlalchemy import desc
+from sqlalchemy.orm import selectinload, load_only
 
-from vantage6.common.globals import STRING_ENCODING
 from vantage6.common.task_status import TaskStatus, has_task_finished
 from vantage6.server import db
+from vantage6.server.globals import NEW_TASK_EVENT_MAX_INPUT_SIZE
 from vantage6.server.permission import (
     Scope as S,
     PermissionManager,
@@ -19,7 +20,8 @@ from vantage6.server.resource import only_for, ServicesResources, with_user
 from vantage6.server.resource.common._schema import (
     TaskSchema,
     TaskIncludedSchema,
-    TaskResultSchema
+    TaskResultSchema,
+    ResultSchema
 )
 from vantage6.server.resource.pagination import Pagination
 from vantage6.server.resource.event import kill_task
@@ -52,6 +54,13 @@ def setup(api: Api, api_base: str, services: dict) -> None:
         methods=('GET', 'POST'),
         resource_class_kwargs=services
     )
+    api.add_resource(
+        TaskBatch,
+        path + '/batch',
+        endpoint='task_batch',
+        methods=('POST',),
+        resource_class_kwargs=services
+    )
     api.add_resource(
         Task,
         path + '/<int:id>',
@@ -109,6 +118,31 @@ def permissions(permissions: PermissionManager) -> None:
 task_schema = TaskSchema()
 task_result_schema = TaskIncludedSchema()
 task_result_schema2 = TaskResultSchema()
+task_event_schema = TaskSchema(exclude=['results'])
+# the result in the `new_task_run` event includes its input, also when it is
+# stored in the blob store
+result_event_schema = ResultSchema(context={'inline_blob_payloads': True})
+
+# fields of the task on which the task list can be sorted
+SORTABLE_FIELDS = ('id', 'name', 'created_at', 'status', 'finished_at')
+
+
+class TaskCreationError(Exception):
+    """
+    Raised when a task cannot be created from the data in the request.
+
+    Parameters
+    ----------
+    msg : str
+        Message that is returned to the client
+    status : HTTPStatus
+        Status code that is returned to the client
+    """
+
+    def __init__(self, msg: str, status: HTTPStatus) -> None:
+        super().__init__(msg)
+        self.msg = msg
+        self.status = status
 
 
 class TaskBase(ServicesResources):
@@ -117,6 +151,381 @@ class TaskBase(ServicesResources):
         super().__init__(socketio, mail, api, permissions, config)
         self.r = getattr(self.permissions, module_name)
 
+    def _create_tasks(self, tasks_json: list[dict]) -> list[db.Task]:
+        """
+        Create tasks and their results in a single transaction, and notify
+        the nodes once the tasks have been committed.
+
+        Parameters
+        ----------
+        tasks_json : list[dict]
+            Request data of each task, see `POST /task`
+
+        Returns
+        -------
+        list[db.Task]
+            The created tasks
+
+        Raises
+        ------
+        TaskCreationError
+            If any of the tasks cannot be created. In that case, none of the
+            tasks are created.
+        """
+        # all tasks are validated before any of them is added to the session,
+        # as validation may end the current transaction
+        validated = []
+        for i, data in enumerate(tasks_json):
+            try:
+                validated.append(self._validate_task(data))
+            except TaskCreationError as e:
+                if len(tasks_json) > 1:
+                    e.msg = f"Task {i}: {e.msg}"
+                raise
+
+        created = [self._build_task(data, **kwargs)
+                   for data, kwargs in zip(tasks_json, validated)]
+
+        # the ids of the tasks are generated by the database. Users can only
+        # create top-level tasks, which start a new run: their run_id is the
+        # id of the task, so that concurrent requests never get the same
+        # run_id. Tasks created by containers are sub-tasks and already have
+        # the run_id of their parent.
+        g.session.flush()
+        for task, _, _ in created:
+            if task.run_id is None:
+                task.run_id = task.id
+
+        # the inputs may be written to the blob store, which is only done
+        # once the tasks have been inserted. If the transaction fails after
+        # all, the inputs that are not used by other results are removed.
+        blob_keys = set()
+        try:
+            for _, results, inputs in created:
+                for result, input_ in zip(results, inputs):
+                    result.set_payload('input', input_)
+                    if result.input_key:
+                        blob_keys.add(result.input_key)
+            g.session.commit()
+        except Exception:
+            g.session.rollback()
+            db.Result.delete_unused_blobs(blob_keys)
+            raise
+
+        for task, results, _ in created:
+            self._notify_task_created(task, results)
+
+            log.info(f"New task for collaboration '{task.collaboration.name}'")
+            if g.user:
+                log.debug(f" created by: '{g.user.username}'")
+            else:
+                log.debug(f" created by container on node_id="
+                          f"{g.container['node_id']}"
+                          f" for (master) task_id={g.container['task_id']}")
+            log.debug(f" url: '{url_for('task_with_id', id=task.id)}'")
+            log.debug(f" name: '{task.name}'")
+            log.debug(f" image: '{task.image}'")
+
+        return [task for task, _, _ in created]
+
+    def _validate_task(self, data: dict) -> dict:
+        """
+        Check that a task can be created from the request data.
+
+        Parameters
+        ----------
+        data : dict
+            Request data of the task
+
+        Returns
+        -------
+        dict
+            The collaboration, the receiving organizations and the initiating
+            organization of the task
+
+        Raises
+        ------
+        TaskCreationError
+            If the task cannot be created
+        """
+        if not isinstance(data, dict):
+            raise TaskCreationError("Task data should be an object!",
+                                    HTTPStatus.BAD_REQUEST)
+        collaboration_id = data.get('collaboration_id')
+        collaboration = db.Collaboration.get(collaboration_id)
+
+        if not collaboration:
+            raise TaskCreationError(
+                f"Collaboration id={collaboration_id} not found!",
+                HTTPStatus.NOT_FOUND
+            )
+
+        organizations_json_list = data.get('organizations') or []
+        org_ids = [org.get("id") for org in organizations_json_list]
+        organizations = {org.id: org for org in collaboration.organizations}
+
+        # Check that all organization ids are within the collaboration, this
+        # also ensures us that the organizations exist
+        if not set(org_ids).issubset(organizations):
+            raise TaskCreationError(
+                "At least one of the supplied organizations in not within "
+                "the collaboration.", HTTPStatus.BAD_REQUEST
+            )
+
+        # check if all the organizations have a registered node
+        nodes = g.session.query(db.Node)\
+            .filter(db.Node.organization_id.in_(org_ids))\
+            .filter(db.Node.collaboration_id == collaboration_id)\
+            .all()
+        if len(nodes) < len(org_ids):
+            present_nodes = [node.organization_id for node in nodes]
+            missing = [str(id) for id in org_ids if id not in present_nodes]
+            raise TaskCreationError(
+                "Cannot create this task because there are no nodes registered"
+                f" for the following organization(s): {', '.join(missing)}.",
+                HTTPStatus.BAD_REQUEST
+            )
+        # check if any of the nodes that are offline shared their configuration
+        # info and if this prevents this user from creating this task
+        if g.user:
+            for node in nodes:
+                if self._node_doesnt_allow_user_task(node.config):
+                    raise TaskCreationError(
+                        "Cannot create this task because one of the nodes that"
+                        " you are trying to send this task to does not allow "
+                        "you to create tasks.", HTTPStatus.BAD_REQUEST
+                    )
+
+        # figure out the initiating organization of the task
+        if g.user:
+            init_org = g.user.organization
+        else:  # g.container:
+            init_org = db.Node.get(g.container["node_id"]).organization
+
+        # check if the initiating organization is part of the collaboration
+        if init_org not in collaboration.organizations:
+            raise TaskCreationError(
+                "You can only create tasks for collaborations "
+                "you are participating in!", HTTPStatus.UNAUTHORIZED
+            )
+
+        # verify permissions
+        if g.user:
+            if not self.r.c_glo.can():
+                c_orgs = collaboration.organizations
+                if not (self.r.c_org.can() and g.user.organization in c_orgs):
+                    raise TaskCreationError(
+                        'You lack the permission to do that!',
+                        HTTPStatus.UNAUTHORIZED
+                    )
+
+        elif g.container:
+            # verify that the container has permissions to create the task
+            if not self.__verify_container_permissions(
+                g.container, data.get('image', ''), collaboration_id
+            ):
+                raise TaskCreationError("Container-token is not valid",
+                                        HTTPStatus.UNAUTHORIZED)
+
+        return {
+            'collaboration': collaboration,
+            'organizations': [organizations[id_] for id_ in org_ids],
+            'init_org': init_org,
+        }
+
+    @staticmethod
+    def _build_task(data: dict, collaboration: db.Collaboration,
+                    organizations: list[db.Organization],
+                    init_org: db.Organization) \
+            -> tuple[db.Task, list[db.Result], list[str | None]]:
+        """
+        Create a task and its results in the session, without committing.
+
+        The inputs of the results are not set yet, as these may be written
+        to the blob store, which should only be done once the results have
+        been inserted.
+
+        Parameters
+        ----------
+        data : dict
+            Request data of the task
+        collaboration : db.Collaboration
+            Collaboration of the task
+        organizations : list[db.Organization]
+            Organizations that receive the task, in the order of the
+            `organizations` in the request data
+        init_org : db.Organization
+            Organization that creates the task
+
+        Returns
+        -------
+        tuple[db.Task, list[db.Result], list[str | None]]
+            The task, its results and the input of each result
+        """
+        task = db.Task(collaboration=collaboration, name=data.get('name', ''),
+                       description=data.get('description', ''),
+                       image=data.get('image', ''),
+                       database=data.get('database', ''),
+                       initiator=init_org)
+
+        # Users can only create top-level tasks, their run_id is set once the
+        # task has an id. Tasks created by containers are always sub-tasks
+        if g.user:
+            task.init_user_id = g.user.id
+        elif g.container:
+            task.parent_id = g.container["task_id"]
+            parent = g.session.get(db.Task, g.container["task_id"])
+            task.run_id = parent.run_id
+            task.init_user_id = parent.init_user_id
+            log.debug(f"Sub task from parent_id={task.parent_id}")
+        g.session.add(task)
+
+        # now we need to create results for the nodes to fill. Each node
+        # receives their instructions from a result, not from the task itself
+        log.debug(f"Assigning task to {len(organizations)} nodes.")
+        results = []
+        inputs = []
+        for org, organization in zip(data.get('organizations') or [],
+                                     organizations):
+            log.debug(f"Assigning task to '{organization.name}'.")
+            input_ = org.get('input')
+            # FIXME: legacy input from the client, could be removed at some
+            # point
+            if isinstance(input_, dict):
+                input_ = json.dumps(input_)
+            result = db.Result(
+                task=task,
+                organization=organization,
+                status=TaskStatus.PENDING
+            )
+            results.append(result)
+            inputs.append(input_)
+        # the results are inserted together when the session is flushed
+        g.session.add_all(results)
+
+        return task, results, inputs
+
+    def _notify_task_created(self, task: db.Task,
+                             results: list[db.Result]) -> None:
+        """
+        Send the `task_created` and `new_task` events to the collaboration,
+        and the `new_task_run` event to the nodes of the organizations for
+        which a result has been created.
+
+        The `new_task_run` event contains the id of the result, and the
+        result itself (including the task) if the input is small enough. In
+        that case, the node can start the task without retrieving it from the
+        server. The `new_task` event only contains the id of the task, as
+        expected by older nodes and by users. Nodes that are offline receive
+        the task on sign in.
+
+        Parameters
+        ----------
+        task : db.Task
+            The new task
+        results : list[db.Result]
+            Results of the task, one for each organization
+        """
+        self.socketio.emit(
+            "task_created", {
+                "task_id": task.id,
+                "run_id": task.run_id,
+                "collaboration_id": task.collaboration_id,
+                "init_org_id": task.initiator_id,
+                "image": task.image,
+            }, room=f"collaboration_{task.collaboration_id}",
+            namespace='/tasks'
+        )
+
+        task_json = task_event_schema.dump(task, many=False).data
+        for result in results:
+            event = {'task_id': task.id, 'result_id': result.id}
+            if (result.input_size or 0) <= NEW_TASK_EVENT_MAX_INPUT_SIZE:
+                event['result'] = result_event_schema.dump(
+                    result, many=False
+                ).data
+                event['result']['task'] = task_json
+            self.socketio.emit(
+                'new_task_run', event, namespace='/tasks',
+                room=f'collaboration_{task.collaboration_id}_organization_'
+                     f'{result.organization_id}'
+            )
+
+        # nodes that are told on connect that the server sends `new_task_run`
+        # ignore this event
+        self.socketio.emit(
+            'new_task', task.id, namespace='/tasks',
+            room=f'collaboration_{task.collaboration_id}'
+        )
+
+    @staticmethod
+    def __verify_container_permissions(container, image, collaboration_id):
+        """Validates that the container is allowed to create the task."""
+
+        # check that the image is allowed: algorithm containers can only
+        # create tasks with the same image
+        if not image.endswith(container["image"]):
+            log.warning((f"Container from node={container['node_id']} "
+                        f"attempts to post a task using illegal image!?"))
+            log.warning(f"  task image: {image}")
+            log.warning(f"  container image: {container['image']}")
+            return False
+
+        # check master task is not completed yet
+        if db.Task.get(container["task_id"]).complete:
+            log.warning(
+                f"Container from node={container['node_id']} "
+                f"attempts to start sub-task for a completed "
+                f"task={container['task_id']}"
+            )
+            return False
+
+        # check that node id is indeed part of the collaboration
+        if not container["collaboration_id"] == collaboration_id:
+            log.warning(
+                f"Container attempts to create a task outside "
+                f"collaboration_id={container['collaboration_id']} in "
+                f"collaboration_id={collaboration_id}!"
+            )
+            return False
+
+        return True
+
+    @staticmethod
+    def _node_doesnt_allow_user_task(
+        node_configs: list[db.NodeConfig]
+    ) -> bool:
+        """
+        Checks if the node allows user to create task.
+
+        Parameters
+        ----------
+        node_configs : list[db.NodeConfig]
+            List of node configurations.
+
+        Returns
+        -------
+        bool
+            True if the node doesn't allow the user to create task.
+        """
+        has_limitations = False
+        for config_option in node_configs:
+            if config_option.key == "allowed_users":
+                has_limitations = True
+                # TODO expand when we allow also usernames, like orgs below
+                if g.user.id == int(config_option.value):
+                    return False
+            elif config_option.key == "allowed_orgs":
+                has_limitations = True
+                if config_option.value.isdigit():
+                    if g.user.organization_id == int(config_option.value):
+                        return False
+                else:
+                    org = db.Organization.get_by_name(config_option.value)
+                    if org and g.user.organization_id == org.id:
+                        return False
+        return has_limitations
+
 
 class Tasks(TaskBase):
 
@@ -214,12 +623,30 @@ class Tasks(TaskBase):
             description: Include 'results' to get task results. Include
               'metadata' to get pagination metadata. Note that this will
               put the actual data in an envelope.
+          - in: query
+            name: fields
+            schema:
+              type: array
+              items:
+                type: string
+            description: Comma separated list of fields to return, e.g.
+              'id,status'. Fields of the included results can be selected
+              with 'results.<field>'. Large result fields that are not
+              requested, such as the input and result, are not loaded.
           - in: query
             name: status
             schema:
               type: string
             description: Filter by task status, e.g. 'active' for active
-              tasks, 'completed' for finished or 'crashed' for failed tasks.
+              tasks, 'completed' for finished or 'failed' for failed tasks.
+          - in: query
+            name: sort
+            schema:
+              type: string
+            description: Field to sort the tasks on, one of 'id', 'name',
+              'created_at', 'status' or 'finished_at'. Prefix with '-' to
+              sort in descending order. By default, tasks are sorted on
+              '-id'.
           - in: query
             name: page
             schema:
@@ -270,15 +697,37 @@ class Tasks(TaskBase):
         if 'result_id' in args:
             q = q.join(db.Result).filter(db.Result.id == args['result_id'])
 
-        q = q.order_by(desc(db.Task.id))
-        # paginate tasks
-        page = Pagination.from_query(q, request)
-
         # serialization schema
         schema = task_result_schema if self.is_included('results') else\
             task_schema
+        try:
+            fields = self.requested_fields(schema)
+        except ValueError as e:
+            return {'msg': str(e)}, HTTPStatus.BAD_REQUEST
+
+        # load the results of all tasks in a single query, as the status of
+        # a task is derived from them. The (large) payloads of the results
+        # are only loaded when the results are included.
+        if self.is_included('results'):
+            result_options = self.defer_unrequested(db.Result, fields,
+                                                    'results')
+        else:
+            result_options = [load_only(db.Result.id, db.Result.status,
+                                        db.Result.finished_at)]
+        q = q.options(selectinload(db.Task.results).options(*result_options))
+
+        # sort the tasks, the status is computed in the database
+        sort = args.get('sort', '-id')
+        if sort.lstrip('-') not in SORTABLE_FIELDS:
+            return {'msg': f"Cannot sort tasks on '{sort.lstrip('-')}'"}, \
+                HTTPStatus.BAD_REQUEST
+        column = getattr(db.Task, sort.lstrip('-'))
+        q = q.order_by(desc(column) if sort.startswith('-') else column)\
+            .order_by(desc(db.Task.id))
+        # paginate tasks
+        page = Pagination.from_query(q, request)
 
-        return self.response(page, schema)
+        return self.response(page, schema, fields)
 
     @only_for(("user", "container"))
     def post(self):
@@ -334,220 +783,70 @@ class Tasks(TaskBase):
 
         tags: ["Task"]
         """
-        data = request.get_json()
-        collaboration_id = data.get('collaboration_id')
-        collaboration = db.Collaboration.get(collaboration_id)
-
-        if not collaboration:
-            return {"msg": f"Collaboration id={collaboration_id} not found!"},\
-                   HTTPStatus.NOT_FOUND
-
-        organizations_json_list = data.get('organizations')
-        org_ids = [org.get("id") for org in organizations_json_list]
-        db_ids = collaboration.get_organization_ids()
-
-        # Check that all organization ids are within the collaboration, this
-        # also ensures us that the organizations exist
-        if not set(org_ids).issubset(db_ids):
-            return {"msg": (
-                "At least one of the supplied organizations in not within "
-                "the collaboration."
-            )}, HTTPStatus.BAD_REQUEST
-
-        # check if all the organizations have a registered node
-        nodes = g.session.query(db.Node)\
-            .filter(db.Node.organization_id.in_(org_ids))\
-            .filter(db.Node.collaboration_id == collaboration_id)\
-            .all()
-        if len(nodes) < len(org_ids):
-            present_nodes = [node.organization_id for node in nodes]
-            missing = [str(id) for id in org_ids if id not in present_nodes]
-            return {"msg": (
-                "Cannot create this task because there are no nodes registered"
-                f" for the following organization(s): {', '.join(missing)}."
-            )}, HTTPStatus.BAD_REQUEST
-        # check if any of the nodes that are offline shared their configuration
-        # info and if this prevents this user from creating this task
-        if g.user:
-            for node in nodes:
-                if self._node_doesnt_allow_user_task(node.config):
-                    return {"msg": (
-                        "Cannot create this task because one of the nodes that"
-                        " you are trying to send this task to does not allow "
-                        "you to create tasks."
-                    )}, HTTPStatus.BAD_REQUEST
+        try:
+            task = self._create_tasks([request.get_json()])[0]
+        except TaskCreationError as e:
+            return {'msg': e.msg}, e.status
 
-        # figure out the initiating organization of the task
-        if g.user:
-            init_org = g.user.organization
-        else:  # g.container:
-            init_org = db.Node.get(g.container["node_id"]).organization
-
-        # check if the initiating organization is part of the collaboration
-        if init_org not in collaboration.organizations:
-            return {
-                "msg": "You can only create tasks for collaborations "
-                       "you are participating in!"
-            }, HTTPStatus.UNAUTHORIZED
-
-        # Create the new task in the database
-        image = data.get('image', '')
-
-        # verify permissions
-        if g.user:
-            if not self.r.c_glo.can():
-                c_orgs = collaboration.organizations
-                if not (self.r.c_org.can() and g.user.organization in c_orgs):
-                    return {'msg': 'You lack the permission to do that!'}, \
-                        HTTPStatus.UNAUTHORIZED
-
-        elif g.container:
-            # verify that the container has permissions to create the task
-            if not self.__verify_container_permissions(g.container, image,
-                                                       collaboration_id):
-                return {"msg": "Container-token is not valid"}, \
-                    HTTPStatus.UNAUTHORIZED
-
-        # permissions ok, create record
-        task = db.Task(collaboration=collaboration, name=data.get('name', ''),
-                       description=data.get('description', ''), image=image,
-                       database=data.get('database', ''),
-                       initiator=init_org)
-
-        # create run_id. Users can only create top-level -tasks (they will not
-        # have sub-tasks). Therefore, always create a new run_id. Tasks created
-        # by containers are always sub-tasks
-        if g.user:
-            task.run_id = task.next_run_id()
-            task.init_user_id = g.user.id
-            log.debug(f"New run_id {task.run_id}")
-        elif g.container:
-            task.parent_id = g.container["task_id"]
-            parent = db.Task.get(g.container["task_id"])
-            task.run_id = parent.run_id
-            task.init_user_id = parent.init_user_id
-            log.debug(f"Sub task from parent_id={task.parent_id}")
-
-        # ok commit session...
-        task.save()
-
-        # send socket event that task has been created
-        self.socketio.emit(
-            "task_created", {
-                "task_id": task.id,
-                "run_id": task.run_id,
-                "collaboration_id": collaboration_id,
-                "init_org_id": init_org.id,
-            }, room=f"collaboration_{collaboration_id}", namespace='/tasks'
-        )
-
-        # now we need to create results for the nodes to fill. Each node
-        # receives their instructions from a result, not from the task itself
-        log.debug(f"Assigning task to {len(organizations_json_list)} nodes.")
-        for org in organizations_json_list:
-            organization = db.Organization.get(org['id'])
-            log.debug(f"Assigning task to '{organization.name}'.")
-            input_ = org.get('input')
-            # FIXME: legacy input from the client, could be removed at some
-            # point
-            if isinstance(input_, dict):
-                input_ = json.dumps(input_).encode(STRING_ENCODING)
-            # Create result
-            result = db.Result(
-                task=task,
-                organization=organization,
-                input=input_,
-                status=TaskStatus.PENDING
-            )
-            result.save()
-
-        # notify nodes a new task available (only to online nodes), nodes that
-        # are offline will receive this task on sign in.
-        self.socketio.emit('new_task', task.id, namespace='/tasks',
-                           room=f'collaboration_{task.collaboration_id}')
-
-        # add some logging
-        log.info(f"New task for collaboration '{task.collaboration.name}'")
-        if g.user:
-            log.debug(f" created by: '{g.user.username}'")
-        else:
-            log.debug(f" created by container on node_id="
-                      f"{g.container['node_id']}"
-                      f" for (master) task_id={g.container['task_id']}")
+        return task_schema.dump(task, many=False).data, HTTPStatus.CREATED
 
-        log.debug(f" url: '{url_for('task_with_id', id=task.id)}'")
-        log.debug(f" name: '{task.name}'")
-        log.debug(f" image: '{task.image}'")
 
-        return task_schema.dump(task, many=False).data, HTTPStatus.CREATED
+class TaskBatch(TaskBase):
+    """Resource for /api/task/batch"""
 
-    @staticmethod
-    def __verify_container_permissions(container, image, collaboration_id):
-        """Validates that the container is allowed to create the task."""
+    @only_for(("user", "container"))
+    def post(self):
+        """Adds multiple computation tasks
+        ---
+        description: >-
+          Creates multiple tasks at once, e.g. for a parameter sweep. Each
+          task is validated in the same way as when it is created using `POST
+          /task`. The tasks are only created if all of them are valid.\n
 
-        # check that the image is allowed: algorithm containers can only
-        # create tasks with the same image
-        if not image.endswith(container["image"]):
-            log.warning((f"Container from node={container['node_id']} "
-                        f"attempts to post a task using illegal image!?"))
-            log.warning(f"  task image: {image}")
-            log.warning(f"  container image: {container['image']}")
-            return False
+          ### Permission Table\n
+          |Rule name|Scope|Operation|Assigned to node|Assigned to container|
+          Description|\n
+          |--|--|--|--|--|--|\n
+          |Task|Global|Create|❌|❌|Create a new task|\n
+          |Task|Organization|Create|❌|✅|Create a new task for a specific
+          collaboration in which your organization participates|\n
 
-        # check master task is not completed yet
-        if db.Task.get(container["task_id"]).complete:
-            log.warning(
-                f"Container from node={container['node_id']} "
-                f"attempts to start sub-task for a completed "
-                f"task={container['task_id']}"
-            )
-            return False
+        requestBody:
+          content:
+            application/json:
+              schema:
+                properties:
+                  tasks:
+                    type: array
+                    items:
+                      $ref: '#/components/schemas/Task'
 
-        # check that node id is indeed part of the collaboration
-        if not container["collaboration_id"] == collaboration_id:
-            log.warning(
-                f"Container attempts to create a task outside "
-                f"collaboration_id={container['collaboration_id']} in "
-                f"collaboration_id={collaboration_id}!"
-            )
-            return False
+        responses:
+          201:
+            description: Ok
+          400:
+            description: One of the tasks is invalid, see `POST /task`
+          401:
+            description: Unauthorized
+          404:
+            description: Collaboration of one of the tasks not found
 
-        return True
+        security:
+          - bearerAuth: []
 
-    @staticmethod
-    def _node_doesnt_allow_user_task(
-        node_configs: list[db.NodeConfig]
-    ) -> bool:
+        tags: ["Task"]
         """
-        Checks if the node allows user to create task.
+        tasks_json = (request.get_json() or {}).get('tasks')
+        if not isinstance(tasks_json, list) or not tasks_json:
+            return {'msg': 'A non-empty list of tasks is required!'}, \
+                HTTPStatus.BAD_REQUEST
 
-        Parameters
-        ----------
-        node_configs : list[db.NodeConfig]
-            List of node configurations.
+        try:
+            tasks = self._create_tasks(tasks_json)
+        except TaskCreationError as e:
+            return {'msg': e.msg}, e.status
 
-        Returns
-        -------
-        bool
-            True if the node doesn't allow the user to create task.
-        """
-        has_limitations = False
-        for config_option in node_configs:
-            if config_option.key == "allowed_users":
-                has_limitations = True
-                # TODO expand when we allow also usernames, like orgs below
-                if g.user.id == int(config_option.value):
-                    return False
-            elif config_option.key == "allowed_orgs":
-                has_limitations = True
-                if config_option.value.isdigit():
-                    if g.user.organization_id == int(config_option.value):
-                        return False
-                else:
-                    org = db.Organization.get_by_name(config_option.value)
-                    if org and g.user.organization_id == org.id:
-                        return False
-        return has_limitations
+        return task_schema.dump(tasks, many=True).data, HTTPStatus.CREATED
 
 
 class Task(TaskBase):
@@ -719,6 +1018,13 @@ class TaskResult(ServicesResources):
               type: string
             description: Include 'metadata' to get pagination metadata. Note
               that this will put the actual data in an envelope.
+          - in: query
+            name: fields
+            schema:
+              type: string
+            description: Comma separated list of fields to return, e.g.
+              'id,finished_at'. Large fields that are not requested, such as
+              the input and result, are not loaded.
           - in: query
             name: page
             schema:
@@ -756,8 +1062,17 @@ class TaskResult(ServicesResources):
                 return {'msg': 'You lack the permission to do that!'}, \
                     HTTPStatus.UNAUTHORIZED
 
+        try:
+            fields = self.requested_fields(task_result_schema2)
+        except ValueError as e:
+            return {'msg': str(e)}, HTTPStatus.BAD_REQUEST
+        q = g.session.query(db.Result)\
+            .filter(db.Result.task_id == task.id)\
+            .options(*self.defer_unrequested(db.Result, fields))\
+            .order_by(db.Result.id)
+
         # pagination
-        page = Pagination.from_list(task.results, request)
+        page = Pagination.from_query(q, request)
 
         # model serialization
-        return self.response(page, task_result_schema2)
+        return self.response(page, task_result_schema2, fields)
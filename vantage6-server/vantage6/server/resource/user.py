@@ -691,6 +691,9 @@ class User(UserBase):
             }, HTTPStatus.BAD_REQUEST
             # TODO BvB 2021-08-27 return msg that user was not updated?
 
+        if 'roles' in json_data or 'rules' in json_data:
+            self.permissions.cache.invalidate(('user', user.id))
+
         return user_schema.dump(user).data, HTTPStatus.OK
 
     @with_user
@@ -745,6 +748,7 @@ class User(UserBase):
                         HTTPStatus.UNAUTHORIZED
 
         user.delete()
+        self.permissions.cache.invalidate(('user', id))
         log.info(f"user id={id} is removed from the database")
         return {"msg": f"user id={id} is removed from the database"}, \
             HTTPStatus.OK
@@ -1,6 +1,5 @@
 import logging
 import jwt
-import datetime as dt
 
 from flask import request, session
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
@@ -12,6 +11,7 @@ from vantage6.server import db
 from vantage6.server.model.authenticatable import Authenticatable
 from vantage6.server.model.rule import Operation, Scope
 from vantage6.server.model.base import DatabaseSessionManager
+from vantage6.server.heartbeat import heartbeats
 
 ALL_NODES_ROOM = 'all_nodes'
 
@@ -38,7 +38,9 @@ class DefaultSocketNamespace(Namespace):
         connected client, and lives as long as the connection is active.
         Each client is assigned to rooms based on their permissions.
 
-        Nodes that are connecting are also set to status 'online'.
+        Nodes that are connecting are also set to status 'online', and are
+        sent the `server_features` event that tells them which task events
+        the server sends.
 
 
         Note
@@ -91,6 +93,10 @@ class DefaultSocketNamespace(Namespace):
         if session.type == 'node':
             self._add_node_to_rooms(auth)
             self.__alert_node_status(online=True, node=auth)
+            # nodes are told that they receive the `new_task_run` event
+            # before they join the rooms in which it is sent, so that they
+            # can ignore the `new_task` event that is sent along with it
+            emit("server_features", {"new_task_run": True}, room=request.sid)
         elif session.type == 'user':
             self._add_user_to_rooms(auth)
 
@@ -161,6 +167,7 @@ class DefaultSocketNamespace(Namespace):
             # self.__leave_room_and_notify(room)
             self.__leave_room_and_notify(room)
 
+        heartbeats.forget(session.auth_id)
         auth = db.Authenticatable.get(session.auth_id)
         auth.status = 'offline'
         auth.save()
@@ -311,12 +318,10 @@ class DefaultSocketNamespace(Namespace):
     def on_ping(self) -> None:
         """
         A client sends a ping to the server. The server detects who sent the
-        ping and sets them as online.
+        ping and sets them as online. This is written to the database
+        periodically by the heartbeat tracker.
         """
-        auth = db.Authenticatable.get(session.auth_id)
-        auth.status = 'online'
-        auth.last_seen = dt.datetime.utcnow()
-        auth.save()
+        heartbeats.record(session.auth_id, ping=True)
 
     def __join_room_and_notify(self, room: str) -> None:
         """